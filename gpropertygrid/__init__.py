@@ -4,10 +4,12 @@
 
 """
 A simple python gtk 3 property grid widget.
+
+If Gtk 4.0 was required before importing it, the GTK 4 backend
+in :py:mod:`gpropertygrid.gtk4` is used.
 """
 
 from gi.repository import Gtk, Gdk
-from . propertygrid import PropertyGrid
 
 PROJECT_NAME = "GPropertyGrid"
 AUTHOR = "Fredy Ramirez"
@@ -22,24 +24,28 @@ def get_rgb_string(rgb):
         int(rgb.blue * 255))
     return result
 
-wg = Gtk.Window()
-ctx = wg.get_style_context()
-bg_color = get_rgb_string(ctx.get_background_color(Gtk.StateFlags.NORMAL))
-fg_color = get_rgb_string(ctx.get_color(Gtk.StateFlags.NORMAL))
-bg_selected = get_rgb_string(ctx.get_background_color(Gtk.StateFlags.SELECTED))
-fg_selected = get_rgb_string(ctx.get_color(Gtk.StateFlags.SELECTED))
-wg.destroy()
-
-define_color = "@define-color pg_bg_color {0};\n".format(
-    bg_color)
-define_color = "{0}@define-color pg_fg_color {1};\n".format(
-    define_color, fg_color)
-define_color = "{0}@define-color pg_selected_bg_color {1};\n".format(
-    define_color, bg_selected)
-define_color = "{0}@define-color pg_selected_fg_color {1};".format(
-    define_color, fg_selected)
-
-css = """
+
+def _load_css():
+    wg = Gtk.Window()
+    ctx = wg.get_style_context()
+    bg_color = get_rgb_string(
+        ctx.get_background_color(Gtk.StateFlags.NORMAL))
+    fg_color = get_rgb_string(ctx.get_color(Gtk.StateFlags.NORMAL))
+    bg_selected = get_rgb_string(
+        ctx.get_background_color(Gtk.StateFlags.SELECTED))
+    fg_selected = get_rgb_string(ctx.get_color(Gtk.StateFlags.SELECTED))
+    wg.destroy()
+
+    define_color = "@define-color pg_bg_color {0};\n".format(
+        bg_color)
+    define_color = "{0}@define-color pg_fg_color {1};\n".format(
+        define_color, fg_color)
+    define_color = "{0}@define-color pg_selected_bg_color {1};\n".format(
+        define_color, bg_selected)
+    define_color = "{0}@define-color pg_selected_fg_color {1};".format(
+        define_color, fg_selected)
+
+    css = """
 #property_grid_header {
     background-color: @pg_fg_color;
     color: @pg_bg_color;
@@ -74,9 +80,8 @@ css = """
     border-style: solid;
 }
 
-#cell.cell_in {
-    background-color: @pg_selected_bg_color;
-    color: @pg_selected_fg_color;
+#cell.cell_invalid {
+    color: red;
 }
 
 #description_name {
@@ -86,11 +91,18 @@ css = """
 
 """
 
-css = define_color + css
+    css = define_color + css
+
+    style_provider = Gtk.CssProvider()
+    style_provider.load_from_data(css.encode('utf8'))
+    Gtk.StyleContext.add_provider_for_screen(
+        Gdk.Screen.get_default(),
+        style_provider,
+        Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
+
 
-style_provider = Gtk.CssProvider()
-style_provider.load_from_data(css.encode('utf8'))
-Gtk.StyleContext.add_provider_for_screen(
-    Gdk.Screen.get_default(),
-    style_provider,
-    Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
+if Gtk.get_major_version() >= 4:
+    from . gtk4 import PropertyGrid
+else:
+    from . propertygrid import PropertyGrid
+    _load_css()
@@ -0,0 +1,440 @@
+# This file is part of GPropertyGrid project.
+# The COPYRIGHT file at the top level of this repository
+# contains the full copyright notices and license terms.
+
+"""
+Property for large numeric buffers.
+
+Cells are read from and written to the buffer of the value,
+so it is never copied while showing or editing it.
+
+It requires Gtk 3, importing it with Gtk 4.0 raises ImportError.
+"""
+
+import sys
+import struct
+from weakref import WeakKeyDictionary
+from gi.repository import Gtk, GObject
+from . properties import PropertyGridProperty
+from . formatters import DisplayFormatter
+from . history import Patch
+
+# Formats whose cells can be read and written by memoryview.
+_FORMATS = 'bBhHiIlLqQnNfd?'
+
+# Byte order prefixes that match the native byte order.
+if sys.byteorder == 'little':
+    _NATIVE_ORDERS = ('', '@', '=', '<')
+else:
+    _NATIVE_ORDERS = ('', '@', '=', '>', '!')
+
+
+def _get_native_format(format_):
+    """Gets the native format with the same layout as a buffer
+    format, like 'd' for '<d' in little endian machines.
+
+    Raises:
+        ValueError: if there is no such format.
+    """
+    prefix, base = format_[:-1], format_[-1:]
+    if base not in _FORMATS or prefix not in _NATIVE_ORDERS or \
+            struct.calcsize(format_) != struct.calcsize(base):
+        raise ValueError(
+            "Array format {0} is not supported".format(format_))
+    return base
+
+
+def _get_flat_view(value):
+    view = memoryview(value)
+    if not view.c_contiguous:
+        raise ValueError("Array value must be C contiguous")
+    shape = view.shape or (1,)
+    if len(shape) > 2:
+        raise ValueError("Array value must have one or two dimensions")
+    columns = shape[1] if len(shape) == 2 else 1
+    flat = view.cast('B').cast(_get_native_format(view.format))
+    return flat, shape[0], columns
+
+
+def _to_bool(value):
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in ('1', 'true'):
+            return True
+        if text in ('0', 'false'):
+            return False
+        raise ValueError("Invalid boolean value {0}".format(value))
+    return bool(value)
+
+
+def _get_type(format_):
+    if format_ in ('f', 'd'):
+        return float
+    if format_ == '?':
+        return _to_bool
+    return int
+
+
+class _ArrayFormatter(DisplayFormatter):
+    def to_text(self, value):
+        view = memoryview(value)
+        shape = 'x'.join(str(s) for s in view.shape)
+        return 'array({0}, {1})'.format(shape, view.format)
+
+
+class _ArrayModel(GObject.GObject, Gtk.TreeModel):
+    """Gtk.TreeModel that reads rows from a flat buffer view on demand.
+    """
+
+    def __init__(self, flat, rows, columns):
+        GObject.GObject.__init__(self)
+        self._flat = flat
+        self._rows = rows
+        self._columns = columns
+        self._stamp = id(self) & 0x7fffffff
+
+    def do_get_flags(self):
+        return (Gtk.TreeModelFlags.LIST_ONLY |
+                Gtk.TreeModelFlags.ITERS_PERSIST)
+
+    def do_get_n_columns(self):
+        return self._columns + 1
+
+    def do_get_column_type(self, index):
+        return GObject.TYPE_STRING
+
+    def do_get_iter(self, path):
+        row = path.get_indices()[0]
+        if row < self._rows:
+            return (True, self._create_iter(row))
+        return (False, None)
+
+    def do_get_path(self, iter_):
+        return Gtk.TreePath((iter_.user_data,))
+
+    def do_get_value(self, iter_, column):
+        row = iter_.user_data
+        if column == 0:
+            return str(row)
+        return str(self._flat[row * self._columns + column - 1])
+
+    def do_iter_next(self, iter_):
+        row = iter_.user_data + 1
+        if row < self._rows:
+            iter_.user_data = row
+            return True
+        return False
+
+    def do_iter_previous(self, iter_):
+        row = iter_.user_data - 1
+        if row >= 0:
+            iter_.user_data = row
+            return True
+        return False
+
+    def do_iter_children(self, parent):
+        return self.do_iter_nth_child(parent, 0)
+
+    def do_iter_has_child(self, iter_):
+        return False
+
+    def do_iter_n_children(self, iter_):
+        if iter_ is None:
+            return self._rows
+        return 0
+
+    def do_iter_nth_child(self, parent, n):
+        if parent is None and n < self._rows:
+            return (True, self._create_iter(n))
+        return (False, None)
+
+    def do_iter_parent(self, child):
+        return (False, None)
+
+    def row_updated(self, row):
+        path = Gtk.TreePath((row,))
+        self.row_changed(path, self._create_iter(row))
+
+    def _create_iter(self, row):
+        iter_ = Gtk.TreeIter()
+        iter_.stamp = self._stamp
+        iter_.user_data = row
+        return iter_
+
+
+class _DialogArray(Gtk.Dialog):
+    def __init__(self, parent):
+        super(_DialogArray, self).__init__(
+            'Array', parent, 0,
+            (Gtk.STOCK_CLOSE, Gtk.ResponseType.CLOSE))
+        self.set_modal(True)
+        self.set_default_size(400, 400)
+        self._property = None
+
+        self._view = Gtk.TreeView()
+        # Rows are measured once, so only visible rows are read.
+        self._view.set_fixed_height_mode(True)
+
+        sw = Gtk.ScrolledWindow()
+        sw.set_shadow_type(Gtk.ShadowType.IN)
+        sw.add(self._view)
+
+        box = self.get_content_area()
+        box.pack_start(sw, True, True, 0)
+        box.show_all()
+
+    def load(self, property_):
+        self._property = property_
+        for column in self._view.get_columns():
+            self._view.remove_column(column)
+        model = property_._model
+        for index in range(model.get_n_columns()):
+            renderer = Gtk.CellRendererText()
+            title = '#'
+            if index > 0:
+                title = str(index - 1)
+                renderer.set_property(
+                    'editable', not property_._read_only)
+                renderer.connect('edited', self._on_edited, index - 1)
+            column = Gtk.TreeViewColumn(title, renderer, text=index)
+            column.set_sizing(Gtk.TreeViewColumnSizing.FIXED)
+            column.set_fixed_width(80)
+            self._view.append_column(column)
+        self._view.set_model(model)
+
+    def unload(self):
+        self._view.set_model(None)
+        self._property = None
+
+    def _on_edited(self, renderer, path, text, column):
+        property_ = self._property
+        index = int(path) * property_._model._columns + column
+        try:
+            property_.set_cells(index, [text])
+        except ValueError:
+            return
+
+
+class PropertyArray(PropertyGridProperty):
+    __gsignals__ = {
+        'cells-changed': (
+            GObject.SIGNAL_RUN_FIRST, None,
+            (GObject.TYPE_PYOBJECT,))
+    }
+
+    # One dialog per parent window, reused by all properties.
+    _dialogs = WeakKeyDictionary()
+
+    formatter = _ArrayFormatter()
+
+    def __init__(
+            self, name, parent_window,
+            id=None, default=None, description=None,
+            force_value=False):
+        """A property for vectors and matrices of numbers.
+
+        Value is an object that supports the buffer protocol,
+        like a NumPy array or an array.array, of one or two
+        dimensions, or None. Cells are shown in a dialog that only
+        reads visible cells, and edits are written in place
+        to the value buffer.
+
+        After each write, :attr:`changed_ranges` has the flat
+        index ranges (start, end) that were modified, which are
+        also passed to the 'cells-changed' signal. Changes are
+        reported by :py:meth:`get_changes
+        <gpropertygrid.base.PropertyGridBase.get_changes>` as
+        :py:class:`Patch <gpropertygrid.history.Patch>` tuples
+        of (index, values) cells, that :meth:`load_value` accepts,
+        so the buffer is never copied.
+
+        See :class:`PropertyGridProperty` for parameters.
+
+        Args:
+            parent_window (Gtk.Window): The parent window.
+
+        Note:
+            *default* parameter must be a C contiguous buffer object.
+        """
+        self._window = parent_window
+        self._flat = None
+        self._model = None
+        self._type = float
+        self._patches = []
+        self.changed_ranges = []
+
+        super(PropertyArray, self).__init__(
+            name=name,
+            value_widget=None,
+            id=id,
+            default=default,
+            description=description,
+            force_value=force_value)
+
+    def init_value(self, force_value, default):
+        if default is not None and force_value:
+            self._set_buffer(default)
+
+    def load_value(self, value):
+        """Loads a value into the property.
+
+        Args:
+            value: A buffer object that replaces the current one,
+                a list of numbers that is copied into the current
+                buffer, a dictionary {'cells': [[index, [values]], ...]}
+                with the cells to write into the current buffer,
+                or None.
+
+        Raises:
+            ValueError: if a value can not be stored in the buffer,
+                no cell is written then.
+        """
+        if value is None:
+            self._set_buffer(None)
+        elif isinstance(value, Patch):
+            self._write_cells(value)
+        elif isinstance(value, dict):
+            self._write_cells(value['cells'])
+        elif isinstance(value, list):
+            self._write_patch(0, value)
+        else:
+            self._set_buffer(value)
+
+    def dump_value(self):
+        """Gets a copy of all cells.
+
+        Returns:
+            A flat list of numbers in row-major order, or None.
+        """
+        if self._flat is None:
+            return
+        return self._flat.tolist()
+
+    def _has_value(self, value):
+        # Compares in place, without copying the buffer.
+        if value is None or self._flat is None:
+            return value is None and self._flat is None
+        if isinstance(value, list):
+            return len(value) == len(self._flat) and \
+                all(a == b for a, b in zip(self._flat, value))
+        if isinstance(value, (Patch, dict)):
+            return False
+        return value is self._value[0]
+
+    def create_editor(self):
+        return Gtk.Button.new_with_label('...')
+
+    def connect_editor(self, editor):
+        self._connect_editor(editor, "clicked", self._on_click_button)
+
+    def set_cells(self, index, values):
+        """Writes cells in place and notifies the change.
+
+        Args:
+            index (int): Flat index, in row-major order,
+                of the first cell.
+
+            values (list): Values of consecutive cells.
+
+        Raises:
+            ValueError: if a value can not be stored in the buffer,
+                no cell is written then.
+        """
+        self._write_patch(index, values)
+        self.has_changed()
+
+    def _set_buffer(self, value):
+        self._patches = []
+        if value is None:
+            self._value = None
+            self._flat = None
+            self._model = None
+            return
+        self._flat, rows, columns = _get_flat_view(value)
+        self._type = _get_type(self._flat.format)
+        self._model = _ArrayModel(self._flat, rows, columns)
+        self._value = [value, ]
+
+    def _convert(self, index, values):
+        """Converts values to the buffer type and checks they fit
+        in the buffer, before writing any cell.
+        """
+        if self._flat is None:
+            raise ValueError("Array property has no value")
+        if index < 0 or index + len(values) > len(self._flat):
+            raise ValueError(
+                "Cells {0} to {1} are out of array bounds".format(
+                    index, index + len(values)))
+        format_ = self._flat.format
+        converted = []
+        for v in values:
+            try:
+                v = self._type(v)
+                struct.pack(format_, v)
+            except (TypeError, OverflowError, struct.error):
+                raise ValueError(
+                    "Value {0} does not fit in array format {1}".format(
+                        v, format_))
+            converted.append(v)
+        return converted
+
+    def _write_cells(self, cells):
+        cells = [(i, self._convert(i, values)) for i, values in cells]
+        self.changed_ranges = []
+        for index, values in cells:
+            old = self._flat[index:index + len(values)].tolist()
+            self._write(index, values)
+            self._patches.append((index, old, values))
+            self.changed_ranges.append((index, index + len(values)))
+        self.emit('cells-changed', list(self.changed_ranges))
+
+    def _write_patch(self, index, values):
+        self._write_cells([(index, values)])
+
+    def _write(self, index, values):
+        for i, v in enumerate(values):
+            self._flat[index + i] = v
+        if self._model is not None and values:
+            columns = self._model._columns
+            for row in range(
+                    index // columns,
+                    (index + len(values) - 1) // columns + 1):
+                self._model.row_updated(row)
+
+    def _reset_change(self):
+        self._patches = []
+
+    def _pop_change(self):
+        if not self._patches:
+            return
+        patches = self._patches
+        self._patches = []
+        old = Patch((p[0], p[1]) for p in reversed(patches))
+        new = Patch((p[0], p[2]) for p in patches)
+        return old, new
+
+    def _write_patch_into(self, value, patch):
+        if isinstance(value, list):
+            for index, values in patch:
+                value[index:index + len(values)] = values
+            return
+        if self._value is not None and value is self._value[0]:
+            # Edited buffer, it already has the cells.
+            return
+        flat = _get_flat_view(value)[0]
+        for index, values in patch:
+            for i, v in enumerate(values):
+                flat[index + i] = v
+
+    def _on_click_button(self, btn):
+        if self._model is None:
+            return
+        key = self if self._window is None else self._window
+        dialog = PropertyArray._dialogs.get(key)
+        if dialog is None:
+            dialog = _DialogArray(self._window)
+            PropertyArray._dialogs[key] = dialog
+        dialog.load(self)
+        dialog.run()
+        dialog.unload()
+        dialog.hide()
@@ -0,0 +1,1202 @@
+# This file is part of GPropertyGrid project.
+# The COPYRIGHT file at the top level of this repository
+# contains the full copyright notices and license terms.
+
+"""
+Toolkit independent part of the property grid and its properties.
+
+Values, change tracking, undo history, rules and multiple object
+editing are implemented here, so they behave the same on every
+backend. Backends implement the widgets.
+"""
+
+import json
+from collections import OrderedDict
+from itertools import repeat
+from . import numeric
+from . import rules
+from . import streams
+from . history import History, Patch
+from . query import PropertyIndex
+from . formatters import DisplayFormatter
+
+# Last value of mixed properties, so any value they get is a change.
+_MIXED = object()
+
+
+def _read_values(objects, id):
+    """Values of property *id* in each object of a list of
+    dictionaries, or of objects with attributes named as property ids.
+    """
+    if not objects:
+        return []
+    if isinstance(objects[0], dict):
+        return list(map(dict.get, objects, repeat(id)))
+    return list(map(getattr, objects, repeat(id), repeat(None)))
+
+
+class PropertyBase(object):
+    """Value handling shared by the property classes of all backends.
+
+    Derived classes must call :meth:`_init_state` before
+    :meth:`init_value`, and implement :meth:`_is_shown`,
+    :meth:`_show_display_text`, :meth:`_set_tooltip` and
+    :meth:`_set_valid`.
+    """
+
+    # Default formatter of display text, shared by all
+    # properties of the class. See set_formatter().
+    formatter = DisplayFormatter()
+
+    def _init_state(self, name, id, description):
+        self.name = name
+        self.id = id
+        self.description = description
+
+        self._group = None
+        self._parent = None
+        self._depth = 0
+        self._hidden = False
+        self._value = None
+        self._has_focus = False
+        self._read_only = False
+        self._updating = False
+        self._value_provider = None
+        self._validator = None
+        self._valid = None
+        self._validation_serial = 0
+        self._mixed = False
+        self._display_text = None
+        self._tags = frozenset()
+        self._index_key = None
+
+    @property
+    def has_focus(self):
+        return self._has_focus
+
+    @property
+    def tags(self):
+        """
+        Set of tags of the property, see :meth:`set_tags`. Read only.
+        """
+        return self._tags
+
+    @property
+    def value(self):
+        """
+        List that contents current value of property.
+        """
+        return self._value
+
+    @property
+    def value_provider(self):
+        """
+        :py:class:`ValueProvider <gpropertygrid.providers.ValueProvider>`
+        object that fetches the property value, or None. Read only.
+        """
+        return self._value_provider
+
+    @property
+    def display_text(self):
+        """
+        Text shown for the property value. Read only.
+        """
+        return self._display_text
+
+    @property
+    def mixed(self):
+        """
+        True if property shows several different values, see
+        :meth:`set_mixed`. Read only.
+        """
+        return self._mixed
+
+    @property
+    def validator(self):
+        """
+        :py:class:`Validator <gpropertygrid.validation.Validator>`
+        object that validates the property value, or None. Read only.
+        """
+        return self._validator
+
+    @property
+    def valid(self):
+        """
+        Result of last validation. True, False, or None if property
+        has no validator or validation is in progress. Read only.
+        """
+        return self._valid
+
+    def init_value(self, force_value, default):
+        """Sets the initial state of property value at creation time.
+
+        This method is called automatically when property is created,
+        It is a virtual method, so each property must override it.
+
+        It verifies the default value and if it has to be forced to
+        get a value, and set the value_widget.
+
+        Args:
+            force_value (boolean): If True, default value is set.
+
+            default: Default value to set if force_value is True.
+        """
+        error = "init_value() function must be defined for property '{0}'"
+        raise NotImplementedError(error.format(
+                self.__class__.__name__))
+
+    def load_value(self, value):
+        """Loads a value into the property and its value_widget.
+
+        It is a virtual method, so each property must override it.
+        It must not call has_changed(), see :meth:`set_value`.
+
+        Args:
+            value: The new value, None clears the property value.
+        """
+        error = "load_value() function must be defined for property '{0}'"
+        raise NotImplementedError(error.format(
+                self.__class__.__name__))
+
+    def dump_value(self):
+        """Gets the property value as a plain python object.
+
+        Returned value can be passed to :meth:`set_value`.
+        This method should be overriden if value is not
+        a plain python object.
+
+        Returns:
+            The property value, or None if property has no value.
+        """
+        if self._value is None:
+            return
+        return self._value[0]
+
+    def set_value(self, value):
+        """Sets the property value programmatically.
+
+        Display is updated and value is validated, but *changed*
+        signal is not emitted.
+
+        Args:
+            value: The new value, None clears the property value.
+        """
+        self._load_value(value)
+        self._reset_change()
+        self.update_display_value()
+        self.validate()
+
+    def set_mixed(self, mixed):
+        """Sets the mixed state of the property.
+
+        A mixed property has no value and shows that the objects
+        being edited have different values for it. Mixed state ends
+        when property value changes.
+        This method can be extended to show the mixed state
+        in the value_widget.
+
+        Args:
+            mixed (boolean): The mixed state.
+        """
+        self._mixed = mixed
+        if mixed:
+            self._load_value(None)
+            self._last_value = _MIXED
+        self.update_display_value()
+
+    def set_tags(self, tags):
+        """Sets the tags of the property.
+
+        Tags are free strings used to find properties with
+        :py:meth:`PropertyGrid.query
+        <gpropertygrid.base.PropertyGridBase.query>`.
+
+        Args:
+            tags (list): The tags.
+        """
+        old = self._tags
+        self._tags = frozenset(tags)
+        if self._index_key is not None:
+            self._group._grid._index.retag(self, old)
+
+    def set_formatter(self, formatter):
+        """Sets the object that converts the value to display text.
+
+        By default, all properties of the same class share
+        a :py:class:`DisplayFormatter
+        <gpropertygrid.formatters.DisplayFormatter>`.
+
+        Args:
+            formatter (DisplayFormatter): A
+                :py:class:`DisplayFormatter
+                <gpropertygrid.formatters.DisplayFormatter>` object.
+        """
+        self.formatter = formatter
+        self.update_display_value()
+
+    def set_value_provider(self, provider):
+        """Sets the object that fetches the property value.
+
+        Value is fetched in background when the property row is shown,
+        meanwhile a placeholder is displayed.
+
+        Args:
+            provider (ValueProvider): A :py:class:`ValueProvider
+                <gpropertygrid.providers.ValueProvider>` object or None.
+        """
+        self._value_provider = provider
+        if provider is None:
+            self.update_display_value()
+        elif provider.is_valid() or self._is_shown():
+            self._request_value()
+        else:
+            self._set_display_text('[Loading...]')
+
+    def set_validator(self, validator):
+        """Sets the object that validates the property value.
+
+        Value is validated in background each time it changes.
+        Invalid values are marked in the property row and
+        the *validated* signal of the property grid is emitted
+        with each result.
+
+        Args:
+            validator (Validator): A
+                :py:class:`Validator <gpropertygrid.validation.Validator>`
+                object or None.
+        """
+        self._validator = validator
+        if validator is None:
+            self._validation_serial += 1
+            self._set_valid(None, None)
+        else:
+            self.validate()
+
+    def validate(self):
+        """Validates current value using the property validator.
+
+        Result of a validation that was superseded by a newer one
+        is discarded.
+        """
+        if self._validator is None:
+            return
+        self._validation_serial += 1
+        serial = self._validation_serial
+        self._valid = None
+
+        def done(valid, message):
+            if serial == self._validation_serial:
+                self._set_valid(valid, message)
+                if self._group is not None:
+                    self._group._grid._property_validated(self)
+
+        self._validator.validate(self.id, self.dump_value(), done)
+
+    def refresh_value(self):
+        """Invalidates the value provider cache.
+
+        Value is fetched again if the property row is shown,
+        otherwise the next time it is shown.
+        """
+        if self._value_provider is None:
+            return
+        self._value_provider.invalidate()
+        if self._is_shown():
+            self._request_value()
+        else:
+            self._set_display_text('[Loading...]')
+
+    def update_display_value(self):
+        """
+        Update current display value of the property.
+
+        This method should not be called unless a
+        special representation were needed, in this case
+        function must be overriden.
+        """
+        if self._mixed:
+            text = '[Mixed]'
+        elif self._value is None:
+            text = '[No value]'
+        else:
+            text = self.formatter.format(self._value[0])
+        self._set_display_text(text)
+
+    def _format_value(self, value):
+        """Display text of a value in the format returned by
+        :meth:`dump_value`.
+        """
+        if value is None:
+            return '[No value]'
+        return self.formatter.format(value)
+
+    def has_changed(self):
+        """Tells the property grid that the property Value has changed.
+
+        Every property object must call this function
+        each time its value changes.
+        """
+        if self._mixed:
+            self.set_mixed(False)
+        if self._parent is not None:
+            self._parent._child_changed(self)
+        else:
+            self._group._grid._property_changed(self)
+        self.update_display_value()
+        self.validate()
+
+    def on_change(self, data=None):
+        return self._has_focus and not self._updating
+
+    def _request_value(self):
+        provider = self._value_provider
+        if not provider.is_valid():
+            self._set_display_text('[Loading...]')
+
+        def done(value, error):
+            if provider is not self._value_provider:
+                return
+            if error is not None:
+                self._set_display_text('[Error]')
+                self._set_tooltip(str(error))
+                return
+            self._set_tooltip(None)
+            self.set_value(value)
+
+        provider.request(done)
+
+    def _reset_change(self):
+        self._last_value = self.dump_value()
+
+    def _pop_change(self):
+        """Returns (old value, new value) if value changed since
+        last call, otherwise None.
+
+        Values are the ones loaded by undo and redo.
+        """
+        old = self._last_value
+        new = self.dump_value()
+        if old is _MIXED:
+            old = None
+        elif old == new:
+            return
+        self._last_value = new
+        return old, new
+
+    def _write_patch_into(self, value, patch):
+        """Writes a Patch returned by _pop_change() into a value
+        of an edited object.
+        """
+        raise NotImplementedError
+
+    def _has_value(self, value):
+        """Tells if value is the current one.
+        """
+        return self.dump_value() == value
+
+    def _load_value(self, value):
+        self._updating = True
+        try:
+            self.load_value(value)
+        finally:
+            self._updating = False
+
+    def _set_display_text(self, text):
+        if text == self._display_text:
+            return
+        self._display_text = text
+        self._show_display_text(text)
+        if self._group is not None:
+            self._group._grid._property_display_changed(self)
+
+    def _get_display_color(self):
+        """Color painted beside the display text by the canvas
+        rendering, or None.
+        """
+        return
+
+    def _add_rows(self, rows):
+        if not self._hidden:
+            rows.append(self)
+
+    def _is_shown(self):
+        """Tells if the property row is on screen.
+        """
+        raise NotImplementedError()
+
+    def _show_display_text(self, text):
+        raise NotImplementedError()
+
+    def _set_tooltip(self, text):
+        raise NotImplementedError()
+
+    def _set_valid(self, valid, message):
+        raise NotImplementedError()
+
+    def _set_hidden(self, hidden):
+        self._hidden = hidden
+
+
+class CompositeBase(PropertyBase):
+    """Value handling of composite properties.
+
+    Value is a dictionary of child property id and its value.
+    Derived classes must call :meth:`_init_children` before
+    :meth:`_init_state`.
+    """
+
+    def _init_children(self, children):
+        self._children_factory = children
+        self._children = None
+        self._expanded = False
+        self._text = None
+
+    @property
+    def children(self):
+        """
+        List of child property objects, None if they were not
+        created yet. Read only.
+        """
+        return self._children
+
+    @property
+    def expanded(self):
+        """
+        True if children are shown. Read only.
+        """
+        return self._expanded
+
+    def init_value(self, force_value, default):
+        if default is not None and force_value:
+            self._value = [dict(default), ]
+
+    def load_value(self, value):
+        self._text = None
+        if value is None:
+            self._value = None
+        else:
+            self._value = [dict(value), ]
+        if self._children is not None:
+            for child in self._children:
+                child.set_value(self._get_child_value(child))
+
+    def dump_value(self):
+        if self._value is None:
+            return
+        return dict(self._value[0])
+
+    def update_display_value(self):
+        if self._mixed or self._value is None:
+            super(CompositeBase, self).update_display_value()
+            return
+        if self._text is None:
+            self._text = self._format_value(self._value[0])
+        self._set_display_text(self._text)
+
+    def _format_value(self, value):
+        if not isinstance(value, dict):
+            return super(CompositeBase, self)._format_value(value)
+        if self._children is not None:
+            keys = [c.id for c in self._children]
+        else:
+            keys = list(value)
+        return self.formatter.format(
+            '(' + ', '.join(str(value.get(k)) for k in keys) + ')')
+
+    def _get_child_value(self, child):
+        if self._value is None:
+            return
+        return self._value[0].get(child.id)
+
+    def _child_changed(self, child):
+        value = {} if self._value is None else dict(self._value[0])
+        value[child.id] = child.dump_value()
+        self._value = [value, ]
+        self._text = None
+        self.has_changed()
+
+    def _add_rows(self, rows):
+        if self._hidden:
+            return
+        rows.append(self)
+        if self._expanded:
+            for child in self._children:
+                child._add_rows(rows)
+
+
+class PropertyGridBase(object):
+    """Value handling shared by the property grids of all backends.
+
+    Derived classes must call :meth:`_init_state` and define
+    signals *changed*, *validated* and *values-changed*.
+    Groups must implement ``_rows_changed()``.
+    """
+
+    # Class of properties accepted by set_numeric_values()
+    _numeric_type = None
+
+    def _init_state(self):
+        self._groups = []
+        self._properties = []
+        self._property_names = {}
+        self._next_id = -1
+        self._dirty = OrderedDict()
+        self._journal = []
+        self._history = History()
+        self._rules = rules.RuleGraph()
+        self._index = PropertyIndex()
+        self._objects = None
+        self._model = None
+
+    @property
+    def properties(self):
+        """
+        List of all properties objects that belongs to the property grid.
+        """
+        return self._properties
+
+    def get_property_by_id(self, id):
+        """Finds and returns a PropertyGridProperty for given id.
+
+        Args:
+            id (string): The id of the PropertyGridProperty object fo find.
+
+        Returns:
+            A PropertyGridProperty object. None if property is not found.
+        """
+        if id not in self._property_names:
+            return
+        return self._property_names[id]
+
+    def query(self, group=None, type=None, tags=None, name=None):
+        """Finds the properties that satisfy all given conditions.
+
+        Properties are looked up in indexes by group, type and tag,
+        that are updated as properties are added or tagged. Result is
+        a live view, it stays up to date as properties are added,
+        removed or tagged.
+
+        Example::
+
+            sizes = pg.query(type=PropertyInt, tags=['layout'],
+                             name='*_width')
+
+        Args:
+            group (PropertyGridGroup): Optional. Group of the properties.
+
+            type (class): Optional. Class of the properties,
+                subclasses are included.
+
+            tags (list): Optional. Tags the properties must have,
+                see :py:meth:`set_tags
+                <gpropertygrid.base.PropertyBase.set_tags>`.
+
+            name (string): Optional. Pattern with shell wildcards,
+                like 'size_*', property names must match.
+
+        Returns:
+            A :py:class:`PropertyView <gpropertygrid.query.PropertyView>`
+            object, a read only list of properties in the order
+            they were added.
+        """
+        return self._index.query(group, type, tags, name)
+
+    def snapshot(self, as_bytes=False):
+        """Gets the values of all properties.
+
+        Args:
+            as_bytes (boolean): Optional. If True, values are returned
+                as JSON encoded bytes. Default False.
+
+        Returns:
+            A dictionary of property id and its value as returned by
+            :py:meth:`dump_value
+            <gpropertygrid.properties.PropertyGridProperty.dump_value>`.
+        """
+        values = dict((p.id, p.dump_value()) for p in self._properties)
+        if as_bytes:
+            return json.dumps(values, separators=(',', ':')).encode('utf8')
+        return values
+
+    def apply_values(self, values):
+        """Sets the values of several properties at once.
+
+        Only properties whose value differs from the current one are
+        changed, then their displays are updated in a single pass.
+        Instead of a *changed* signal per property, *values-changed*
+        signal is emitted once.
+
+        Args:
+            values: A dictionary of property id and value,
+                or JSON bytes as returned by :meth:`snapshot`.
+                Ids not found in the property grid are ignored.
+
+        Returns:
+            List of property objects that have changed.
+        """
+        if isinstance(values, bytes):
+            values = json.loads(values.decode('utf8'))
+        return self._apply_values(values, True)
+
+    def import_values(self, lines, format=streams.JSONL, batch_size=500):
+        """Sets property values read from a configuration file.
+
+        File is read incrementally, and values are applied in batches
+        of *batch_size*, each one as :meth:`apply_values` does,
+        emitting a *values-changed* signal per batch.
+        All changes are undone in a single :meth:`undo` step.
+
+        Args:
+            lines: Iterable of lines, like a file object,
+                of str or bytes.
+
+            format (string): Optional. Format of the file, see
+                :py:mod:`gpropertygrid.streams`. Default
+                :data:`JSONL <gpropertygrid.streams.JSONL>`.
+
+            batch_size (int): Optional. Number of values applied
+                at once. Default 500.
+
+        Returns:
+            Number of property values that have changed.
+
+        Raises:
+            ValueError: if a line is not valid, values of previous
+                batches remain applied.
+        """
+        count = 0
+        history = []
+        try:
+            items = streams.read_values(lines, format)
+            for batch in streams.iter_batches(items, batch_size):
+                changed, changes = self._apply_batch(batch)
+                history.extend(changes)
+                count += len(changed)
+                if changed:
+                    self.emit("values-changed", changed)
+        finally:
+            if self._objects is None:
+                self._history.record(history)
+        return count
+
+    def export_values(self, format=streams.JSONL):
+        """Writes property values in a configuration file format.
+
+        Lines are generated one at a time while iterating, so
+        the whole document is never built in memory::
+
+            with open('preset.ini', 'w') as f:
+                f.writelines(pg.export_values(streams.INI))
+
+        Args:
+            format (string): Optional. Format of the file, see
+                :py:mod:`gpropertygrid.streams`. Default
+                :data:`JSONL <gpropertygrid.streams.JSONL>`.
+
+        Returns:
+            A generator of lines, ending with a new line character.
+        """
+        def items():
+            for g in self._groups:
+                title = g.get_title()
+                for p in g._properties:
+                    yield title, p.id, p.dump_value()
+
+        return streams.write_values(items(), format)
+
+    def set_numeric_values(self, ids, values):
+        """Sets the values of several numeric properties at once.
+
+        Values are clamped to the range of their property in a single
+        vectorized operation if NumPy is installed, then they are
+        applied as :meth:`apply_values` does.
+
+        Args:
+            ids (list): Ids of
+                :py:class:`PropertyInt <gpropertygrid.properties.PropertyInt>`
+                or :py:class:`PropertyFloat
+                <gpropertygrid.properties.PropertyFloat>` properties.
+
+            values: A NumPy array, array.array or sequence of numbers,
+                one for each id.
+
+        Returns:
+            List of property objects that have changed.
+        """
+        properties = self._get_numeric_properties(ids)
+        values = numeric.clamp(
+            values,
+            [p.lower for p in properties],
+            [p.upper for p in properties])
+        return self._apply_values(dict(zip(ids, values)), True)
+
+    def check_numeric_values(self, ids, values):
+        """Checks if several values are inside the range of their
+        numeric properties.
+
+        See :meth:`set_numeric_values` for parameters.
+
+        Returns:
+            List of booleans, True if value is inside the range.
+        """
+        properties = self._get_numeric_properties(ids)
+        return numeric.in_range(
+            values,
+            [p.lower for p in properties],
+            [p.upper for p in properties])
+
+    def undo(self):
+        """Reverts the last change, or group of changes made by
+        :meth:`apply_values`.
+
+        Consecutive changes of the same property are reverted
+        as a single step. *values-changed* signal is emitted once.
+
+        Returns:
+            True if there was something to undo.
+        """
+        changes = self._history.undo()
+        if changes is None:
+            return False
+        self._apply_values(dict((c[0], c[1]) for c in changes), False)
+        return True
+
+    def redo(self):
+        """Applies again the last change reverted by :meth:`undo`.
+
+        Returns:
+            True if there was something to redo.
+        """
+        changes = self._history.redo()
+        if changes is None:
+            return False
+        self._apply_values(dict((c[0], c[2]) for c in changes), False)
+        return True
+
+    def can_undo(self):
+        """Tells if there are changes to undo.
+        """
+        return self._history.can_undo()
+
+    def can_redo(self):
+        """Tells if there are changes to redo.
+        """
+        return self._history.can_redo()
+
+    def set_history_limits(
+            self, max_entries=None, max_bytes=None, merge_window=None):
+        """Sets the limits of undo history.
+
+        When a limit is exceeded, oldest changes are discarded,
+        but the last undo step is kept even if it is larger
+        than *max_bytes*.
+
+        Args:
+            max_entries (int): Optional. Maximum number of undo steps.
+                Default 100.
+
+            max_bytes (int): Optional. Approximated maximum memory used
+                by undo steps. Default 1 MiB.
+
+            merge_window (float): Optional. Maximum time in seconds
+                between two edits of a property that are undone
+                in a single step. Default 1.
+        """
+        if max_entries is not None:
+            self._history.max_entries = max_entries
+        if max_bytes is not None:
+            self._history.max_bytes = max_bytes
+        if merge_window is not None:
+            self._history.merge_window = merge_window
+        self._history._shrink()
+
+    def clear_history(self):
+        """Discards all undo and redo steps.
+        """
+        self._history.clear()
+
+    def add_rule(self, kind, target, sources, func):
+        """Adds a rule that computes a state of a property from
+        the values of other properties.
+
+        Each time a property value changes, only the rules that depend
+        on it, directly or through the value computed by other rules,
+        are evaluated, in dependency order. A rule function is only
+        called when its source values differ from the last call.
+        Visibility changes caused by a change are applied at once.
+
+        Examples::
+
+            pg.add_rule('visible', 'proxy_host', ['use_proxy'],
+                        lambda use_proxy: use_proxy)
+            pg.add_rule('value', 'area', ['width', 'height'],
+                        lambda w, h: (w or 0) * (h or 0))
+
+        Args:
+            kind (string): 'visible', 'sensitive' or 'value'.
+
+            target (string): Id of the property the result is set to.
+
+            sources (list): Ids of the properties whose values, as
+                returned by :py:meth:`dump_value
+                <gpropertygrid.properties.PropertyGridProperty.dump_value>`,
+                are passed to *func*.
+
+            func (callable): Function that computes the result.
+
+        Returns:
+            A :py:class:`Rule <gpropertygrid.rules.Rule>` object,
+            see :meth:`remove_rule`.
+
+        Raises:
+            ValueError: if *kind* is unknown, if *target* already has
+                a value rule or if rules would depend on each other
+                in a cycle.
+        """
+        rule = rules.Rule(kind, target, sources, func)
+        self._rules.add(rule)
+        self._run_rules(self._rules.get_downstream((), [rule]))
+        return rule
+
+    def remove_rule(self, rule):
+        """Removes a rule added by :meth:`add_rule`.
+
+        The state set by the rule is kept.
+
+        Args:
+            rule (Rule): The rule to remove.
+        """
+        self._rules.remove(rule)
+
+    def evaluate_rules(self):
+        """Evaluates all rules.
+
+        Needed after setting values with
+        :py:meth:`set_value
+        <gpropertygrid.properties.PropertyGridProperty.set_value>`,
+        which does not notify the property grid.
+        """
+        self._run_rules(self._rules.get_downstream((), self._rules.rules))
+
+    @property
+    def model(self):
+        """
+        Model that provides the groups and properties, see
+        :meth:`set_model`. Read only.
+        """
+        return self._model
+
+    def set_model(self, model):
+        """Shows the groups and properties of a model.
+
+        Current groups are removed, and the model creates its own
+        ones, usually fetching properties only when they are needed.
+        See :py:class:`RemoteModel <gpropertygrid.remote.RemoteModel>`.
+
+        A model must implement ``attach(grid)``, called here,
+        ``detach()``, called when it is replaced, and
+        ``group_expanded(group)``, called when the rows of a group
+        are about to be shown for first time.
+
+        On GTK 3, the grid must be created with ``canvas=True``,
+        otherwise all rows are mapped, and the model would fetch
+        all values.
+
+        Args:
+            model: The model object, or None.
+
+        Raises:
+            ValueError: if the grid is a GTK 3 grid without canvas.
+        """
+        if model is not None and not self._draws_shown_rows_only():
+            raise ValueError(
+                "Models need a grid that only draws the rows shown")
+        if self._model is not None:
+            self._model.detach()
+        self.remove_all_groups()
+        self._model = model
+        if model is not None:
+            model.attach(self)
+
+    @property
+    def objects(self):
+        """
+        List of objects being edited, see :meth:`set_objects`.
+        None if not editing objects. Read only.
+        """
+        return self._objects
+
+    def set_objects(self, objects):
+        """Edits several objects at once.
+
+        Objects can be dictionaries, where keys are property ids,
+        or any object with attributes named as property ids.
+        Values must be in the format returned by
+        :py:meth:`dump_value
+        <gpropertygrid.properties.PropertyGridProperty.dump_value>`.
+
+        Each property shows the value that is common to all objects,
+        or a mixed state if they differ. Each change of a property
+        value is written to all objects.
+        Undo history is not recorded while editing objects.
+
+        Args:
+            objects (list): List of objects, None or an empty list
+                stops editing objects.
+        """
+        self._history.clear()
+        if not objects:
+            self._objects = None
+            for p in self._properties:
+                if p._mixed:
+                    p.set_mixed(False)
+            return
+
+        objects = list(objects)
+        self._objects = objects
+        count = len(objects)
+        for p in self._properties:
+            values = _read_values(objects, p.id)
+            first = values[0]
+            if values.count(first) != count:
+                if not p._mixed:
+                    p.set_mixed(True)
+                continue
+            if p._mixed:
+                p.set_mixed(False)
+            if not p._has_value(first):
+                p.set_value(first)
+        self.evaluate_rules()
+
+    @property
+    def dirty(self):
+        """
+        List of ids of the properties changed since last :meth:`commit`.
+        Read only.
+        """
+        return list(self._dirty)
+
+    def is_dirty(self, id):
+        """Tells if a property has changed since last :meth:`commit`.
+
+        Args:
+            id (string): The id of the property.
+        """
+        return id in self._dirty
+
+    def get_changes(self):
+        """Gets the changes made since last :meth:`commit`.
+
+        Returns:
+            A list of tuples (property id, old value, new value),
+            in the order changes were made. Values are the ones
+            returned by :py:meth:`dump_value
+            <gpropertygrid.properties.PropertyGridProperty.dump_value>`,
+            except for properties changed in place, like
+            :py:class:`PropertyArray <gpropertygrid.arrays.PropertyArray>`,
+            whose values are :py:class:`Patch
+            <gpropertygrid.history.Patch>` tuples of the modified
+            parts.
+        """
+        return list(self._journal)
+
+    def get_dirty_values(self):
+        """Gets the current values of properties changed since
+        last :meth:`commit`.
+
+        Returns:
+            A dictionary of property id and value.
+        """
+        return dict(
+            (id, p.dump_value()) for id, p in self._dirty.items())
+
+    def commit(self):
+        """Marks all properties as not changed.
+
+        Returns:
+            List of changes made since last commit,
+            see :meth:`get_changes`.
+        """
+        journal = self._journal
+        self._journal = []
+        self._dirty.clear()
+        return journal
+
+    def _property_changed(self, property_):
+        self._record_change(property_)
+        self.emit("changed::{0}".format(property_.id), property_)
+        for p in self._run_rules(
+                self._rules.get_downstream((property_.id,))):
+            self.emit("changed::{0}".format(p.id), p)
+
+    def _apply_values(self, values, record_history):
+        changed, changes = self._apply_batch(values)
+        if record_history and self._objects is None:
+            self._history.record(changes)
+        if changed:
+            self.emit("values-changed", changed)
+        return changed
+
+    def _apply_batch(self, values):
+        """Sets values and runs rules, without recording history
+        nor emitting signals.
+
+        Returns:
+            A tuple (changed properties, changes for history).
+        """
+        changed = []
+        for id, value in values.items():
+            property_ = self._property_names.get(id)
+            if property_ is None:
+                continue
+            # A mixed property has no value, but objects have, so
+            # it is set even if its value looks the same.
+            if not property_._mixed and property_._has_value(value):
+                continue
+            property_._load_value(value)
+            if property_._mixed:
+                property_.set_mixed(False)
+            changed.append(property_)
+        changes = []
+        for property_ in changed:
+            change = self._record_change(property_, False)
+            if change is not None:
+                changes.append(change)
+            property_.update_display_value()
+            property_.validate()
+        derived = self._run_rules(
+            self._rules.get_downstream([p.id for p in changed]))
+        changed.extend(p for p in derived if p not in changed)
+        return changed, changes
+
+    def _run_rules(self, rules_):
+        """Evaluates rules, given in topological order.
+
+        Derived values are recorded as changes, but not in undo
+        history, as undoing their sources computes them again.
+
+        Returns:
+            List of properties whose value was set by a rule.
+        """
+        changed = []
+        hidden = {}
+        for rule in rules_:
+            target = self._property_names.get(rule.target)
+            if target is None:
+                continue
+            inputs = []
+            for id in rule.sources:
+                p = self._property_names.get(id)
+                inputs.append(None if p is None else p.dump_value())
+            updated, result = rule.evaluate(tuple(inputs))
+            if rule.kind == rules.VALUE:
+                if target._has_value(result):
+                    continue
+                target._load_value(result)
+                if target._mixed:
+                    target.set_mixed(False)
+                if target not in changed:
+                    changed.append(target)
+            elif rule.kind == rules.VISIBLE:
+                hidden[target] = not result
+            elif updated:
+                target.set_sensitive(bool(result))
+                self._property_display_changed(target)
+        for property_ in changed:
+            self._record_change(property_, False)
+            property_.update_display_value()
+            property_.validate()
+        self._set_hidden(hidden)
+        return changed
+
+    def _set_hidden(self, hidden):
+        groups = set()
+        for property_, value in hidden.items():
+            if property_._hidden != value:
+                property_._set_hidden(value)
+                groups.add(property_._group)
+        for group in groups:
+            group._rows_changed()
+
+    def _get_numeric_properties(self, ids):
+        properties = []
+        for id in ids:
+            property_ = self._property_names.get(id)
+            if not isinstance(property_, self._numeric_type):
+                raise ValueError(
+                    "Property {0} is not a numeric property".format(id))
+            properties.append(property_)
+        return properties
+
+    def _record_change(self, property_, record_history=True):
+        change = property_._pop_change()
+        if change is None:
+            return
+        change = (property_.id, ) + change
+        self._journal.append(change)
+        self._dirty[property_.id] = property_
+        if self._objects is not None:
+            self._write_objects(property_, change[2])
+        elif record_history:
+            self._history.record((change, ), merge=True)
+        return change
+
+    def _write_objects(self, property_, value):
+        id = property_.id
+        if isinstance(value, Patch):
+            # Values changed in place only get the modified parts.
+            for obj in self._objects:
+                if isinstance(obj, dict):
+                    target = obj.get(id)
+                else:
+                    target = getattr(obj, id, None)
+                if target is not None:
+                    property_._write_patch_into(target, value)
+            return
+        if isinstance(self._objects[0], dict):
+            for obj in self._objects:
+                obj[id] = value
+        else:
+            for obj in self._objects:
+                setattr(obj, id, value)
+
+    def _property_validated(self, property_):
+        self.emit("validated", property_)
+
+    def _add_property(self, group, property_):
+        property_._group = group
+        if property_.id is None:
+            property_.id = "property_{0}".format(self._next_id)
+            self._next_id += 1
+        if property_.id in self._property_names:
+            raise ValueError(
+                "Properpy with id {0} already exists in property grid".format(
+                    property_.id))
+        self._properties.append(property_)
+        self._property_names[property_.id] = property_
+        group._properties.append(property_)
+        self._index.add(property_)
+
+    def _clear_properties(self):
+        for property_ in self._properties:
+            property_._index_key = None
+        self._index.clear()
+        self._properties = []
+        self._property_names = {}
+        self._journal = []
+        self._dirty.clear()
+
+    def _group_expanded(self, group):
+        if self._model is not None:
+            self._model.group_expanded(group)
+
+    def _property_display_changed(self, property_):
+        """Called when the display text of a property changes.
+        """
+        pass
+
+    def _draws_shown_rows_only(self):
+        """Tells if rows outside the visible area are neither drawn
+        nor mapped, so their values are not fetched.
+        """
+        return True
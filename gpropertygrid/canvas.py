@@ -0,0 +1,352 @@
+# This file is part of GPropertyGrid project.
+# The COPYRIGHT file at the top level of this repository
+# contains the full copyright notices and license terms.
+
+"""
+Custom drawn rendering of the property grid rows.
+
+Rows are painted with cairo on a single Gtk.Layout, only the rows
+inside the visible area are drawn, from the name and display text
+of each property, which has no row widgets. A real value widget is
+placed over the row being edited.
+"""
+
+from collections import OrderedDict
+from gi.repository import Gtk, Gdk, GLib, Pango
+from . properties import PropertyComposite
+
+
+class _LayoutCache(object):
+    def __init__(self, widget, size=4096):
+        self._widget = widget
+        self._size = size
+        self._cache = OrderedDict()
+        self._fonts = None
+
+    def clear(self):
+        self._cache.clear()
+        self._fonts = None
+
+    def get(self, text, width, bold=False):
+        key = (text, width, bold)
+        layout = self._cache.pop(key, None)
+        if layout is None:
+            layout = self._create(text, width, bold)
+        self._cache[key] = layout
+        if len(self._cache) > self._size:
+            self._cache.popitem(last=False)
+        return layout
+
+    def _create(self, text, width, bold):
+        if self._fonts is None:
+            ctx = self._widget.get_style_context()
+            font = ctx.get_font(Gtk.StateFlags.NORMAL).copy()
+            # Same as 'font-size: small' of cells style
+            font.set_size(int(font.get_size() * 0.83))
+            font_bold = font.copy()
+            font_bold.set_weight(Pango.Weight.BOLD)
+            self._fonts = (font, font_bold)
+        layout = self._widget.create_pango_layout(text)
+        layout.set_font_description(self._fonts[1 if bold else 0])
+        layout.set_single_paragraph_mode(True)
+        layout.set_ellipsize(Pango.EllipsizeMode.END)
+        layout.set_width(max(width, 0) * Pango.SCALE)
+        return layout
+
+
+class _GridCanvas(Gtk.Layout):
+    _PADDING = 2
+
+    def __init__(self, grid):
+        super(_GridCanvas, self).__init__()
+        self._grid = grid
+        self._rows = []
+        # Row index of each property shown
+        self._indexes = {}
+        self._rows_queued = False
+        self._row_height = None
+        self._colors = None
+        self._hover = -1
+        self._editing = None
+        self._editor = None
+        self._layouts = _LayoutCache(self)
+
+        self.add_events(
+            Gdk.EventMask.POINTER_MOTION_MASK |
+            Gdk.EventMask.LEAVE_NOTIFY_MASK |
+            Gdk.EventMask.BUTTON_PRESS_MASK)
+        self.connect("draw", self._on_draw)
+        self.connect("motion-notify-event", self._on_motion)
+        self.connect("leave-notify-event", self._on_leave)
+        self.connect("button-press-event", self._on_click)
+        self.connect("style-updated", self._on_style_updated)
+        self.connect("size-allocate", self._on_size_allocate)
+
+    def rows_changed(self):
+        """Rebuilds the rows list once the current batch of changes ends.
+        """
+        if self._rows_queued:
+            return
+        self._rows_queued = True
+        GLib.idle_add(self._update_rows)
+
+    def property_changed(self, property_):
+        if self._rows_queued:
+            return
+        index = self._get_row_index(property_)
+        if index is not None:
+            self._queue_draw_row(index)
+
+    def _update_rows(self):
+        self._rows_queued = False
+        rows = []
+        indexes = {}
+        for g in self._grid._groups:
+            rows.append((g, None))
+            if g.get_expanded():
+                for p in g._get_rows():
+                    indexes[p] = len(rows)
+                    rows.append((g, p))
+        self._rows = rows
+        self._indexes = indexes
+        self._hover = -1
+        if self._editing is not None:
+            index = self._get_row_index(self._editing)
+            if index is None:
+                self._end_edit()
+            else:
+                self._place_editor(index)
+        self._update_size()
+        self.queue_draw()
+        return False
+
+    def _get_row_index(self, property_):
+        return self._indexes.get(property_)
+
+    def _get_row_height(self):
+        if self._row_height is None:
+            layout = self._layouts.get('Xg', -1)
+            self._row_height = \
+                layout.get_pixel_size()[1] + self._PADDING * 2
+        return self._row_height
+
+    def _get_colors(self):
+        if self._colors is None:
+            ctx = self.get_style_context()
+            colors = {}
+            for name in (
+                    'pg_bg_color', 'pg_fg_color',
+                    'pg_selected_bg_color', 'pg_selected_fg_color'):
+                found, color = ctx.lookup_color(name)
+                if not found:
+                    color = ctx.get_color(Gtk.StateFlags.NORMAL)
+                colors[name] = color
+            # Same as 'cell_invalid' style of cells.
+            colors['invalid'] = Gdk.RGBA()
+            colors['invalid'].parse('red')
+            self._colors = colors
+        return self._colors
+
+    def _update_size(self):
+        height = len(self._rows) * self._get_row_height()
+        self.set_size(self.get_allocated_width(), height)
+
+    def _get_name_width(self):
+        return self.get_allocated_width() // 3
+
+    def _on_style_updated(self, wg):
+        self._layouts.clear()
+        self._row_height = None
+        self._colors = None
+        self._update_size()
+
+    def _on_size_allocate(self, wg, allocation):
+        if self.get_size()[0] != allocation.width:
+            self._update_size()
+            if self._editing is not None:
+                index = self._get_row_index(self._editing)
+                if index is not None:
+                    self._place_editor(index)
+
+    def _queue_draw_row(self, index):
+        h = self._get_row_height()
+        y = index * h - int(self.get_vadjustment().get_value())
+        self.queue_draw_area(0, y, self.get_allocated_width(), h)
+
+    def _get_row_at(self, y):
+        index = int(y // self._get_row_height())
+        if 0 <= index < len(self._rows):
+            return index
+        return -1
+
+    def _on_motion(self, wg, event):
+        index = self._get_row_at(event.y)
+        if index != self._hover:
+            if self._hover > -1:
+                self._queue_draw_row(self._hover)
+            if index > -1:
+                self._queue_draw_row(index)
+            self._hover = index
+        return False
+
+    def _on_leave(self, wg, event):
+        if event.detail != Gdk.NotifyType.INFERIOR and self._hover > -1:
+            self._queue_draw_row(self._hover)
+            self._hover = -1
+        return False
+
+    def _on_click(self, wg, event):
+        index = self._get_row_at(event.y)
+        if index == -1:
+            self._end_edit()
+            return False
+        group, property_ = self._rows[index]
+        if property_ is None:
+            self._end_edit()
+            group.set_expanded(not group.get_expanded())
+            return True
+        if property_ is self._editing:
+            self._end_edit()
+            return True
+        if isinstance(property_, PropertyComposite):
+            self._end_edit()
+            property_._show_hide_value_widget()
+            return True
+        self._begin_edit(index, property_)
+        return True
+
+    def _begin_edit(self, index, property_):
+        self._end_edit()
+        self._grid._description.set_value(
+            property_.name, property_.description)
+        if property_._read_only or not property_.get_sensitive():
+            return
+        editor = property_._get_value_widget()
+        parent = editor.get_parent()
+        if parent is not None:
+            parent.remove(editor)
+        self._editing = property_
+        self._editor = editor
+        self.put(editor, 0, 0)
+        self._place_editor(index)
+        editor.show_all()
+        editor.grab_focus()
+        property_._has_focus = True
+        self._queue_draw_row(index)
+
+    def _place_editor(self, index):
+        editor = self._editor
+        x = self._get_name_width()
+        h = self._get_row_height()
+        editor.set_size_request(self.get_allocated_width() - x, h)
+        self.move(editor, x, index * h)
+
+    def _end_edit(self):
+        property_ = self._editing
+        if property_ is None:
+            return
+        editor = self._editor
+        self._editing = None
+        self._editor = None
+        property_._has_focus = False
+        self.remove(editor)
+        editor.set_size_request(-1, -1)
+        property_._release_value_widget()
+        self.property_changed(property_)
+
+    def _on_draw(self, wg, cr):
+        bin_window = self.get_bin_window()
+        if not Gtk.cairo_should_draw_window(cr, bin_window):
+            return False
+        cr.save()
+        Gtk.cairo_transform_to_window(cr, self, bin_window)
+        x1, y1, x2, y2 = cr.clip_extents()
+
+        h = self._get_row_height()
+        first = max(0, int(y1 // h))
+        last = min(len(self._rows), int(y2 // h) + 1)
+        width = self.get_allocated_width()
+        name_width = self._get_name_width()
+        colors = self._get_colors()
+        pad = self._PADDING
+        fetch = []
+
+        for index in range(first, last):
+            group, property_ = self._rows[index]
+            y = index * h
+            if property_ is None:
+                self._draw_header(cr, group, y, width, h, colors)
+                continue
+
+            if index == self._hover:
+                bg = colors['pg_selected_bg_color']
+                fg = colors['pg_selected_fg_color']
+            else:
+                bg = colors['pg_bg_color']
+                fg = colors['pg_fg_color']
+            if not property_.get_sensitive():
+                fg = fg.copy()
+                fg.alpha *= 0.5
+            Gdk.cairo_set_source_rgba(cr, bg)
+            cr.rectangle(0, y, width, h - 1)
+            cr.fill()
+
+            Gdk.cairo_set_source_rgba(cr, fg)
+            indent = pad + 12 * property_._depth
+            layout = self._layouts.get(
+                property_._get_row_name(), name_width - indent - pad)
+            cr.move_to(indent, y + pad)
+            Pango.cairo_show_layout(cr, layout)
+
+            if property_ is self._editing:
+                continue
+
+            provider = property_._value_provider
+            if provider is not None and not provider.is_valid() and \
+                    not provider.is_pending():
+                fetch.append(property_)
+
+            x = name_width + pad
+            color = property_._get_display_color()
+            if color is not None:
+                swatch = (width - name_width) // 5
+                Gdk.cairo_set_source_rgba(cr, color)
+                cr.rectangle(name_width, y, swatch, h - 1)
+                cr.fill()
+                Gdk.cairo_set_source_rgba(cr, fg)
+                x += swatch
+            if property_._valid is False:
+                Gdk.cairo_set_source_rgba(cr, colors['invalid'])
+            layout = self._layouts.get(
+                property_.display_text or '', width - x - pad)
+            cr.move_to(x, y + pad)
+            Pango.cairo_show_layout(cr, layout)
+
+        Gdk.cairo_set_source_rgba(cr, colors['pg_fg_color'])
+        cr.rectangle(name_width, first * h, 1, (last - first) * h)
+        cr.fill()
+        cr.restore()
+
+        if fetch:
+            GLib.idle_add(self._fetch_values, fetch)
+        return False
+
+    def _draw_header(self, cr, group, y, width, h, colors):
+        Gdk.cairo_set_source_rgba(cr, colors['pg_fg_color'])
+        cr.rectangle(0, y, width, h - 1)
+        cr.fill()
+        Gdk.cairo_set_source_rgba(cr, colors['pg_bg_color'])
+        title = '{0} {1}'.format(
+            u'▾' if group.get_expanded() else u'▸',
+            group.get_label_widget().get_text())
+        layout = self._layouts.get(title, width - self._PADDING * 2, True)
+        cr.move_to(self._PADDING, y + self._PADDING)
+        Pango.cairo_show_layout(cr, layout)
+
+    def _fetch_values(self, properties):
+        for p in properties:
+            provider = p._value_provider
+            if provider is not None and not provider.is_valid() and \
+                    not provider.is_pending():
+                p._request_value()
+        return False
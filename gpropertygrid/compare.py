@@ -0,0 +1,381 @@
+# This file is part of GPropertyGrid project.
+# The COPYRIGHT file at the top level of this repository
+# contains the full copyright notices and license terms.
+
+"""
+Side by side comparison of the property values of several objects.
+
+Rows are the properties of a property grid, and there is a column
+for each object. Cells are painted with cairo on a single Gtk.Layout,
+only the rows and columns inside the visible area are drawn.
+"""
+
+from gi.repository import Gtk, Gdk, Pango
+from . base import CompositeBase, _read_values
+from . canvas import _LayoutCache
+
+
+class _ComparisonCanvas(Gtk.Layout):
+    _PADDING = 2
+
+    def __init__(self, grid, name_width, column_width):
+        super(_ComparisonCanvas, self).__init__()
+        self._grid = grid
+        self._name_width = name_width
+        self._column_width = column_width
+        self._objects = []
+        self._titles = []
+        self._rows = []
+        self._collapsed = set()
+        # Composites expanded here, the grid ones are not changed.
+        self._expanded = set()
+        # Children created here for composites the grid has not
+        # expanded yet.
+        self._children = {}
+        self._values = {}
+        self._diffs = {}
+        self._row_height = None
+        self._colors = None
+        self._layouts = _LayoutCache(self)
+
+        self.add_events(Gdk.EventMask.BUTTON_PRESS_MASK)
+        self.connect("draw", self._on_draw)
+        self.connect("button-press-event", self._on_click)
+        self.connect("style-updated", self._on_style_updated)
+
+    def set_objects(self, objects, titles):
+        self._objects = list(objects or ())
+        if titles is None:
+            titles = [str(i + 1) for i in range(len(self._objects))]
+        elif len(titles) != len(self._objects):
+            raise ValueError(
+                "There are {0} titles for {1} objects".format(
+                    len(titles), len(self._objects)))
+        self._titles = list(titles)
+        self.refresh()
+
+    def refresh(self):
+        values = {}
+        diffs = {}
+        for g in self._grid._groups:
+            for p in g._properties:
+                self._read(p, None, values, diffs)
+        self._values = values
+        self._diffs = diffs
+        self._update_rows()
+
+    def _read(self, property_, parent_values, values, diffs):
+        if parent_values is None:
+            found = _read_values(self._objects, property_.id)
+        else:
+            found = [
+                v.get(property_.id) if isinstance(v, dict) else None
+                for v in parent_values]
+        values[property_] = found
+        if found:
+            first = found[0]
+            columns = frozenset(
+                i for i, v in enumerate(found) if v != first)
+            if columns:
+                diffs[property_] = columns
+        for child in self._get_children(property_) or ():
+            self._read(child, found, values, diffs)
+
+    def _get_children(self, property_):
+        if not isinstance(property_, CompositeBase):
+            return
+        children = self._children.get(property_)
+        if children is None:
+            children = property_._children
+        return children
+
+    def _update_rows(self):
+        rows = []
+        for g in self._grid._groups:
+            rows.append((g, None, 0))
+            if g not in self._collapsed:
+                for p in g._properties:
+                    self._add_rows(g, p, 0, rows)
+        self._rows = rows
+        self._update_size()
+        self.queue_draw()
+
+    def _add_rows(self, group, property_, depth, rows):
+        if property_._hidden:
+            return
+        rows.append((group, property_, depth))
+        if property_ in self._expanded:
+            for child in self._get_children(property_):
+                self._add_rows(group, child, depth + 1, rows)
+
+    def _toggle_row(self, index):
+        group, property_, depth = self._rows[index]
+        if property_ is None:
+            if group in self._collapsed:
+                self._collapsed.remove(group)
+            else:
+                self._collapsed.add(group)
+            self._update_rows()
+            return True
+        if not isinstance(property_, CompositeBase):
+            return False
+        if property_ in self._expanded:
+            self._expanded.remove(property_)
+            self._update_rows()
+            return True
+        self._expanded.add(property_)
+        children = self._get_children(property_)
+        if children is None:
+            children = list(property_._children_factory())
+            self._children[property_] = children
+        if any(c not in self._values for c in children):
+            self.refresh()
+        else:
+            self._update_rows()
+        return True
+
+    def _get_row_height(self):
+        if self._row_height is None:
+            layout = self._layouts.get('Xg', -1)
+            self._row_height = \
+                layout.get_pixel_size()[1] + self._PADDING * 2
+        return self._row_height
+
+    def _get_colors(self):
+        if self._colors is None:
+            ctx = self.get_style_context()
+            colors = {}
+            for name in (
+                    'pg_bg_color', 'pg_fg_color',
+                    'pg_selected_bg_color', 'pg_selected_fg_color'):
+                found, color = ctx.lookup_color(name)
+                if not found:
+                    color = ctx.get_color(Gtk.StateFlags.NORMAL)
+                colors[name] = color
+            diff = colors['pg_selected_bg_color'].copy()
+            diff.alpha = 0.4
+            colors['diff'] = diff
+            self._colors = colors
+        return self._colors
+
+    def _update_size(self):
+        # First row holds the object titles.
+        self.set_size(
+            self._name_width + len(self._objects) * self._column_width,
+            (len(self._rows) + 1) * self._get_row_height())
+
+    def _on_style_updated(self, wg):
+        self._layouts.clear()
+        self._row_height = None
+        self._colors = None
+        self._update_size()
+
+    def _get_scroll(self):
+        return (
+            int(self.get_hadjustment().get_value()),
+            int(self.get_vadjustment().get_value()))
+
+    def _on_click(self, wg, event):
+        h = self._get_row_height()
+        if event.y < self._get_scroll()[1] + h:
+            return False
+        index = int(event.y // h) - 1
+        if not 0 <= index < len(self._rows):
+            return False
+        return self._toggle_row(index)
+
+    def _on_draw(self, wg, cr):
+        bin_window = self.get_bin_window()
+        if not Gtk.cairo_should_draw_window(cr, bin_window):
+            return False
+        cr.save()
+        Gtk.cairo_transform_to_window(cr, self, bin_window)
+        x1, y1, x2, y2 = cr.clip_extents()
+
+        h = self._get_row_height()
+        cw = self._column_width
+        nw = self._name_width
+        sx, sy = self._get_scroll()
+        colors = self._get_colors()
+        first = max(0, int(y1 // h) - 1)
+        last = min(len(self._rows), int(y2 // h))
+        first_col = max(0, int((x1 - nw) // cw))
+        last_col = min(len(self._objects), int((x2 - nw) // cw) + 1)
+
+        for index in range(first, last):
+            group, property_, depth = self._rows[index]
+            y = (index + 1) * h
+            if property_ is None:
+                self._draw_header(cr, group, sx, y, x2 - sx, h, colors)
+                continue
+            self._draw_cells(
+                cr, property_, y, h, first_col, last_col, colors)
+
+        # Names and titles stay in place while scrolling.
+        for index in range(first, last):
+            group, property_, depth = self._rows[index]
+            if property_ is not None:
+                self._draw_name(
+                    cr, property_, depth, sx, (index + 1) * h, h, colors)
+        self._draw_titles(
+            cr, sx, sy, x2 - sx, h, first_col, last_col, colors)
+        cr.restore()
+        return False
+
+    def _draw_header(self, cr, group, x, y, width, h, colors):
+        pad = self._PADDING
+        Gdk.cairo_set_source_rgba(cr, colors['pg_fg_color'])
+        cr.rectangle(x, y, width, h - 1)
+        cr.fill()
+        Gdk.cairo_set_source_rgba(cr, colors['pg_bg_color'])
+        title = '{0} {1}'.format(
+            u'▸' if group in self._collapsed else u'▾',
+            group.get_label_widget().get_text())
+        layout = self._layouts.get(title, self._name_width - pad * 2, True)
+        cr.move_to(x + pad, y + pad)
+        Pango.cairo_show_layout(cr, layout)
+
+    def _draw_cells(
+            self, cr, property_, y, h, first_col, last_col, colors):
+        pad = self._PADDING
+        cw = self._column_width
+        values = self._values.get(property_)
+        diffs = self._diffs.get(property_, ())
+        for col in range(first_col, last_col):
+            x = self._name_width + col * cw
+            if col in diffs:
+                Gdk.cairo_set_source_rgba(cr, colors['diff'])
+            else:
+                Gdk.cairo_set_source_rgba(cr, colors['pg_bg_color'])
+            cr.rectangle(x, y, cw - 1, h - 1)
+            cr.fill()
+            if values is None:
+                continue
+            Gdk.cairo_set_source_rgba(cr, colors['pg_fg_color'])
+            layout = self._layouts.get(
+                property_._format_value(values[col]), cw - pad * 2)
+            cr.move_to(x + pad, y + pad)
+            Pango.cairo_show_layout(cr, layout)
+
+    def _draw_name(self, cr, property_, depth, x, y, h, colors):
+        pad = self._PADDING
+        Gdk.cairo_set_source_rgba(cr, colors['pg_bg_color'])
+        cr.rectangle(x, y, self._name_width - 1, h - 1)
+        cr.fill()
+        Gdk.cairo_set_source_rgba(cr, colors['pg_fg_color'])
+        name = property_.name
+        if isinstance(property_, CompositeBase):
+            name = '{0} {1}'.format(
+                u'▾' if property_ in self._expanded else u'▸', name)
+        indent = pad + 12 * depth
+        layout = self._layouts.get(name, self._name_width - indent - pad)
+        cr.move_to(x + indent, y + pad)
+        Pango.cairo_show_layout(cr, layout)
+
+    def _draw_titles(
+            self, cr, x, y, width, h, first_col, last_col, colors):
+        pad = self._PADDING
+        cw = self._column_width
+        Gdk.cairo_set_source_rgba(cr, colors['pg_fg_color'])
+        cr.rectangle(x, y, width, h - 1)
+        cr.fill()
+        Gdk.cairo_set_source_rgba(cr, colors['pg_bg_color'])
+        for col in range(first_col, last_col):
+            cell_x = self._name_width + col * cw
+            layout = self._layouts.get(
+                self._titles[col], cw - pad * 2, True)
+            cr.move_to(cell_x + pad, y + pad)
+            Pango.cairo_show_layout(cr, layout)
+        # Corner over the names column.
+        Gdk.cairo_set_source_rgba(cr, colors['pg_fg_color'])
+        cr.rectangle(x, y, self._name_width, h - 1)
+        cr.fill()
+
+
+class PropertyComparison(Gtk.ScrolledWindow):
+    def __init__(self, grid, name_width=200, column_width=120):
+        """Shows the values of several objects side by side.
+
+        Rows are the groups and properties of *grid*, and there is
+        a column for each object. Values are read only, and composite
+        properties are expanded here without expanding them in
+        the grid.
+        Cells that differ from the first object are highlighted,
+        differences are computed each time objects are set or
+        :meth:`refresh` is called, not while drawing.
+
+        Args:
+            grid (PropertyGrid): Property grid whose properties
+                are compared. It is not changed.
+
+            name_width (int): Optional. Width in pixels of the
+                property names column. Default 200.
+
+            column_width (int): Optional. Width in pixels of each
+                object column. Default 120.
+        """
+        super(PropertyComparison, self).__init__()
+        self._canvas = _ComparisonCanvas(grid, name_width, column_width)
+        self.add(self._canvas)
+        self.get_hadjustment().connect(
+            "value-changed", self._on_scroll)
+        self.get_vadjustment().connect(
+            "value-changed", self._on_scroll)
+
+    @property
+    def objects(self):
+        """
+        List of objects being compared. Read only.
+        """
+        return list(self._canvas._objects)
+
+    @property
+    def differences(self):
+        """
+        List of ids of the properties whose value is not the same
+        in all objects. Read only.
+        """
+        diffs = self._canvas._diffs
+        return [p.id for p in self._canvas._grid._properties if p in diffs]
+
+    def set_objects(self, objects, titles=None):
+        """Sets the objects to compare.
+
+        Objects can be dictionaries, where keys are property ids,
+        or any object with attributes named as property ids,
+        as in :py:meth:`set_objects
+        <gpropertygrid.base.PropertyGridBase.set_objects>`.
+
+        Args:
+            objects (list): List of objects.
+
+            titles (list): Optional. Column title of each object.
+                Default is the object position, starting at 1.
+
+        Raises:
+            ValueError: if there is not a title for each object.
+        """
+        self._canvas.set_objects(objects, titles)
+
+    def refresh(self):
+        """Reads the values of the objects again.
+
+        It must be called after objects or grid properties change.
+        """
+        self._canvas.refresh()
+
+    def get_different_columns(self, id):
+        """Gets the objects whose value differs from the first one.
+
+        Args:
+            id (string): Id of the property.
+
+        Returns:
+            Sorted list of object indexes.
+        """
+        property_ = self._canvas._grid.get_property_by_id(id)
+        return sorted(self._canvas._diffs.get(property_, ()))
+
+    def _on_scroll(self, adjustment):
+        # Names and titles are drawn at scroll position.
+        self._canvas.queue_draw()
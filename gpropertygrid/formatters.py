@@ -0,0 +1,163 @@
+# This file is part of GPropertyGrid project.
+# The COPYRIGHT file at the top level of this repository
+# contains the full copyright notices and license terms.
+
+"""
+Formatters that convert property values to display text.
+"""
+
+from collections import OrderedDict
+
+try:
+    import reprlib
+except ImportError:
+    import repr as reprlib
+
+# Immutable types whose values are cached, strings are only cached
+# when they are not longer than the maximum length of text, and
+# tuples and frozensets when they have few items of cached types.
+_CACHED_TYPES = (int, float, complex, type(None))
+_CACHED_STRING_TYPES = (str, bytes)
+_CACHED_CONTAINER_TYPES = (tuple, frozenset)
+_MAX_CACHED_ITEMS = 16
+
+
+def _int_to_text(value):
+    try:
+        return str(value)
+    except ValueError:
+        # Too many digits for a decimal string,
+        # see sys.set_int_max_str_digits().
+        return hex(value)
+
+
+class _Repr(reprlib.Repr):
+    def repr_int(self, x, level):
+        try:
+            return reprlib.Repr.repr_int(self, x, level)
+        except ValueError:
+            return _int_to_text(x)
+
+
+class DisplayFormatter(object):
+    def __init__(self, max_length=200, cache_size=256, cached_types=()):
+        """Converts values to the text displayed in the property row.
+
+        Text is truncated to *max_length* characters, and the
+        text of recently formatted numbers, short strings, and small
+        tuples and frozensets of them is cached, so formatting the
+        same value again costs a dictionary lookup. Other values are
+        formatted each time, so the cache never keeps large or
+        mutable values alive.
+
+        Derived classes must override :meth:`to_text` to change
+        how values are converted.
+
+        Args:
+            max_length (int): Optional. Maximum length of text.
+                Default 200.
+
+            cache_size (int): Optional. Number of values whose text
+                is cached. Default 256.
+
+            cached_types (tuple): Optional. Other immutable and
+                hashable types whose text is cached, like types that
+                are slow to convert to text. Values that compare
+                equal must have the same text. Default none.
+        """
+        self.max_length = max_length
+        self._cache_size = cache_size
+        self._cached_types = _CACHED_TYPES + tuple(cached_types)
+        self._cache = OrderedDict()
+        self._last = (None, None)
+        self._repr = _Repr()
+        self._repr.maxstring = max_length
+        self._repr.maxother = max_length
+
+    def format(self, value):
+        """Gets the display text of a value.
+
+        Args:
+            value: The value to format.
+
+        Returns:
+            The display text.
+        """
+        key = self._get_key(value)
+        if key is None:
+            return self._truncate(self.to_text(value))
+        if key == self._last[0]:
+            return self._last[1]
+        try:
+            text = self._cache.pop(key)
+        except KeyError:
+            text = self._truncate(self.to_text(value))
+        self._cache[key] = text
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        self._last = (key, text)
+        return text
+
+    def to_text(self, value):
+        """Converts a value to text.
+
+        Containers are represented showing only their first elements.
+
+        Args:
+            value: The value to convert.
+
+        Returns:
+            A string, it is truncated afterwards if needed.
+        """
+        if isinstance(value, (list, tuple, dict, set, frozenset)):
+            return self._repr.repr(value)
+        if isinstance(value, int):
+            return _int_to_text(value)
+        return str(value)
+
+    def clear_cache(self):
+        """Discards all cached text.
+        """
+        self._cache.clear()
+        self._last = (None, None)
+
+    def _get_key(self, value):
+        """Gets the cache key of a value, or None if it is not cached.
+        """
+        if isinstance(value, (float, complex)):
+            # Unlike values, repr tells 0.0 from -0.0,
+            # and it is the same for all NaN.
+            return (type(value), repr(value))
+        if isinstance(value, _CACHED_STRING_TYPES):
+            if len(value) > self.max_length:
+                return
+        elif isinstance(value, _CACHED_CONTAINER_TYPES):
+            if len(value) > _MAX_CACHED_ITEMS:
+                return
+            keys = [self._get_key(v) for v in value]
+            if None in keys:
+                return
+            if isinstance(value, frozenset):
+                return (type(value), frozenset(keys))
+            return (type(value), tuple(keys))
+        elif not isinstance(value, self._cached_types):
+            return
+        return (type(value), value)
+
+    def _truncate(self, text):
+        if len(text) > self.max_length:
+            return text[:self.max_length] + '...'
+        return text
+
+
+class FirstLineFormatter(DisplayFormatter):
+    """Formatter that shows only the first line of a string.
+
+    See :class:`DisplayFormatter` for parameters.
+    """
+
+    def to_text(self, value):
+        end = value.find('\n', 0, self.max_length + 1)
+        if end == -1:
+            return value[:self.max_length + 1]
+        return value[:end] + '...'
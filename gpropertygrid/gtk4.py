@@ -0,0 +1,1218 @@
+# This file is part of GPropertyGrid project.
+# The COPYRIGHT file at the top level of this repository
+# contains the full copyright notices and license terms.
+
+"""
+GTK 4 backend of the property grid.
+
+Rows are shown by a Gtk.ColumnView, which only creates widgets for
+the visible rows and recycles them while scrolling. Groups and
+properties are items of a Gtk.TreeListModel instead of widgets,
+and the value widget of a property is placed in its row while
+it is being edited.
+
+Gtk 4.0 must be required before importing this module::
+
+    import gi
+    gi.require_version('Gtk', '4.0')
+    from gpropertygrid.gtk4 import PropertyGrid, PropertyString
+"""
+
+from weakref import WeakKeyDictionary
+from gi.repository import Gtk, Gdk, Gio, GLib, GObject, Pango
+from . base import PropertyBase, CompositeBase, PropertyGridBase
+from . formatters import FirstLineFormatter
+
+if Gtk.get_major_version() < 4:
+    raise ImportError("gpropertygrid.gtk4 requires Gtk 4.0")
+
+_CSS = """
+.property-grid-header {
+    font-weight: bold;
+    padding: 2px;
+}
+
+.group-header {
+    font-weight: bold;
+    font-size: small;
+}
+
+.cell {
+    font-size: small;
+}
+
+.cell-invalid {
+    color: red;
+}
+
+.description-name {
+    font-weight: bold;
+    font-size: small;
+}
+"""
+
+_css_loaded = False
+
+
+def _load_css():
+    global _css_loaded
+    if _css_loaded:
+        return
+    provider = Gtk.CssProvider()
+    if hasattr(provider, 'load_from_string'):
+        provider.load_from_string(_CSS)
+    else:
+        provider.load_from_data(_CSS, -1)
+    Gtk.StyleContext.add_provider_for_display(
+        Gdk.Display.get_default(),
+        provider,
+        Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
+    _css_loaded = True
+
+
+class PropertyGridProperty(PropertyBase, GObject.Object):
+    display_text = GObject.Property(type=str, default='')
+    tooltip = GObject.Property(type=str)
+    editing = GObject.Property(type=bool, default=False)
+    invalid = GObject.Property(type=bool, default=False)
+    sensitive = GObject.Property(type=bool, default=True)
+
+    def __init__(
+            self, name,
+            value_widget,
+            id=None,
+            description=None,
+            default=None,
+            force_value=False):
+        """Main property class from where all property classes must derives.
+
+        Parameters are the same as in :py:class:`PropertyGridProperty
+        <gpropertygrid.properties.PropertyGridProperty>`. The
+        property is not a widget, *value_widget* is shown in the
+        property row while the property is being edited.
+        """
+        GObject.Object.__init__(self)
+        self._init_state(name, id, description)
+        # Number of cells showing the property
+        self._bound = 0
+        # Position in the store of its group or parent property
+        self._position = 0
+        self._value_widget = value_widget
+
+        self.init_value(force_value, default)
+        self._reset_change()
+        self.update_display_value()
+
+    def set_read_only(self, readonly):
+        """Sets Read only state of the property.
+
+        Args:
+            readonly (boolean): Value that sets the read only state.
+        """
+        self._read_only = readonly
+
+    def set_sensitive(self, sensitive):
+        """Sets the sensitive state of the property row.
+
+        Args:
+            sensitive (boolean): If False, the property can not
+                be edited and its row is dimmed.
+        """
+        self.sensitive = sensitive
+
+    def get_sensitive(self):
+        return self.sensitive
+
+    def _is_shown(self):
+        return self._bound > 0
+
+    def _show_display_text(self, text):
+        self.display_text = text
+
+    def _set_tooltip(self, text):
+        self.tooltip = text
+
+    def _set_valid(self, valid, message):
+        self._valid = valid
+        self.invalid = valid is False
+        self.tooltip = message
+
+
+class PropertyString(PropertyGridProperty):
+    def __init__(
+            self, name,
+            id=None,
+            default=None,
+            description=None,
+            force_value=False):
+        """A String property class.
+
+        See :py:class:`PropertyString
+        <gpropertygrid.properties.PropertyString>`.
+        """
+        self._txt = Gtk.Entry()
+        self._txt.connect("changed", self._on_txt_changed)
+
+        super(PropertyString, self).__init__(
+            name=name,
+            value_widget=self._txt,
+            id=id,
+            default=default,
+            description=description,
+            force_value=force_value)
+
+    def init_value(self, force_value, default):
+        if default is not None and force_value:
+            self._value = [default, ]
+        if default is None:
+            default = ''
+        self._txt.set_text(default)
+
+    def load_value(self, value):
+        if value is None:
+            self._value = None
+            self._txt.set_text('')
+        else:
+            self._value = [value, ]
+            self._txt.set_text(value)
+
+    def set_mixed(self, mixed):
+        self._txt.set_placeholder_text('[Mixed]' if mixed else None)
+        super(PropertyString, self).set_mixed(mixed)
+
+    def on_change(self):
+        if not super(PropertyString, self).on_change():
+            return False
+        if self._value is None:
+            self._value = [None, ]
+        self._value[0] = self._txt.get_text()
+        self.has_changed()
+        return True
+
+    def _on_txt_changed(self, wg):
+        self.on_change()
+
+
+class _WindowMultiline(Gtk.Window):
+    # Size of text inserted in the buffer on each main loop iteration
+    _CHUNK_SIZE = 65536
+
+    def __init__(self, parent):
+        super(_WindowMultiline, self).__init__(
+            title='Multiline string', modal=True,
+            transient_for=parent, hide_on_close=True)
+        self.set_default_size(300, 300)
+        self._text = None
+        self._offset = 0
+        self._source = None
+        self._callback = None
+
+        text_view = Gtk.TextView()
+        self._buffer = text_view.get_buffer()
+
+        sw = Gtk.ScrolledWindow(vexpand=True, has_frame=True)
+        sw.set_child(text_view)
+
+        cancel = Gtk.Button.new_with_label('Cancel')
+        cancel.connect("clicked", self._on_response, False)
+        self._ok = Gtk.Button.new_with_label('OK')
+        self._ok.connect("clicked", self._on_response, True)
+
+        buttons = Gtk.Box(spacing=6, halign=Gtk.Align.END)
+        buttons.append(cancel)
+        buttons.append(self._ok)
+
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=6)
+        box.append(sw)
+        box.append(buttons)
+        self.set_child(box)
+
+    def load(self, text, callback):
+        """Shows the window with *text*, *callback* is called with
+        the new text when OK button is clicked.
+
+        Large texts are inserted in chunks, as GTK 3 backend does.
+        """
+        self._stop_loading()
+        self._callback = callback
+        self._buffer.set_text('')
+        if text is not None:
+            if len(text) <= self._CHUNK_SIZE:
+                self._buffer.set_text(text)
+            else:
+                self._text = text
+                self._offset = 0
+                self._ok.set_sensitive(False)
+                self._source = GLib.idle_add(self._load_chunk)
+        self.present()
+
+    def _on_response(self, btn, ok):
+        callback = self._callback
+        text = self._buffer.get_text(
+            self._buffer.get_start_iter(),
+            self._buffer.get_end_iter(),
+            True)
+        self._stop_loading()
+        self._callback = None
+        self.set_visible(False)
+        self._buffer.set_text('')
+        if ok and callback is not None:
+            callback(text)
+
+    def _load_chunk(self):
+        end = self._offset + self._CHUNK_SIZE
+        self._buffer.insert(
+            self._buffer.get_end_iter(), self._text[self._offset:end])
+        self._offset = end
+        if self._offset < len(self._text):
+            return True
+        self._source = None
+        self._stop_loading()
+        return False
+
+    def _stop_loading(self):
+        if self._source is not None:
+            GLib.source_remove(self._source)
+            self._source = None
+        self._text = None
+        self._ok.set_sensitive(True)
+
+
+class PropertyStringMultiline(PropertyGridProperty):
+    # One window per parent window, reused by all properties.
+    _windows = WeakKeyDictionary()
+
+    formatter = FirstLineFormatter()
+
+    def __init__(
+            self,
+            name,
+            parent_window,
+            id=None,
+            default=None,
+            description=None,
+            force_value=False):
+        """A property that manages multiline string.
+
+        See :py:class:`PropertyStringMultiline
+        <gpropertygrid.properties.PropertyStringMultiline>`.
+        """
+        self._window = parent_window
+        self._default = default
+
+        self._label = Gtk.Label(xalign=0, hexpand=True)
+        self._label.set_single_line_mode(True)
+        self._label.set_ellipsize(Pango.EllipsizeMode.END)
+        self._button = Gtk.Button.new_with_label('...')
+        self._button.connect("clicked", self._on_click_button)
+
+        hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL)
+        hbox.append(self._label)
+        hbox.append(self._button)
+
+        super(PropertyStringMultiline, self).__init__(
+            name=name,
+            value_widget=hbox,
+            id=id,
+            default=default,
+            description=description,
+            force_value=force_value)
+
+    def init_value(self, force_value, default):
+        if default is not None:
+            self._label.set_text(self.formatter.format(default))
+            if force_value:
+                self._value = [default, ]
+
+    def load_value(self, value):
+        if value is None:
+            self._value = None
+            self._label.set_text('')
+        else:
+            self._value = [value, ]
+            self._label.set_text(self.formatter.format(value))
+
+    def on_change(self, txt):
+        if not super(PropertyStringMultiline, self).on_change():
+            return False
+        if self._value is None:
+            self._value = [None, ]
+        self._value[0] = txt
+        self._label.set_text(self.formatter.format(txt))
+        self.has_changed()
+        return True
+
+    def _on_click_button(self, btn):
+        txt = None
+        if self._value is not None:
+            txt = self._value[0]
+        elif self._default is not None:
+            txt = self._default
+        key = self if self._window is None else self._window
+        window = PropertyStringMultiline._windows.get(key)
+        if window is None:
+            window = _WindowMultiline(self._window)
+            PropertyStringMultiline._windows[key] = window
+        window.load(txt, self.on_change)
+
+
+class PropertyBool(PropertyGridProperty):
+    def __init__(
+            self, name, id=None,
+            default=None, description=None,
+            force_value=False):
+        """A Boolean property class.
+
+        See :py:class:`PropertyBool <gpropertygrid.properties.PropertyBool>`.
+        """
+        self._check = Gtk.CheckButton()
+        self._check.connect("toggled", self._on_toggled)
+
+        super(PropertyBool, self).__init__(
+                name=name, value_widget=self._check,
+                id=id, default=default, description=description,
+                force_value=force_value)
+
+    def init_value(self, force_value, default):
+        if default is True:
+            self._check.set_active(True)
+        if default is not None and force_value:
+            self._value = [bool(default), ]
+
+    def load_value(self, value):
+        if value is None:
+            self._value = None
+            self._check.set_active(False)
+        else:
+            self._value = [bool(value), ]
+            self._check.set_active(bool(value))
+
+    def set_mixed(self, mixed):
+        self._check.set_inconsistent(mixed)
+        super(PropertyBool, self).set_mixed(mixed)
+
+    def on_change(self):
+        if not super(PropertyBool, self).on_change():
+            return False
+        if self._value is None:
+            self._value = [None, ]
+        self._value[0] = self._check.get_active()
+        self.has_changed()
+        return True
+
+    def _on_toggled(self, wg):
+        self.on_change()
+
+
+class _PropertyNumeric(PropertyGridProperty):
+    def __init__(
+            self, name, id, default, description, force_value,
+            lower, upper, step, digits):
+        self._lower = lower
+        self._upper = upper
+
+        adjustment = Gtk.Adjustment(
+            value=0, lower=lower, upper=upper,
+            step_increment=step, page_increment=step * 10,
+            page_size=0)
+        self._spin = Gtk.SpinButton(adjustment=adjustment, digits=digits)
+        self._spin.set_numeric(True)
+        self._spin.connect("value-changed", self._on_value_changed)
+
+        super(_PropertyNumeric, self).__init__(
+                name=name, value_widget=self._spin,
+                id=id, default=default, description=description,
+                force_value=force_value)
+
+    @property
+    def lower(self):
+        """
+        Minimum value allowed. Read only.
+        """
+        return self._lower
+
+    @property
+    def upper(self):
+        """
+        Maximum value allowed. Read only.
+        """
+        return self._upper
+
+    def init_value(self, force_value, default):
+        if default is not None:
+            self._spin.set_value(default)
+            if force_value:
+                self._value = [self._get_spin_value(), ]
+
+    def load_value(self, value):
+        if value is None:
+            self._value = None
+            self._spin.set_value(0)
+        else:
+            self._spin.set_value(value)
+            self._value = [self._get_spin_value(), ]
+
+    def on_change(self):
+        if not super(_PropertyNumeric, self).on_change():
+            return False
+        self._value = [self._get_spin_value(), ]
+        self.has_changed()
+        return True
+
+    def _get_spin_value(self):
+        raise NotImplementedError()
+
+    def _on_value_changed(self, wg):
+        self.on_change()
+
+
+class PropertyInt(_PropertyNumeric):
+    def __init__(
+            self, name, id=None,
+            default=None, description=None,
+            force_value=False, lower=-2147483648,
+            upper=2147483647, step=1):
+        """An integer property class.
+
+        See :py:class:`PropertyInt <gpropertygrid.properties.PropertyInt>`.
+        """
+        super(PropertyInt, self).__init__(
+            name, id, default, description, force_value,
+            lower, upper, step, 0)
+
+    def _get_spin_value(self):
+        return self._spin.get_value_as_int()
+
+
+class PropertyFloat(_PropertyNumeric):
+    def __init__(
+            self, name, id=None,
+            default=None, description=None,
+            force_value=False, lower=-1e15,
+            upper=1e15, step=0.1, digits=2):
+        """A float property class.
+
+        See :py:class:`PropertyFloat
+        <gpropertygrid.properties.PropertyFloat>`.
+        """
+        self._digits = digits
+        super(PropertyFloat, self).__init__(
+            name, id, default, description, force_value,
+            lower, upper, step, digits)
+
+    def _get_spin_value(self):
+        return round(self._spin.get_value(), self._digits)
+
+
+class PropertyColor(PropertyGridProperty):
+    def __init__(
+            self, name, id=None,
+            default=None, description=None,
+            force_value=False):
+        """A Color property class.
+
+        See :py:class:`PropertyColor
+        <gpropertygrid.properties.PropertyColor>`.
+        """
+        self._txt = Gtk.Entry(hexpand=True)
+        self._txt.connect("changed", self._on_txt_changed)
+
+        if hasattr(Gtk, 'ColorDialogButton'):
+            self._button = Gtk.ColorDialogButton(
+                dialog=Gtk.ColorDialog(with_alpha=True))
+            self._button.connect("notify::rgba", self._on_color_set)
+        else:
+            self._button = Gtk.ColorButton(use_alpha=True)
+            self._button.connect("color-set", self._on_color_set)
+
+        hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL)
+        hbox.append(self._button)
+        hbox.append(self._txt)
+
+        super(PropertyColor, self).__init__(
+            name=name,
+            value_widget=hbox,
+            id=id,
+            default=default,
+            description=description,
+            force_value=force_value)
+
+    def init_value(self, force_value, default):
+        color = self._get_color_from_str(default)
+        if color:
+            if force_value:
+                self._value = [color, ]
+            self._button.set_rgba(color)
+            self._txt.set_text(default)
+        else:
+            self._txt.set_text('')
+
+    def load_value(self, value):
+        if isinstance(value, Gdk.RGBA):
+            value = value.to_string()
+        color = self._get_color_from_str(value)
+        if color:
+            self._value = [color, ]
+            self._button.set_rgba(color)
+            self._txt.set_text(value)
+        else:
+            self._value = None
+            self._button.set_rgba(Gdk.RGBA())
+            self._txt.set_text('')
+
+    def set_mixed(self, mixed):
+        self._txt.set_placeholder_text('[Mixed]' if mixed else None)
+        super(PropertyColor, self).set_mixed(mixed)
+
+    def on_change(self):
+        if not super(PropertyColor, self).on_change():
+            return False
+        if self._value is None:
+            self._value = [None, ]
+        color = self._get_color_from_str(self._txt.get_text())
+        self._value[0] = color
+        if color:
+            self._button.set_rgba(color)
+        self.has_changed()
+        return True
+
+    def dump_value(self):
+        """Gets the color as a string.
+
+        Returns:
+            A color string like 'rgb(52,101,164)', or None.
+        """
+        if self._value is None or self._value[0] is None:
+            return
+        return self._value[0].to_string()
+
+    def update_display_value(self):
+        if self._value is None or self._value[0] is None:
+            super(PropertyColor, self).update_display_value()
+            return
+        self._set_display_text(self.formatter.format(self._txt.get_text()))
+
+    def _get_display_color(self):
+        if self._value is None:
+            return
+        return self._value[0]
+
+    def _on_color_set(self, wg, param=None):
+        text = self._button.get_rgba().to_string()
+        if text != self._txt.get_text():
+            self._txt.set_text(text)
+
+    def _on_txt_changed(self, wg):
+        self.on_change()
+
+    def _get_color_from_str(self, str_color):
+        if str_color is None:
+            return
+        color = Gdk.RGBA()
+        if color.parse(str_color):
+            return color
+
+
+class PropertyList(PropertyGridProperty):
+    def __init__(
+            self, name, list_values,
+            id=None, default=None,
+            description=None, force_value=False):
+        """A List property class.
+
+        See :py:class:`PropertyList <gpropertygrid.properties.PropertyList>`.
+        """
+        self._list_values = list_values
+
+        self._dropdown = Gtk.DropDown.new_from_strings(
+            [v[1] for v in list_values])
+        self._dropdown.connect("notify::selected", self._on_selected)
+
+        super(PropertyList, self).__init__(
+                name=name, value_widget=self._dropdown,
+                id=id, default=default, description=description,
+                force_value=force_value)
+
+    def init_value(self, force_value, default):
+        found = -1
+        if default:
+            if 'id' in default:
+                found = self._set_active(0, default['id'])
+            else:
+                found = self._set_active(1, default['string'])
+        self._value = None
+        if force_value:
+            if found > -1:
+                self._value = self._list_values[found]
+
+    def load_value(self, value):
+        """Selects an element of the list.
+
+        See :py:meth:`PropertyList.load_value
+        <gpropertygrid.properties.PropertyList.load_value>`.
+        """
+        if value is None:
+            found = -1
+            self._dropdown.set_selected(Gtk.INVALID_LIST_POSITION)
+        elif isinstance(value, dict):
+            if 'id' in value:
+                found = self._set_active(0, value['id'])
+            else:
+                found = self._set_active(1, value['string'])
+        else:
+            found = self._set_active(0, value)
+        if found > -1:
+            self._value = self._list_values[found]
+        else:
+            self._value = None
+
+    def dump_value(self):
+        """Gets the id of the selected element.
+
+        Returns:
+            The id of the selected element, or None.
+            If element id is None, a dictionary {'string': string}
+            is returned.
+        """
+        if self._value is None:
+            return
+        if self._value[0] is None:
+            return {'string': self._value[1]}
+        return self._value[0]
+
+    def on_change(self):
+        if not super(PropertyList, self).on_change():
+            return False
+        selected = self._dropdown.get_selected()
+        if selected == Gtk.INVALID_LIST_POSITION:
+            self._value = None
+        else:
+            self._value = self._list_values[selected]
+        self.has_changed()
+        return True
+
+    def update_display_value(self):
+        if self._value is None:
+            super(PropertyList, self).update_display_value()
+            return
+        self._set_display_text(
+            self.formatter.format(self._value[1]))
+
+    def _set_active(self, index, value):
+        for found_index, l in enumerate(self._list_values):
+            if l[index] == value:
+                self._dropdown.set_selected(found_index)
+                return found_index
+        self._dropdown.set_selected(Gtk.INVALID_LIST_POSITION)
+        return -1
+
+    def _on_selected(self, wg, param):
+        self.on_change()
+
+
+class PropertyComposite(CompositeBase, PropertyGridProperty):
+    def __init__(
+            self, name, children,
+            id=None, default=None,
+            description=None, force_value=False):
+        """A property made of other properties.
+
+        See :py:class:`PropertyComposite
+        <gpropertygrid.properties.PropertyComposite>`.
+        Children are shown as rows of the tree, they are created
+        the first time the property row is expanded.
+        """
+        self._init_children(children)
+        self._store = Gio.ListStore(item_type=PropertyGridProperty)
+
+        super(PropertyComposite, self).__init__(
+            name=name,
+            value_widget=None,
+            id=id,
+            default=default,
+            description=description,
+            force_value=force_value)
+
+    def set_expanded(self, expanded):
+        """Shows or hides the child properties.
+
+        Args:
+            expanded (boolean): If True, children are shown.
+                They are created the first time.
+        """
+        if expanded == self._expanded:
+            return
+        self._set_expanded(expanded)
+        row = self._group._grid._get_tree_row(self)
+        if row is not None and row.get_expanded() != expanded:
+            row.set_expanded(expanded)
+
+    def _set_expanded(self, expanded):
+        if expanded and self._children is None:
+            self._create_children()
+        self._expanded = expanded
+
+    def _create_children(self):
+        self._children = list(self._children_factory())
+        for position, child in enumerate(self._children):
+            child._parent = self
+            child._group = self._group
+            child._depth = self._depth + 1
+            child._position = position
+            child.set_value(self._get_child_value(child))
+        self._text = None
+        self._store.splice(0, 0, self._children)
+
+
+class PropertyGridGroup(GObject.Object):
+    def __init__(self, title):
+        """Manages a group of properties, shown as an expandable row.
+
+        See :py:class:`PropertyGridGroup
+        <gpropertygrid.propertygrid.PropertyGridGroup>`.
+        """
+        GObject.Object.__init__(self)
+        self._grid = None
+        self._title = title
+        self._position = 0
+        self._properties = []
+        self._store = Gio.ListStore(item_type=PropertyGridProperty)
+
+    @property
+    def grid(self):
+        """
+        :class:`PropertyGrid` object owner of the group. Read only.
+        """
+        return self._grid
+
+    @property
+    def properties(self):
+        """
+        List of property objects that belongs to group. Read only.
+        """
+        return self._properties
+
+    def get_title(self):
+        return self._title
+
+    def add_property(self, property_):
+        """Adds a property object to this group.
+
+        Args:
+            property_ (PropertyGridProperty): A Property object.
+        """
+        if not self._grid:
+            raise ValueError(
+                "Group must be added to PropertyGrid first.")
+        self._grid._add_property(self, property_)
+        property_._position = self._store.get_n_items()
+        self._store.append(property_)
+
+    def get_expanded(self):
+        row = self._grid._get_tree_row(self)
+        return row is not None and row.get_expanded()
+
+    def set_expanded(self, expanded):
+        row = self._grid._get_tree_row(self)
+        if row is not None:
+            row.set_expanded(expanded)
+
+    def _rows_changed(self):
+        self._grid._queue_filter()
+
+
+class _NameCell(Gtk.Box):
+    def __init__(self):
+        super(_NameCell, self).__init__()
+        self._label = Gtk.Label(xalign=0, hexpand=True)
+        self._label.set_single_line_mode(True)
+        self._label.set_ellipsize(Pango.EllipsizeMode.END)
+        self._label.add_css_class('cell')
+        self._expander = Gtk.TreeExpander()
+        self._expander.set_child(self._label)
+        self.append(self._expander)
+        self._row = None
+        self._handler = None
+
+    def bind(self, row, grid):
+        self._row = row
+        self._expander.set_list_row(row)
+        item = row.get_item()
+        if isinstance(item, PropertyGridGroup):
+            self._label.set_text(item._title)
+            self._label.add_css_class('group-header')
+        else:
+            self._label.set_text(item.name)
+            self._label.remove_css_class('group-header')
+            self._handler = row.connect(
+                "notify::expanded", grid._on_row_expanded)
+
+    def unbind(self):
+        if self._handler is not None:
+            self._row.disconnect(self._handler)
+            self._handler = None
+        self._expander.set_list_row(None)
+        self._row = None
+
+
+class _ValueCell(Gtk.Box):
+    def __init__(self):
+        super(_ValueCell, self).__init__()
+        self._swatch = Gtk.DrawingArea(content_width=16)
+        self._swatch.set_draw_func(self._draw_swatch)
+        self._label = Gtk.Label(xalign=0, hexpand=True)
+        self._label.set_single_line_mode(True)
+        self._label.set_ellipsize(Pango.EllipsizeMode.END)
+        self._label.add_css_class('cell')
+        self.append(self._swatch)
+        self.append(self._label)
+        self._item = None
+        self._bindings = []
+        self._handlers = []
+
+    def bind(self, item):
+        if isinstance(item, PropertyGridGroup):
+            self._label.set_text('')
+            self._swatch.set_visible(False)
+            return
+        self._item = item
+        flags = GObject.BindingFlags.SYNC_CREATE
+        self._bindings = [
+            item.bind_property('display-text', self._label, 'label', flags),
+            item.bind_property(
+                'tooltip', self._label, 'tooltip-text', flags),
+            item.bind_property('sensitive', self, 'sensitive', flags),
+        ]
+        self._handlers = [
+            item.connect("notify::editing", self._on_editing),
+            item.connect("notify::invalid", self._on_invalid),
+            item.connect("notify::display-text", self._on_display_text),
+        ]
+        item._bound += 1
+        self._on_editing(item, None)
+        self._on_invalid(item, None)
+        self._on_display_text(item, None)
+        if item._value_provider is not None and \
+                not item._value_provider.is_valid():
+            item._request_value()
+
+    def unbind(self):
+        item = self._item
+        if item is None:
+            return
+        for binding in self._bindings:
+            binding.unbind()
+        for handler in self._handlers:
+            item.disconnect(handler)
+        self._bindings = []
+        self._handlers = []
+        item._bound -= 1
+        self._show_editor(None)
+        self._item = None
+
+    def _on_editing(self, item, param):
+        self._show_editor(item._value_widget if item.editing else None)
+
+    def _show_editor(self, editor):
+        child = self._label.get_next_sibling()
+        if child is not None and child is not editor:
+            self.remove(child)
+        self._label.set_visible(editor is None)
+        if editor is None or child is editor:
+            return
+        parent = editor.get_parent()
+        if parent is not None:
+            parent.remove(editor)
+        self.append(editor)
+        editor.grab_focus()
+
+    def _on_invalid(self, item, param):
+        if item.invalid:
+            self._label.add_css_class('cell-invalid')
+        else:
+            self._label.remove_css_class('cell-invalid')
+
+    def _on_display_text(self, item, param):
+        self._swatch.set_visible(item._get_display_color() is not None)
+        self._swatch.queue_draw()
+
+    def _draw_swatch(self, area, cr, width, height):
+        color = None
+        if self._item is not None:
+            color = self._item._get_display_color()
+        if color is None:
+            return
+        Gdk.cairo_set_source_rgba(cr, color)
+        cr.rectangle(0, 0, width, height)
+        cr.fill()
+
+
+class PropertyGrid(PropertyGridBase, Gtk.Box):
+    __gsignals__ = {
+        'changed': (
+            GObject.SignalFlags.RUN_FIRST | GObject.SignalFlags.DETAILED,
+            None, (PropertyGridProperty,)),
+        'validated': (
+            GObject.SignalFlags.RUN_FIRST, None,
+            (PropertyGridProperty,)),
+        'values-changed': (
+            GObject.SignalFlags.RUN_FIRST, None,
+            (GObject.TYPE_PYOBJECT,))
+    }
+
+    _numeric_type = _PropertyNumeric
+
+    def __init__(
+            self, title, canvas=False, shared_editors=False,
+            uniform_rows=False):
+        """The main PropertyGrid widget class for GTK 4.
+
+        Its API and signals are the ones of :py:class:`PropertyGrid
+        <gpropertygrid.propertygrid.PropertyGrid>`.
+
+        Args:
+            title (string): The title of the property grid.
+
+            canvas (boolean): Optional. Ignored, rows are always
+                created only for the visible area.
+
+            shared_editors (boolean): Optional. Ignored, each GTK 4
+                property still creates its own value widget when
+                it is created.
+
+            uniform_rows (boolean): Optional. Ignored, rows are
+                measured by the list view.
+        """
+        Gtk.Box.__init__(
+            self,
+            orientation=Gtk.Orientation.VERTICAL,
+            spacing=1)
+        self._init_state()
+        self._expanded = False
+        self._editing = None
+        self._filter_queued = False
+        _load_css()
+
+        self._grid_header = Gtk.Label(xalign=0)
+        self._grid_header.add_css_class('property-grid-header')
+        self._grid_header.set_text(title)
+        click = Gtk.GestureClick()
+        click.connect("released", self._on_header_click)
+        self._grid_header.add_controller(click)
+        self.append(self._grid_header)
+
+        self._root = Gio.ListStore(item_type=PropertyGridGroup)
+        self._filter = Gtk.CustomFilter.new(self._filter_item)
+        self._tree = Gtk.TreeListModel.new(
+            self._root, False, False, self._create_child_model)
+        selection = Gtk.SingleSelection(
+            model=self._tree, autoselect=False, can_unselect=True)
+
+        self._view = Gtk.ColumnView(model=selection)
+        self._view.set_single_click_activate(True)
+        self._view.set_show_column_separators(True)
+        self._view.connect("activate", self._on_activate)
+        keys = Gtk.EventControllerKey()
+        keys.connect("key-pressed", self._on_key_pressed)
+        self._view.add_controller(keys)
+
+        column = Gtk.ColumnViewColumn(
+            title='Property',
+            factory=self._create_factory(_NameCell, self._bind_name))
+        column.set_resizable(True)
+        self._view.append_column(column)
+        column = Gtk.ColumnViewColumn(
+            title='Value',
+            factory=self._create_factory(_ValueCell, self._bind_value))
+        column.set_expand(True)
+        self._view.append_column(column)
+
+        self._sw = Gtk.ScrolledWindow(vexpand=True)
+        self._sw.set_child(self._view)
+        self.append(self._sw)
+
+        self._description = _PropertyDescription()
+        self.append(self._description)
+
+    def get_title(self):
+        """Gets the current title of the property grid.
+
+        Returns:
+            The current title string of property grid.
+        """
+        return self._grid_header.get_text()
+
+    def set_title(self, title):
+        """Sets the title for the property grid.
+
+        Args:
+            title (string): The title of the property grid.
+        """
+        self._grid_header.set_text(title)
+
+    def create_group(self, group_title):
+        """Create a new group of properties.
+
+        It Automatically adds the group created to the property grid.
+
+        Args:
+            group_title (string): The title of the group.
+
+        Returns:
+            A :class:`PropertyGridGroup` object.
+        """
+        group = PropertyGridGroup(group_title)
+        group._position = len(self._groups)
+        self._groups.append(group)
+        group._grid = self
+        self._root.append(group)
+        return group
+
+    def remove_all_groups(self):
+        """Removes all groups from property grid.
+        """
+        self._end_edit()
+        self._root.remove_all()
+        self._description.set_value('', '')
+        self._groups = []
+        self._clear_properties()
+
+    def set_expanded(self, expanded):
+        """Sets the expanded state of the property grid.
+
+        Args:
+            expanded (boolean): If True, grid expands to show
+                its properties.
+        """
+        for index in range(len(self._groups)):
+            self._tree.get_child_row(index).set_expanded(expanded)
+        self._expanded = expanded
+
+    def _on_header_click(self, gesture, n_press, x, y):
+        self.set_expanded(not self._expanded)
+
+    def _create_factory(self, cell_class, bind):
+        factory = Gtk.SignalListItemFactory()
+        factory.connect(
+            "setup", lambda f, item: item.set_child(cell_class()))
+        factory.connect("bind", bind)
+        factory.connect(
+            "unbind", lambda f, item: item.get_child().unbind())
+        return factory
+
+    def _bind_name(self, factory, list_item):
+        list_item.get_child().bind(list_item.get_item(), self)
+
+    def _bind_value(self, factory, list_item):
+        list_item.get_child().bind(list_item.get_item().get_item())
+
+    def _create_child_model(self, item):
+        # Called the first time the group row needs its children.
+        if isinstance(item, PropertyGridGroup):
+            self._group_expanded(item)
+        if isinstance(item, (PropertyGridGroup, PropertyComposite)):
+            return Gtk.FilterListModel.new(item._store, self._filter)
+        return None
+
+    def _filter_item(self, item):
+        return not item._hidden
+
+    def _queue_filter(self):
+        if self._filter_queued:
+            return
+        self._filter_queued = True
+        GLib.idle_add(self._update_filter)
+
+    def _update_filter(self):
+        self._filter_queued = False
+        self._filter.changed(Gtk.FilterChange.DIFFERENT)
+        if self._editing is not None and self._editing._hidden:
+            self._end_edit()
+        return False
+
+    def _get_tree_row(self, item):
+        """Gets the tree row of a group or property, or None if
+        the row is not shown because its parent is collapsed.
+        """
+        if isinstance(item, PropertyGridGroup):
+            return self._tree.get_child_row(item._position)
+        parent = item._parent if item._parent is not None else item._group
+        parent_row = self._get_tree_row(parent)
+        if parent_row is None:
+            return
+        children = parent_row.get_children()
+        if children is None:
+            return
+        # Hidden items are filtered out, but the order of the store
+        # is kept, so the item is searched by its store position.
+        lo, hi = 0, children.get_n_items()
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if children.get_item(mid)._position < item._position:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < children.get_n_items() and children.get_item(lo) is item:
+            return parent_row.get_child_row(lo)
+
+    def _on_row_expanded(self, row, param):
+        item = row.get_item()
+        if isinstance(item, PropertyComposite):
+            item._set_expanded(row.get_expanded())
+
+    def _on_activate(self, view, position):
+        row = self._tree.get_row(position)
+        item = row.get_item()
+        if isinstance(item, PropertyGridGroup):
+            self._end_edit()
+            row.set_expanded(not row.get_expanded())
+            return
+        self._description.set_value(item.name, item.description)
+        if isinstance(item, PropertyComposite):
+            self._end_edit()
+            row.set_expanded(not row.get_expanded())
+            return
+        self._begin_edit(item)
+
+    def _on_key_pressed(self, controller, keyval, keycode, state):
+        if keyval == Gdk.KEY_Escape and self._editing is not None:
+            self._end_edit()
+            return True
+        return False
+
+    def _begin_edit(self, property_):
+        if property_ is self._editing:
+            return
+        self._end_edit()
+        if property_._read_only or not property_.sensitive:
+            return
+        self._editing = property_
+        property_._has_focus = True
+        property_.editing = True
+
+    def _end_edit(self):
+        property_ = self._editing
+        if property_ is None:
+            return
+        self._editing = None
+        property_._has_focus = False
+        property_.editing = False
+
+
+class _PropertyDescription(Gtk.Frame):
+    def __init__(self):
+        super(_PropertyDescription, self).__init__()
+
+        self._name = Gtk.Label(xalign=0)
+        self._name.add_css_class('description-name')
+        self._description = Gtk.Label(xalign=0)
+
+        vbox = Gtk.Box(
+            orientation=Gtk.Orientation.VERTICAL, spacing=1)
+        vbox.append(self._name)
+        vbox.append(self._description)
+        self.set_child(vbox)
+
+    def set_value(self, name, description):
+        self._name.set_text(name)
+        self._description.set_text(description or '')
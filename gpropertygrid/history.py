@@ -0,0 +1,144 @@
+# This file is part of GPropertyGrid project.
+# The COPYRIGHT file at the top level of this repository
+# contains the full copyright notices and license terms.
+
+"""
+Undo and redo history of property changes.
+"""
+
+import time
+from collections import deque
+
+# Clock of merge windows, not affected by system time changes.
+_clock = getattr(time, 'monotonic', time.time)
+
+
+class Patch(tuple):
+    """Value of a change that only has the modified parts of
+    a property value, as a tuple of items applied in order.
+
+    When consecutive changes of a property are merged, their
+    patches are joined instead of keeping only the last one.
+    """
+
+
+class History(object):
+    def __init__(self, max_entries=100, max_bytes=1048576, merge_window=1.0):
+        """Bounded history of property changes.
+
+        Each entry is a tuple of changes (property id, old value,
+        new value). When a limit is exceeded, oldest entries
+        are discarded, but the newest entry is kept even if it is
+        larger than *max_bytes*.
+
+        Args:
+            max_entries (int): Optional. Maximum number of entries.
+                Default 100.
+
+            max_bytes (int): Optional. Approximated maximum size
+                in bytes of all entries. Default 1 MiB.
+
+            merge_window (float): Optional. Maximum time in seconds
+                between two edits of a property that are merged in
+                a single entry. Default 1.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.merge_window = merge_window
+        self._merge_time = None
+        self._undo = deque()
+        self._redo = []
+        self._bytes = 0
+        self._sealed = True
+
+    def can_undo(self):
+        return len(self._undo) > 0
+
+    def can_redo(self):
+        return len(self._redo) > 0
+
+    def clear(self):
+        self._undo.clear()
+        self._redo = []
+        self._bytes = 0
+        self._sealed = True
+
+    def record(self, changes, merge=False):
+        """Adds a new entry.
+
+        If *merge* is True, the entry has only one change, and the
+        last entry was also an edit of only the same property made
+        within the merge window, both are merged.
+
+        Args:
+            changes (list): List of tuples (id, old value, new value).
+
+            merge (boolean): Optional. True for edits that can be
+                merged, like keystrokes. Default False.
+        """
+        changes = tuple(changes)
+        if not changes:
+            return
+        self._redo = []
+        now = _clock()
+        if merge and len(changes) == 1 and not self._sealed and \
+                self._undo and now - self._merge_time <= self.merge_window:
+            last, size = self._undo[-1]
+            if len(last) == 1 and last[0][0] == changes[0][0]:
+                self._pop()
+                old, new = last[0][1], changes[0][2]
+                if isinstance(old, Patch) and isinstance(new, Patch):
+                    old = Patch(changes[0][1] + old)
+                    new = Patch(last[0][2] + new)
+                changes = ((last[0][0], old, new),)
+                if changes[0][1] == changes[0][2]:
+                    self._sealed = True
+                    return
+        self._push(changes)
+        self._sealed = not merge or len(changes) > 1
+        self._merge_time = now
+        self._shrink()
+
+    def undo(self):
+        """Moves last entry to the redo list.
+
+        Returns:
+            The entry, or None if there is nothing to undo.
+        """
+        if not self._undo:
+            return
+        changes = self._pop()
+        self._redo.append(changes)
+        self._sealed = True
+        return changes
+
+    def redo(self):
+        """Moves last undone entry back to the undo list.
+
+        Returns:
+            The entry, or None if there is nothing to redo.
+        """
+        if not self._redo:
+            return
+        changes = self._redo.pop()
+        self._push(changes)
+        self._sealed = True
+        self._shrink()
+        return changes
+
+    def _push(self, changes):
+        size = len(repr(changes))
+        self._undo.append((changes, size))
+        self._bytes += size
+
+    def _pop(self):
+        changes, size = self._undo.pop()
+        self._bytes -= size
+        return changes
+
+    def _shrink(self):
+        while self._undo and (
+                len(self._undo) > self.max_entries or
+                (self._bytes > self.max_bytes and len(self._undo) > 1)):
+            changes, size = self._undo.popleft()
+            self._bytes -= size
@@ -0,0 +1,82 @@
+# This file is part of GPropertyGrid project.
+# The COPYRIGHT file at the top level of this repository
+# contains the full copyright notices and license terms.
+
+"""
+Range checks of many numeric values at once.
+
+If NumPy is installed, checks are done in a single vectorized
+operation, it is imported the first time a check is made.
+Values NumPy can not compare exactly, like integers above 2**53
+mixed with floats, are checked one by one.
+"""
+
+_numpy = None
+
+# Largest integer held exactly by a float.
+_MAX_EXACT = 2 ** 53
+
+
+def _get_numpy():
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _numpy = numpy
+    return _numpy
+
+
+def _get_arrays(numpy, sequences):
+    """Converts sequences to NumPy arrays, or returns None
+    if they can not be compared without losing precision.
+    """
+    arrays = [numpy.asarray(s) for s in sequences]
+    kinds = [a.dtype.kind for a in arrays]
+    if any(k not in 'iuf' for k in kinds):
+        # Integers that do not fit in 64 bits are objects.
+        return
+    if numpy.result_type(*arrays).kind == 'f':
+        for a, kind in zip(arrays, kinds):
+            if kind in 'iu' and (
+                    (a > _MAX_EXACT) | (a < -_MAX_EXACT)).any():
+                return
+    return arrays
+
+
+def clamp(values, lower, upper):
+    """Limits values to their ranges.
+
+    Args:
+        values: A NumPy array, array.array or sequence of numbers.
+
+        lower: Sequence of lower limits, one for each value.
+
+        upper: Sequence of upper limits, one for each value.
+
+    Returns:
+        List of clamped values.
+    """
+    numpy = _get_numpy()
+    arrays = numpy and _get_arrays(numpy, (values, lower, upper))
+    if arrays:
+        return numpy.clip(*arrays).tolist()
+    return [
+        min(max(v, lo), up) for v, lo, up in zip(values, lower, upper)]
+
+
+def in_range(values, lower, upper):
+    """Checks if values are inside their ranges.
+
+    See :func:`clamp` for parameters.
+
+    Returns:
+        List of booleans, True if value is inside its range.
+    """
+    numpy = _get_numpy()
+    arrays = numpy and _get_arrays(numpy, (values, lower, upper))
+    if arrays:
+        values, lower, upper = arrays
+        return ((values >= lower) & (values <= upper)).tolist()
+    return [lo <= v <= up for v, lo, up in zip(values, lower, upper)]
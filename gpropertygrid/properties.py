@@ -2,10 +2,20 @@
 # The COPYRIGHT file at the top level of this repository
 # contains the full copyright notices and license terms.
 
-from gi.repository import Gtk, Gdk, Pango
+from weakref import WeakKeyDictionary
+from gi.repository import Gtk, Gdk, GLib, Pango
+from . formatters import FirstLineFormatter
+from . base import PropertyBase, CompositeBase
 
+if Gtk.get_major_version() >= 4:
+    # Modules that derive these classes, like gpropertygrid.arrays,
+    # are not available on Gtk 4 either.
+    raise ImportError(
+        "gpropertygrid.properties requires Gtk 3, "
+        "use gpropertygrid.gtk4 with Gtk 4.0")
 
-class PropertyGridProperty(Gtk.Paned):
+
+class PropertyGridProperty(PropertyBase, Gtk.Paned):
     def __init__(
             self, name,
             value_widget,
@@ -19,7 +29,9 @@ class PropertyGridProperty(Gtk.Paned):
             name (string): The name of the property.
 
             value_widget (Gtk.Widget): The widget used for manages
-                the property value.
+                the property value. If None, it is created by
+                :meth:`create_editor` when property is edited
+                for first time.
 
             id (string): Optional. The id of the property.
                 Must be uniq per property.
@@ -43,81 +55,68 @@ class PropertyGridProperty(Gtk.Paned):
         super(PropertyGridProperty, self).__init__(
             orientation=Gtk.Orientation.HORIZONTAL)
 
-        self.name = name
-        self.id = id
-        self.description = description
-
-        self._group = None
-        self._value = None
+        self._init_state(name, id, description)
         self._curr_width = -1
         self._curr_position = -1
-        self._has_focus = False
-        self._read_only = False
+        self._value_widget = value_widget
+        self._editor = None
+        self._editor_handlers = []
+        self._tooltip = None
+        # Created only when property is shown with widgets,
+        # a canvas draws the row instead.
+        self._name_widget = None
+        self._display_widget = None
 
         self.init_value(force_value, default)
-
-        self._name_widget = self._get_display_widget(0)
-        self._name_widget._main_label.set_text(name)
-        self._display_widget = self._get_display_widget(1)
+        self._reset_change()
         self.update_display_value()
 
-        self.pack1(self._name_widget, True, True)
-        self.pack2(self._display_widget, True, True)
         self.connect("draw", self._on_draw)
+        self.connect("map", self._on_map)
 
-        self._value_widget = value_widget
-
-    @property
-    def has_focus(self):
-        return self._has_focus
-
-    @property
-    def value(self):
-        """
-        List that contents current value of property.
-        """
-        return self._value
-
-    def init_value(self, force_value, default):
-        """Sets the initial state of property value at creation time.
-
-        This method is called automatically when property is created,
-        It is a virtual method, so each property must override it.
+    def create_editor(self):
+        """Creates the widget that edits the property value.
 
-        It verifies the default value and if it has to be forced to
-        get a value, and set the value_widget.
+        Properties that pass a value_widget to the constructor
+        do not need to implement it. Otherwise the editor is created
+        only when the property is edited, and it can be shared
+        by all properties of the same class, see *shared_editors*
+        parameter of :py:class:`PropertyGrid
+        <gpropertygrid.propertygrid.PropertyGrid>`. So editor must
+        not keep property state, it is set by :meth:`load_editor`.
 
-        Args:
-            force_value (boolean): If True, default value is set.
-
-            default: Default value to set if force_value is True.
+        Returns:
+            A Gtk.Widget.
         """
-        error = "init_value() function must be defined for property '{0}'"
+        error = "create_editor() function must be defined for property '{0}'"
         raise NotImplementedError(error.format(
                 self.__class__.__name__))
 
-    def update_display_value(self):
-        """
-        Update current display value of the property.
+    def load_editor(self, editor):
+        """Loads the property value, and any other property
+        setting like choices or ranges, into an editor created
+        by :meth:`create_editor`.
 
-        This method should not be called unless a
-        special representation were needed, in this case
-        function must be overriden.
+        Args:
+            editor (Gtk.Widget): The editor.
         """
-        if self._value is None:
-            text = '[No value]'
-        else:
-            text = str(self._value[0])
-        self._display_widget._main_label.set_text(text)
+        pass
 
-    def has_changed(self):
-        """Tells the property grid that the property Value has changed.
+    def connect_editor(self, editor):
+        """Connects the editor signals that change the property value.
 
-        Every property object must call this function
-        each time its value changes.
+        Handlers must be connected with :meth:`_connect_editor`,
+        so they are disconnected when the editor is bound to
+        another property.
+
+        Args:
+            editor (Gtk.Widget): The editor.
         """
-        self._group._grid._property_changed(self)
-        self.update_display_value()
+        pass
+
+    def set_mixed(self, mixed):
+        super(PropertyGridProperty, self).set_mixed(mixed)
+        self._load_editor()
 
     def set_read_only(self, readonly):
         """Sets Read only state of the property.
@@ -126,21 +125,8 @@ class PropertyGridProperty(Gtk.Paned):
             readonly (boolean): Value that sets the read only state.
         """
         self._read_only = readonly
-        self._display_widget._main_label.set_selectable(readonly)
-
-    def on_change(self, data=None):
-        return self._has_focus
-
-    def _on_display_notify(self, box, event_type, data):
-        """Event called when mouse in/out over display widgets
-        """
-        self._name_widget.change_color(data["type"])
-        self._display_widget.change_color(data["type"])
-
-    def _on_display_click(self, box, event_type, data):
-        """Event called when mouse click on display widgets
-        """
-        self._show_hide_value_widget()
+        if self._display_widget is not None:
+            self._display_widget._main_label.set_selectable(readonly)
 
     def _on_draw(self, wg, data):
         if self.get_allocated_width() != self._curr_width:
@@ -148,9 +134,62 @@ class PropertyGridProperty(Gtk.Paned):
             self._set_curr_position(position)
             self._curr_width = self.get_allocated_width()
         else:
-            for p in self._group.properties:
+            for p in self._group._get_rows():
                 p._set_curr_position(self.get_position())
 
+    def _on_map(self, wg):
+        if self._value_provider is not None and \
+                not self._value_provider.is_valid():
+            self._request_value()
+
+    def _is_shown(self):
+        return self.get_mapped()
+
+    def _show_display_text(self, text):
+        if self._display_widget is not None:
+            self._display_widget._main_label.set_text(text)
+
+    def _set_tooltip(self, text):
+        self._tooltip = text
+        if self._display_widget is not None:
+            self._display_widget._main_label.set_tooltip_text(text)
+
+    def _set_valid(self, valid, message):
+        self._valid = valid
+        self._set_tooltip(message)
+        if self._display_widget is None:
+            return
+        ctx = self._display_widget._main_label.get_style_context()
+        if valid is False:
+            ctx.add_class('cell_invalid')
+        else:
+            ctx.remove_class('cell_invalid')
+
+    def _get_row_name(self):
+        """Text shown in the name column of the property row.
+        """
+        return self.name
+
+    def _create_row_widgets(self):
+        """Creates the name and value labels of the row, when
+        property is packed in a group shown with widgets.
+        """
+        if self._name_widget is not None:
+            return
+        self._name_widget = self._get_display_widget(0)
+        label = self._name_widget._main_label
+        label.set_text(self._get_row_name())
+        label.set_margin_start(12 * self._depth)
+
+        self._display_widget = self._get_display_widget(1)
+        label = self._display_widget._main_label
+        label.set_text(self._display_text or '')
+        label.set_selectable(self._read_only)
+        self._set_valid(self._valid, self._tooltip)
+
+        self.pack1(self._name_widget, True, True)
+        self.pack2(self._display_widget, True, True)
+
     def _set_curr_position(self, position):
         if self._curr_position != position:
             self.set_position(position)
@@ -161,63 +200,91 @@ class PropertyGridProperty(Gtk.Paned):
             # This way we force on_leave() on all other properties.
             self._on_enter()
             return
-        curr_wg = self._display_widget.get_children()[0]
         if self._has_focus:
             new_wg = self._display_widget.box
         else:
-            new_wg = self._value_widget
+            new_wg = self._get_value_widget()
 
+        curr_wg = self._display_widget.get_children()[0]
         self._display_widget.remove(curr_wg)
         self._display_widget.pack_start(new_wg, True, True, 0)
         self._display_widget.show_all()
         if not self._has_focus:
             new_wg.grab_focus()
             self._on_enter()
+        else:
+            self._release_value_widget()
         self._has_focus = not self._has_focus
 
+    def _get_value_widget(self):
+        if self._value_widget is not None:
+            return self._value_widget
+        grid = self._group._grid
+        if grid._shared_editors:
+            return grid._bind_shared_editor(self)
+        self._value_widget = self.create_editor()
+        self._bind_editor(self._value_widget)
+        return self._value_widget
+
+    def _release_value_widget(self):
+        if self._value_widget is None and self._editor is not None:
+            self._group._grid._release_shared_editor(self)
+
+    def _bind_editor(self, editor):
+        self._editor = editor
+        self._load_editor()
+        self.connect_editor(editor)
+
+    def _unbind_editor(self):
+        for widget, handler in self._editor_handlers:
+            widget.disconnect(handler)
+        self._editor_handlers = []
+        self._editor = None
+
+    def _connect_editor(self, widget, signal, handler):
+        self._editor_handlers.append(
+            (widget, widget.connect(signal, handler)))
+
+    def _load_editor(self):
+        if self._editor is None:
+            return
+        updating = self._updating
+        self._updating = True
+        try:
+            self.load_editor(self._editor)
+        finally:
+            self._updating = updating
+
     def _on_enter(self, data=None):
-        self._group.grid._on_enter_widget(self.id)
+        self._group.grid._on_enter_widget(self)
+
+    def _set_hidden(self, hidden):
+        self._hidden = hidden
+        if self._group._grid._canvas is not None:
+            return
+        self.set_no_show_all(hidden)
+        if hidden:
+            self.hide()
+        else:
+            self.show_all()
 
     def _get_display_widget(self, index):
-        return _DisplayWidget(
-            index,
-            self._on_display_notify,
-            self._on_display_click)
+        return _DisplayWidget(index)
 
 
 class _DisplayWidget(Gtk.Box):
-    def __init__(self, index, notify_handler, click_handler):
+    def __init__(self, index):
         super(_DisplayWidget, self).__init__()
 
         self._main_label = Gtk.Label(xalign=0)
         self._main_label.set_single_line_mode(True)
         self._main_label.set_ellipsize(Pango.EllipsizeMode.END)
-        self._event_box = Gtk.EventBox()
-
         self._main_label.set_name('cell')
-        self._event_box.add(self._main_label)
-
-        self._event_box.connect(
-            "enter-notify-event", notify_handler,
-            {"index": index, "type": "in"})
-        self._event_box.connect(
-            "leave-notify-event", notify_handler,
-            {"index": index, "type": "out"})
-        self._event_box.connect(
-            "button-press-event", click_handler,
-            {"index": index})
 
         self.box = Gtk.Box()
-        self.box.pack_start(self._event_box, True, True, 0)
+        self.box.pack_start(self._main_label, True, True, 0)
         self.pack_start(self.box, True, True, 0)
 
-    def change_color(self, data_type):
-        ctx = self._main_label.get_style_context()
-        if data_type == 'in':
-            ctx.add_class('cell_in')
-        else:
-            ctx.remove_class('cell_in')
-
 
 class PropertyString(PropertyGridProperty):
     def __init__(
@@ -235,30 +302,49 @@ class PropertyString(PropertyGridProperty):
         Note:
             *default* parameter must be a valid string object.
         """
-        self._txt = Gtk.Entry()
-        self._txt.connect("changed", self._on_txt_changed)
-
         super(PropertyString, self).__init__(
             name=name,
-            value_widget=self._txt,
+            value_widget=None,
             id=id,
             default=default,
             description=description,
             force_value=force_value)
 
     def init_value(self, force_value, default):
+        # Shown by the editor while property has no value.
+        self._default = default
         if default is not None and force_value:
             self._value = [default, ]
-        if default is None:
-            default = ''
-        self._txt.set_text(default)
+
+    def load_value(self, value):
+        if value is None:
+            self._value = None
+        else:
+            self._value = [value, ]
+        self._load_editor()
+
+    def create_editor(self):
+        return Gtk.Entry()
+
+    def load_editor(self, editor):
+        if self._value is not None:
+            text = self._value[0]
+        elif not self._mixed:
+            text = self._default
+        else:
+            text = None
+        editor.set_text('' if text is None else text)
+        editor.set_placeholder_text('[Mixed]' if self._mixed else None)
+
+    def connect_editor(self, editor):
+        self._connect_editor(editor, "changed", self._on_txt_changed)
 
     def on_change(self):
         if not super(PropertyString, self).on_change():
             return False
         if self._value is None:
             self._value = [None, ]
-        self._value[0] = self._txt.get_text()
+        self._value[0] = self._editor.get_text()
         self.has_changed()
         return True
 
@@ -268,7 +354,10 @@ class PropertyString(PropertyGridProperty):
 
 class PropertyStringMultiline(PropertyGridProperty):
     class _DialogMultiline(Gtk.Dialog):
-        def __init__(self, parent, text):
+        # Size of text inserted in the buffer on each main loop iteration
+        _CHUNK_SIZE = 65536
+
+        def __init__(self, parent):
             super(PropertyStringMultiline._DialogMultiline, self).__init__(
                 'Multiline string', parent, 0,
                 (
@@ -279,11 +368,12 @@ class PropertyStringMultiline(PropertyGridProperty):
 
             self.set_modal(True)
             self.set_default_size(300, 300)
+            self._text = None
+            self._offset = 0
+            self._source = None
 
             text_view = Gtk.TextView()
             self._buffer = text_view.get_buffer()
-            if text is not None:
-                self._buffer.set_text(text)
 
             sw = Gtk.ScrolledWindow()
             sw.set_shadow_type(Gtk.ShadowType.IN)
@@ -291,7 +381,26 @@ class PropertyStringMultiline(PropertyGridProperty):
 
             box = self.get_content_area()
             box.pack_start(sw, True, True, 0)
-            self.show_all()
+            box.show_all()
+
+        def load(self, text):
+            """Loads text into the buffer.
+
+            Large texts are inserted in chunks, so the dialog is
+            responsive while loading, OK button is disabled
+            until text is fully loaded.
+            """
+            self._stop_loading()
+            self._buffer.set_text('')
+            if text is None:
+                return
+            if len(text) <= self._CHUNK_SIZE:
+                self._buffer.set_text(text)
+                return
+            self._text = text
+            self._offset = 0
+            self.set_response_sensitive(Gtk.ResponseType.OK, False)
+            self._source = GLib.idle_add(self._load_chunk)
 
         def get_text(self):
             return self._buffer.get_text(
@@ -299,6 +408,34 @@ class PropertyStringMultiline(PropertyGridProperty):
                 self._buffer.get_end_iter(),
                 True)
 
+        def unload(self):
+            self._stop_loading()
+            self.hide()
+            self._buffer.set_text('')
+
+        def _load_chunk(self):
+            end = self._offset + self._CHUNK_SIZE
+            self._buffer.insert(
+                self._buffer.get_end_iter(), self._text[self._offset:end])
+            self._offset = end
+            if self._offset < len(self._text):
+                return True
+            self._source = None
+            self._stop_loading()
+            return False
+
+        def _stop_loading(self):
+            if self._source is not None:
+                GLib.source_remove(self._source)
+                self._source = None
+            self._text = None
+            self.set_response_sensitive(Gtk.ResponseType.OK, True)
+
+    # One dialog per parent window, reused by all properties.
+    _dialogs = WeakKeyDictionary()
+
+    formatter = FirstLineFormatter()
+
     def __init__(
             self,
             name,
@@ -310,6 +447,7 @@ class PropertyStringMultiline(PropertyGridProperty):
         """A property that manages multiline string.
 
         Value is a string or None.
+        Only the beginning of the first line is displayed.
 
         See :class:`PropertyGridProperty` for parameters.
 
@@ -320,34 +458,46 @@ class PropertyStringMultiline(PropertyGridProperty):
             *default* parameter must be a valid string object.
         """
         self._window = parent_window
-
-        hbox = Gtk.Box(
-            orientation=Gtk.Orientation.HORIZONTAL)
-
-        self._label = Gtk.Label(xalign=0)
-        self._label.set_single_line_mode(True)
-        self._label.set_ellipsize(Pango.EllipsizeMode.END)
-        self._button = Gtk.Button.new_with_label('...')
-        self._button.connect("clicked", self._on_click_button)
-
-        hbox.pack_start(self._label, True, True, 0)
-        hbox.pack_start(self._button, True, True, 0)
-
         self._default = default
 
         super(PropertyStringMultiline, self).__init__(
             name=name,
-            value_widget=hbox,
+            value_widget=None,
             id=id,
             default=default,
             description=description,
             force_value=force_value)
 
     def init_value(self, force_value, default):
-        if default is not None:
-            self._label.set_text(default)
-            if force_value:
-                self._value = [default, ]
+        if default is not None and force_value:
+            self._value = [default, ]
+
+    def load_value(self, value):
+        if value is None:
+            self._value = None
+        else:
+            self._value = [value, ]
+        self._load_editor()
+
+    def create_editor(self):
+        hbox = Gtk.Box(
+            orientation=Gtk.Orientation.HORIZONTAL)
+        hbox.label = Gtk.Label(xalign=0)
+        hbox.label.set_single_line_mode(True)
+        hbox.label.set_ellipsize(Pango.EllipsizeMode.END)
+        hbox.button = Gtk.Button.new_with_label('...')
+        hbox.pack_start(hbox.label, True, True, 0)
+        hbox.pack_start(hbox.button, True, True, 0)
+        return hbox
+
+    def load_editor(self, editor):
+        txt = self._get_text()
+        editor.label.set_text(
+            '' if txt is None else self.formatter.format(txt))
+
+    def connect_editor(self, editor):
+        self._connect_editor(
+            editor.button, "clicked", self._on_click_button)
 
     def on_change(self, txt):
         if not super(PropertyStringMultiline, self).on_change():
@@ -355,22 +505,135 @@ class PropertyStringMultiline(PropertyGridProperty):
         if self._value is None:
             self._value = [None, ]
         self._value[0] = txt
-        self._label.set_text(txt)
+        self._load_editor()
         self.has_changed()
         return True
 
-    def _on_click_button(self, btn):
-        txt = None
+    def _get_text(self):
         if self._value is not None:
-            txt = self._value[0]
-        elif self._default is not None:
-            txt = self._default
-        dialog = PropertyStringMultiline._DialogMultiline(
-            self._window, txt)
+            return self._value[0]
+        return self._default
+
+    def _on_click_button(self, btn):
+        key = self if self._window is None else self._window
+        dialog = PropertyStringMultiline._dialogs.get(key)
+        if dialog is None:
+            dialog = PropertyStringMultiline._DialogMultiline(self._window)
+            PropertyStringMultiline._dialogs[key] = dialog
+        dialog.load(self._get_text())
         response = dialog.run()
         if response == Gtk.ResponseType.OK:
             self.on_change(dialog.get_text())
-        dialog.destroy()
+        dialog.unload()
+
+
+class PropertyComposite(CompositeBase, PropertyGridProperty):
+    def __init__(
+            self, name, children,
+            id=None, default=None,
+            description=None, force_value=False):
+        """A property made of other properties.
+
+        Value is a dictionary of child property id and its value,
+        or None. Children are created the first time the property
+        is expanded, clicking its row. Each change of a child changes
+        the composite value and emits a single *changed* signal
+        for the composite property.
+
+        See :class:`PropertyGridProperty` for parameters.
+
+        Args:
+            children (callable): Function that returns the list of
+                child property objects. Child ids are the keys of
+                the composite value.
+
+        Note:
+            *default* parameter must be a dictionary of child property
+            id and value.
+            Ex: {'x': '0', 'y': '0'}
+        """
+        self._init_children(children)
+
+        super(PropertyComposite, self).__init__(
+            name=name,
+            value_widget=None,
+            id=id,
+            default=default,
+            description=description,
+            force_value=force_value)
+        self._update_name()
+
+    def set_expanded(self, expanded):
+        """Shows or hides the child properties.
+
+        Args:
+            expanded (boolean): If True, children are shown.
+                They are created the first time.
+        """
+        if expanded == self._expanded:
+            return
+        if expanded and self._children is None:
+            self._create_children()
+        self._expanded = expanded
+        self._update_name()
+        self._group._rows_changed()
+        if self._group._grid._canvas is None:
+            self._set_children_visible(expanded and not self._hidden)
+
+    def _create_children(self):
+        self._children = list(self._children_factory())
+        grid = self._group._grid
+        for child in self._children:
+            child._parent = self
+            child._group = self._group
+            child._depth = self._depth + 1
+            child.set_value(self._get_child_value(child))
+            if grid._canvas is None:
+                child._create_row_widgets()
+                self._group._row.pack_start(child, False, False, 0)
+                child.set_no_show_all(True)
+        self._text = None
+        if grid._canvas is None:
+            self._place_children()
+
+    def _place_children(self):
+        box = self._group._row
+        position = box.child_get_property(self, 'position')
+        for child in self._children:
+            position += 1
+            box.reorder_child(child, position)
+            if isinstance(child, PropertyComposite) and \
+                    child._children is not None:
+                child._place_children()
+
+    def _set_children_visible(self, visible):
+        for child in self._children:
+            child.set_no_show_all(not visible)
+            if visible:
+                child.show_all()
+            else:
+                child.hide()
+            if isinstance(child, PropertyComposite) and \
+                    child._children is not None:
+                child._set_children_visible(visible and child._expanded)
+
+    def _get_row_name(self):
+        return '{0} {1}'.format(
+            u'▾' if self._expanded else u'▸', self.name)
+
+    def _update_name(self):
+        if self._name_widget is not None:
+            self._name_widget._main_label.set_text(self._get_row_name())
+
+    def _show_hide_value_widget(self):
+        self._on_enter()
+        self.set_expanded(not self._expanded)
+
+    def _set_hidden(self, hidden):
+        super(PropertyComposite, self)._set_hidden(hidden)
+        if self._children is not None and \
+                self._group._grid._canvas is None:
+            self._set_children_visible(self._expanded and not hidden)
 
 
 class PropertyBool(PropertyGridProperty):
@@ -387,26 +650,45 @@ class PropertyBool(PropertyGridProperty):
         Note:
             *default* parameter must be a boolean value, True or False
         """
-        self._check = Gtk.CheckButton()
-        self._check.connect("toggled", self._on_toggled)
-
         super(PropertyBool, self).__init__(
-                name=name, value_widget=self._check,
+                name=name, value_widget=None,
                 id=id, default=default, description=description,
                 force_value=force_value)
 
     def init_value(self, force_value, default):
-        if default is True:
-            self._check.set_active(True)
-            if force_value:
-                self._value = [default, ]
+        # Shown by the editor while property has no value.
+        self._default = default is True
+        if default is not None and force_value:
+            self._value = [bool(default), ]
+
+    def load_value(self, value):
+        if value is None:
+            self._value = None
+        else:
+            self._value = [bool(value), ]
+        self._load_editor()
+
+    def create_editor(self):
+        return Gtk.CheckButton()
+
+    def load_editor(self, editor):
+        if self._value is not None:
+            active = bool(self._value[0])
+        else:
+            active = self._default and not self._mixed
+        editor.set_active(active)
+        editor.set_inconsistent(self._mixed)
+
+    def connect_editor(self, editor):
+        self._connect_editor(editor, "toggled", self._on_toggled)
 
     def on_change(self):
         if not super(PropertyBool, self).on_change():
             return False
         if self._value is None:
             self._value = [None, ]
-        self._value[0] = self._check.get_active()
+        self._value[0] = self._editor.get_active()
+        self._editor.set_inconsistent(False)
         self.has_changed()
         return True
 
@@ -414,6 +696,154 @@ class PropertyBool(PropertyGridProperty):
         self.on_change()
 
 
+class _PropertyNumeric(PropertyGridProperty):
+    def __init__(
+            self, name, id, default, description, force_value,
+            lower, upper, step, digits):
+        self._lower = lower
+        self._upper = upper
+        self._step = step
+        self._digits = digits
+
+        super(_PropertyNumeric, self).__init__(
+                name=name, value_widget=None,
+                id=id, default=default, description=description,
+                force_value=force_value)
+
+    @property
+    def lower(self):
+        """
+        Minimum value allowed. Read only.
+        """
+        return self._lower
+
+    @property
+    def upper(self):
+        """
+        Maximum value allowed. Read only.
+        """
+        return self._upper
+
+    def init_value(self, force_value, default):
+        # Shown by the editor while property has no value.
+        self._default = None
+        if default is not None:
+            self._default = self._coerce(default)
+            if force_value:
+                self._value = [self._default, ]
+
+    def load_value(self, value):
+        if value is None:
+            self._value = None
+        else:
+            self._value = [self._coerce(value), ]
+        self._load_editor()
+
+    def create_editor(self):
+        spin = Gtk.SpinButton()
+        spin.set_numeric(True)
+        return spin
+
+    def load_editor(self, editor):
+        editor.set_digits(self._digits)
+        editor.set_range(self._lower, self._upper)
+        editor.set_increments(self._step, self._step * 10)
+        if self._value is not None:
+            value = self._value[0]
+        elif self._default is not None and not self._mixed:
+            value = self._default
+        else:
+            value = 0
+        editor.set_value(value)
+
+    def connect_editor(self, editor):
+        self._connect_editor(
+            editor, "value-changed", self._on_value_changed)
+
+    def on_change(self):
+        if not super(_PropertyNumeric, self).on_change():
+            return False
+        self._value = [self._coerce(self._editor.get_value()), ]
+        self.has_changed()
+        return True
+
+    def _coerce(self, value):
+        """Clamps value to the range of the property, and converts
+        it to the property value type.
+        """
+        raise NotImplementedError()
+
+    def _on_value_changed(self, wg):
+        self.on_change()
+
+
+class PropertyInt(_PropertyNumeric):
+    def __init__(
+            self, name, id=None,
+            default=None, description=None,
+            force_value=False, lower=-2147483648,
+            upper=2147483647, step=1):
+        """An integer property class.
+
+        Value is an integer or None. Values outside the range
+        are clamped to it.
+
+        See :class:`PropertyGridProperty` for parameters.
+
+        Args:
+            lower (int): Optional. Minimum value allowed.
+
+            upper (int): Optional. Maximum value allowed.
+
+            step (int): Optional. Increment of the spin button.
+                Default 1.
+
+        Note:
+            *default* parameter must be an integer.
+        """
+        super(PropertyInt, self).__init__(
+            name, id, default, description, force_value,
+            lower, upper, step, 0)
+
+    def _coerce(self, value):
+        return int(round(min(max(value, self._lower), self._upper)))
+
+
+class PropertyFloat(_PropertyNumeric):
+    def __init__(
+            self, name, id=None,
+            default=None, description=None,
+            force_value=False, lower=-1e15,
+            upper=1e15, step=0.1, digits=2):
+        """A float property class.
+
+        Value is a float or None. Values outside the range
+        are clamped to it, and rounded to *digits* decimals.
+
+        See :class:`PropertyGridProperty` for parameters.
+
+        Args:
+            lower (float): Optional. Minimum value allowed.
+
+            upper (float): Optional. Maximum value allowed.
+
+            step (float): Optional. Increment of the spin button.
+                Default 0.1.
+
+            digits (int): Optional. Number of decimals. Default 2.
+
+        Note:
+            *default* parameter must be a number.
+        """
+        super(PropertyFloat, self).__init__(
+            name, id, default, description, force_value,
+            lower, upper, step, digits)
+
+    def _coerce(self, value):
+        value = min(max(float(value), self._lower), self._upper)
+        return round(value, self._digits)
+
+
 class PropertyColor(PropertyGridProperty):
     def __init__(
             self, name, id=None,
@@ -430,19 +860,25 @@ class PropertyColor(PropertyGridProperty):
             used to create the Gdk.RGBA object.
             Ex: red, black, #000000, rgb(52,101,164)
         """
-        hbox = Gtk.Box(
-            orientation=Gtk.Orientation.HORIZONTAL)
-
-        self._txt = Gtk.Entry()
-        self._txt.connect("changed", self._on_txt_changed)
+        # Text of the color as typed by the user, or as loaded.
+        self._color_text = ''
+        # Swatch of the row widgets, see _create_row_widgets().
+        self._color_label = None
+        self._style_provider = None
+        self._css_color = None
 
-        self._buttom = Gtk.ColorButton()
-        self._buttom.set_use_alpha(True)
-        self._buttom.connect("color_set", self._on_toggled)
-
-        hbox.pack_start(self._buttom, True, True, 0)
-        hbox.pack_start(self._txt, True, True, 0)
+        super(PropertyColor, self).__init__(
+            name=name,
+            value_widget=None,
+            id=id,
+            default=default,
+            description=description,
+            force_value=force_value)
 
+    def _create_row_widgets(self):
+        if self._name_widget is not None:
+            return
+        super(PropertyColor, self)._create_row_widgets()
         self._color_label = Gtk.Label(xalign=0)
         self._color_label.set_name('cell')
         self._style_provider = Gtk.CssProvider()
@@ -450,59 +886,114 @@ class PropertyColor(PropertyGridProperty):
         ctx.add_provider(
             self._style_provider,
             Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
-
-        super(PropertyColor, self).__init__(
-            name=name,
-            value_widget=hbox,
-            id=id,
-            default=default,
-            description=description,
-            force_value=force_value)
-
         self._display_widget.box.pack_start(self._color_label, True, True, 0)
         self._display_widget.box.reorder_child(self._color_label, 0)
         self._display_widget.box.connect("draw", self._on_draw_color_display)
+        self._update_color_label()
 
     def init_value(self, force_value, default):
         color = self._get_color_from_str(default)
+        # Shown by the editor while property has no value.
+        self._default = default if color else None
+        if color and force_value:
+            self._value = [color, ]
+            self._color_text = default
+
+    def load_value(self, value):
+        if isinstance(value, Gdk.RGBA):
+            value = value.to_string()
+        color = self._get_color_from_str(value)
         if color:
-            if force_value:
-                self._value = [color, ]
-            self._buttom.set_rgba(color)
-            self._txt.set_text(default)
+            self._value = [color, ]
+            self._color_text = value
         else:
-            self._txt.set_text('')
+            self._value = None
+            self._color_text = ''
+        self._load_editor()
+
+    def create_editor(self):
+        hbox = Gtk.Box(
+            orientation=Gtk.Orientation.HORIZONTAL)
+        hbox.button = Gtk.ColorButton()
+        hbox.button.set_use_alpha(True)
+        hbox.entry = Gtk.Entry()
+        hbox.pack_start(hbox.button, True, True, 0)
+        hbox.pack_start(hbox.entry, True, True, 0)
+        return hbox
+
+    def load_editor(self, editor):
+        text = self._color_text
+        if self._value is not None:
+            color = self._value[0]
+        elif self._default is not None and not self._mixed:
+            text = self._default
+            color = self._get_color_from_str(text)
+        else:
+            color = None
+        editor.button.set_rgba(Gdk.RGBA() if color is None else color)
+        editor.entry.set_text(text)
+        editor.entry.set_placeholder_text(
+            '[Mixed]' if self._mixed else None)
+
+    def connect_editor(self, editor):
+        self._connect_editor(editor.button, "color_set", self._on_toggled)
+        self._connect_editor(editor.entry, "changed", self._on_txt_changed)
 
     def on_change(self):
         if not super(PropertyColor, self).on_change():
             return False
         if self._value is None:
             self._value = [None, ]
-        color = self._get_color_from_str(self._txt.get_text())
+        button = self._editor.button
+        self._color_text = self._editor.entry.get_text()
+        color = self._get_color_from_str(self._color_text)
         if color:
-            self._buttom.set_rgba(color)
-            self._value[0] = self._buttom.get_rgba()
+            button.set_rgba(color)
+            self._value[0] = button.get_rgba()
         else:
-            self._buttom.set_rgba(Gdk.RGBA())
+            button.set_rgba(Gdk.RGBA())
             self._value[0] = None
         self.has_changed()
         return True
 
+    def dump_value(self):
+        """Gets the color as a string.
+
+        Returns:
+            A color string like 'rgb(52,101,164)', or None.
+        """
+        if self._value is None or self._value[0] is None:
+            return
+        return self._value[0].to_string()
+
     def update_display_value(self):
-        ctx = self._color_label.get_style_context()
-        ctx.remove_class('color_label')
         if self._value is None or self._value[0] is None:
             super(PropertyColor, self).update_display_value()
-            return
+        else:
+            self._set_display_text(self.formatter.format(self._color_text))
+        self._update_color_label()
 
-        self._display_widget._main_label.set_text(
-            self._txt.get_text())
+    def _update_color_label(self):
+        if self._color_label is None:
+            return
+        ctx = self._color_label.get_style_context()
+        if self._value is None or self._value[0] is None:
+            ctx.remove_class('color_label')
+            return
 
-        self._style_provider.load_from_data(
-                self._get_css_color_class(self._txt.get_text())
-            )
+        text = self._color_text
+        if text != self._css_color:
+            self._css_color = text
+            self._style_provider.load_from_data(
+                    self._get_css_color_class(text)
+                )
         ctx.add_class('color_label')
 
+    def _get_display_color(self):
+        if self._value is None:
+            return
+        return self._value[0]
+
     def _on_draw_color_display(self, wg, data):
         wd = wg.get_allocated_width() / 5
         self._color_label.set_size_request(
@@ -515,7 +1006,7 @@ class PropertyColor(PropertyGridProperty):
         return css.encode('utf8')
 
     def _on_toggled(self, wg):
-        self._txt.set_text(self._buttom.get_rgba().to_string())
+        self._editor.entry.set_text(wg.get_rgba().to_string())
 
     def _on_txt_changed(self, wg):
         self.on_change()
@@ -561,14 +1052,8 @@ class PropertyList(PropertyGridProperty):
         """
         self._list_values = list_values
 
-        self._combo = Gtk.ComboBoxText()
-        for v in list_values:
-            self._combo.append(v[0], v[1])
-
-        self._combo.connect('changed', self._on_combo_changed)
-
         super(PropertyList, self).__init__(
-                name=name, value_widget=self._combo,
+                name=name, value_widget=None,
                 id=id, default=default, description=description,
                 force_value=force_value)
 
@@ -576,18 +1061,76 @@ class PropertyList(PropertyGridProperty):
         found = -1
         if default:
             if 'id' in default:
-                found = self._set_active(0, default['id'])
+                found = self._find(0, default['id'])
             else:
-                found = self._set_active(1, default['string'])
+                found = self._find(1, default['string'])
         self._value = None
-        if force_value:
-            if found > -1:
-                self._value = self._list_values[found]
+        # Shown by the editor while property has no value.
+        self._default = None
+        if found > -1:
+            self._default = self._list_values[found]
+            if force_value:
+                self._value = self._default
+
+    def load_value(self, value):
+        """Selects an element of the list.
+
+        Args:
+            value: The id of the element to select, or a dictionary
+                as described for *default* parameter.
+                None clears the selection.
+        """
+        if value is None:
+            found = -1
+        elif isinstance(value, dict):
+            if 'id' in value:
+                found = self._find(0, value['id'])
+            else:
+                found = self._find(1, value['string'])
+        else:
+            found = self._find(0, value)
+        if found > -1:
+            self._value = self._list_values[found]
+        else:
+            self._value = None
+        self._load_editor()
+
+    def dump_value(self):
+        """Gets the id of the selected element.
+
+        Returns:
+            The id of the selected element, or None.
+            If element id is None, a dictionary {'string': string}
+            is returned.
+        """
+        if self._value is None:
+            return
+        if self._value[0] is None:
+            return {'string': self._value[1]}
+        return self._value[0]
+
+    def create_editor(self):
+        return Gtk.ComboBoxText()
+
+    def load_editor(self, editor):
+        editor.remove_all()
+        selected = self._value
+        if selected is None and not self._mixed:
+            selected = self._default
+        active = -1
+        for index, v in enumerate(self._list_values):
+            editor.append(v[0], v[1])
+            if v is selected:
+                active = index
+        editor.set_active(active)
+
+    def connect_editor(self, editor):
+        self._connect_editor(editor, 'changed', self._on_combo_changed)
 
     def on_change(self):
         if not super(PropertyList, self).on_change():
             return False
-        active = self._combo.get_active()
+        active = self._editor.get_active()
         if active == -1:
             self._value = None
         else:
@@ -599,23 +1142,23 @@ class PropertyList(PropertyGridProperty):
         if self._value is None:
             super(PropertyList, self).update_display_value()
             return
-        self._display_widget._main_label.set_text(
-            self._value[1])
+        self._set_display_text(
+            self.formatter.format(self._value[1]))
+
+    def _format_value(self, value):
+        if isinstance(value, dict):
+            value = value.get('string')
+        elif value is not None:
+            found = self._find(0, value)
+            if found > -1:
+                value = self._list_values[found][1]
+        return super(PropertyList, self)._format_value(value)
 
-    def _set_active(self, index, value):
-        found = False
-        found_index = 0
-        for l in self._list_values:
+    def _find(self, index, value):
+        for found_index, l in enumerate(self._list_values):
             if l[index] == value:
-                found = True
-                break
-            found_index += 1
-        if found:
-            self._combo.set_active(found_index)
-        else:
-            self._combo.set_active(-1)
-            found_index = -1
-        return found_index
+                return found_index
+        return -1
 
     def _on_combo_changed(self, wg):
         self.on_change()
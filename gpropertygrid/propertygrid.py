@@ -2,23 +2,61 @@
 # The COPYRIGHT file at the top level of this repository
 # contains the full copyright notices and license terms.
 
-from gi.repository import Gtk, GObject
-from . properties import PropertyGridProperty
+from gi.repository import Gtk, Gdk, GLib, GObject
+from . properties import PropertyGridProperty, _PropertyNumeric
+from . canvas import _GridCanvas
+from . base import PropertyGridBase
 
 
-class PropertyGrid(Gtk.Box, GObject.GObject):
+class PropertyGrid(PropertyGridBase, Gtk.Box, GObject.GObject):
     __gsignals__ = {
         'changed': (
+            GObject.SIGNAL_RUN_FIRST | GObject.SIGNAL_DETAILED, None,
+            (PropertyGridProperty,)),
+        'validated': (
             GObject.SIGNAL_RUN_FIRST, None,
-            (PropertyGridProperty,))
+            (PropertyGridProperty,)),
+        'values-changed': (
+            GObject.SIGNAL_RUN_FIRST, None,
+            (GObject.TYPE_PYOBJECT,))
     }
 
-    def __init__(self, title):
+    _numeric_type = _PropertyNumeric
+
+    # Number of property rows shown per main loop iteration
+    # while expanding all groups, see set_expanded().
+    _EXPAND_ROWS = 500
+
+    def __init__(
+            self, title, canvas=False, shared_editors=False,
+            uniform_rows=False):
         """The main PropertyGrid widget class.
 
         Args:
             title (string): The title of the property grid.
 
+            canvas (boolean): Optional. If True, rows are drawn on
+                a single canvas instead of using widgets for each row,
+                and only the value widget of the property being edited
+                is shown. Recommended for very large grids.
+                Default False.
+
+            shared_editors (boolean): Optional. If True, all
+                properties of the same class share a single value
+                widget, bound to the property being edited.
+                Only one property can be edited at a time,
+                so memory does not grow with the number of
+                properties. Default False.
+
+            uniform_rows (boolean): Optional. If True, all rows have
+                the same height and minimum width, measured once on
+                a single row each time the font or theme changes.
+                Group heights and the row under the pointer are
+                computed from it, so rows are not measured one by one,
+                and value widgets are shown inside the row height.
+                Canvas mode always works this way, so it is ignored
+                there. Default False.
+
         **Signals:**
             **changed**: Emited when a value of a property in the
                 property grid changes.
@@ -27,6 +65,31 @@ class PropertyGrid(Gtk.Box, GObject.GObject):
                 **propertygrid:** The property grid that emits the signal.
 
                 **property:** The property object that has changed.
+
+            It is a detailed signal, the detail is the property id.
+            Connect to "changed::<id>" to be notified only when
+            property with that id changes.
+
+            **validated**: Emited when the validation of a property
+                value finishes. See
+                :py:meth:`set_validator
+                <gpropertygrid.properties.PropertyGridProperty.set_validator>`.
+
+            **Parameters:**
+                **propertygrid:** The property grid that emits the signal.
+
+                **property:** The property object validated.
+
+            **values-changed**: Emited once by :meth:`apply_values`
+                when it changes any property value.
+
+            **Parameters:**
+                **propertygrid:** The property grid that emits the signal.
+
+                **properties:** List of property objects that
+                have changed.
+
+            It is also emited by :meth:`undo` and :meth:`redo`.
         """
 
         Gtk.Box.__init__(
@@ -35,11 +98,19 @@ class PropertyGrid(Gtk.Box, GObject.GObject):
             spacing=1)
         GObject.GObject.__init__(self)
 
-        self._groups = []
-        self._properties = []
-        self._property_names = {}
-        self._next_id = -1
+        self._init_state()
         self._expanded = False
+        self._shared_editors = shared_editors
+        # Shared editors and the property bound to each,
+        # by property class.
+        self._editors = {}
+        self._editor_owners = {}
+        self._batch_expanding = False
+        self._expand_source = None
+        self._uniform_rows = uniform_rows and not canvas
+        self._row_size = None
+        self._hover = None
+        self._hover_color = None
 
         event_box = Gtk.EventBox()
         self._grid_header = Gtk.Label(xalign=0)
@@ -55,18 +126,35 @@ class PropertyGrid(Gtk.Box, GObject.GObject):
         self._sw = Gtk.ScrolledWindow()
         self.pack_start(self._sw, False, False, 0)
 
+        self._canvas = None
+        if canvas:
+            self._canvas = _GridCanvas(self)
+            self._sw.add(self._canvas)
+            self.connect("draw", self._on_draw)
+            return
+
         self._groups_rows = Gtk.Box(
             orientation=Gtk.Orientation.VERTICAL, spacing=1)
-        self._sw.add(self._groups_rows)
 
-        self.connect("draw", self._on_draw)
+        # Hover and click on property rows are tracked here,
+        # rows do not handle pointer events by themselves.
+        self._rows_events = Gtk.EventBox()
+        self._rows_events.add_events(
+            Gdk.EventMask.POINTER_MOTION_MASK |
+            Gdk.EventMask.LEAVE_NOTIFY_MASK |
+            Gdk.EventMask.BUTTON_PRESS_MASK)
+        self._rows_events.connect(
+            "motion-notify-event", self._on_rows_motion)
+        self._rows_events.connect(
+            "leave-notify-event", self._on_rows_leave)
+        self._rows_events.connect(
+            "button-press-event", self._on_rows_click)
+        self._rows_events.connect_after("draw", self._on_rows_draw)
+        self._rows_events.add(self._groups_rows)
+        self._sw.add(self._rows_events)
 
-    @property
-    def properties(self):
-        """
-        List of all properties objects that belongs to the property grid.
-        """
-        return self._properties
+        self.connect("draw", self._on_draw)
+        self.connect("style-updated", self._on_style_updated)
 
     def get_title(self):
         """Gets the current title of the property grid.
@@ -98,46 +186,123 @@ class PropertyGrid(Gtk.Box, GObject.GObject):
         group = PropertyGridGroup(group_title)
         self._groups.append(group)
         group._grid = self
-        self._groups_rows.pack_start(group, False, False, 0)
+        if self._uniform_rows:
+            group._use_uniform_rows()
+        group.connect("notify::expanded", self._on_group_expanded)
+        if self._canvas is not None:
+            self._canvas.rows_changed()
+        else:
+            self._groups_rows.pack_start(group, False, False, 0)
         return group
 
     def remove_all_groups(self):
         """Removes all groups from property grid.
         """
-        for g in self._groups:
-            self._groups_rows.remove(g)
+        self._cancel_expand()
+        if self._canvas is not None:
+            self._canvas._end_edit()
+            self._canvas.rows_changed()
+        else:
+            for g in self._groups:
+                self._groups_rows.remove(g)
+            self._set_hover(None)
         self._description.set_value('', '')
         self._groups = []
-
-    def get_property_by_id(self, id):
-        """Finds and returns a PropertyGridProperty for given id.
-
-        Args:
-            id (string): The id of the PropertyGridProperty object fo find.
-
-        Returns:
-            A PropertyGridProperty object. None if property is not found.
-        """
-        if id not in self._property_names:
-            return
-        return self._property_names[id]
+        self._clear_properties()
 
     def set_expanded(self, expanded):
         """Sets the expanded state of the property grid.
 
+        In canvas mode, and when collapsing, all groups are changed
+        at once, with a single update of the rows. Otherwise
+        expansion is progressive: groups are expanded a few hundred
+        rows per main loop iteration, starting by the groups in the
+        visible area, so the grid keeps responding. Layout is not
+        suspended meanwhile, GTK lays out the grid once per
+        iteration, with the groups expanded so far.
+
         Args:
             expanded (boolean): If True, grid expands to show
                 its properties.
         """
-        for g in self._groups:
-            g.set_expanded(expanded)
         self._expanded = expanded
+        self._cancel_expand()
+        groups = [g for g in self._groups if g.get_expanded() != expanded]
+        if not expanded or self._canvas is not None:
+            # Canvas only draws visible rows, and collapsing is cheap.
+            self._set_groups_expanded(groups, expanded)
+            return
+        pending = self._get_viewport_order(groups)
+        if self._expand_next(pending):
+            self._expand_source = GLib.idle_add(self._expand_next, pending)
 
     def _on_header_click(self, box, event_type, data):
         self.set_expanded(not self._expanded)
 
-    def _property_changed(self, property_):
-        self.emit("changed", property_)
+    def _property_display_changed(self, property_):
+        if self._canvas is not None:
+            self._canvas.property_changed(property_)
+
+    def _draws_shown_rows_only(self):
+        return self._canvas is not None
+
+    def _property_validated(self, property_):
+        # Canvas paints invalid values.
+        self._property_display_changed(property_)
+        super(PropertyGrid, self)._property_validated(property_)
+
+    def _set_groups_expanded(self, groups, expanded):
+        self._batch_expanding = True
+        try:
+            for g in groups:
+                g.set_expanded(expanded)
+        finally:
+            self._batch_expanding = False
+        if self._canvas is not None:
+            self._canvas.rows_changed()
+        if expanded:
+            for g in groups:
+                self._group_expanded(g)
+
+    def _expand_next(self, pending):
+        batch = []
+        rows = 0
+        while pending and (not batch or rows < self._EXPAND_ROWS):
+            group = pending.pop(0)
+            batch.append(group)
+            rows += len(group._get_rows())
+        self._set_groups_expanded(batch, True)
+        if not pending:
+            self._expand_source = None
+            return False
+        return True
+
+    def _cancel_expand(self):
+        if self._expand_source is not None:
+            GLib.source_remove(self._expand_source)
+            self._expand_source = None
+
+    def _get_viewport_order(self, groups):
+        """Sorts groups starting by the first one in the visible area,
+        followed by the ones below it, and then the ones above it.
+        """
+        top = self._sw.get_vadjustment().get_value()
+        first = len(groups)
+        for index, g in enumerate(groups):
+            coords = g.translate_coordinates(self._groups_rows, 0, 0)
+            if coords is None or \
+                    coords[1] + g.get_allocated_height() > top:
+                first = index
+                break
+        return groups[first:] + groups[:first][::-1]
+
+    def _on_group_expanded(self, group, param):
+        if self._batch_expanding:
+            return
+        if self._canvas is not None:
+            self._canvas.rows_changed()
+        if group.get_expanded():
+            self._group_expanded(group)
 
     def _on_draw(self, wg, data):
         w = self.get_allocated_width() - 50
@@ -145,27 +310,144 @@ class PropertyGrid(Gtk.Box, GObject.GObject):
             self._description.get_allocated_height() - 40
         self._sw.set_size_request(w, h)
 
-    def _add_property(self, group, property_):
-        property_._group = group
-        if property_.id is None:
-            property_.id = "property_{0}".format(self._next_id)
-            self._next_id += 1
-        if property_.id in self._property_names:
-            property_.value_widget.set_sensitive(False)
-            raise ValueError(
-                "Properpy with id {0} already exists in property grid".format(
-                    property_.id))
-        self._properties.append(property_)
-        self._property_names[property_.id] = property_
-        group._properties.append(property_)
-
-    def _on_enter_widget(self, id):
-        for p in self._properties:
-            if p.id == id:
-                self._description.set_value(p.name, p.description)
+    def _on_style_updated(self, wg):
+        self._hover_color = None
+        if self._uniform_rows:
+            self._row_size = None
+            for g in self._groups:
+                g._row.queue_resize()
+
+    def _get_row_height(self, rows):
+        return self._get_row_size(rows)[1]
+
+    def _get_row_size(self, rows):
+        """Minimum width and height of uniform rows, measured
+        on a single row.
+        """
+        if self._row_size is None:
+            # Row being edited may be taller, it is skipped if possible.
+            row = rows[0]
+            for p in rows:
+                if not p._has_focus:
+                    row = p
+                    break
+            self._row_size = (
+                row.get_preferred_width()[0],
+                row.get_preferred_height()[1])
+        return self._row_size
+
+    def _get_property_at(self, y):
+        for g in self._groups:
+            rows = g._get_rows()
+            if not g.get_expanded() or not rows:
+                continue
+            coords = g._row.translate_coordinates(self._rows_events, 0, 0)
+            if coords is None:
+                continue
+            if y < coords[1]:
+                return
+            if y >= coords[1] + g._row.get_allocated_height():
                 continue
-            if p._has_focus:
-                p._show_hide_value_widget()
+            if self._uniform_rows:
+                index = int((y - coords[1]) // self._get_row_height(rows))
+                return rows[min(index, len(rows) - 1)]
+            # Rows are stacked, so search the last one starting above y.
+            lo, hi = 0, len(rows)
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                top = rows[mid].translate_coordinates(
+                    self._rows_events, 0, 0)[1]
+                if top <= y:
+                    lo = mid
+                else:
+                    hi = mid
+            return rows[lo]
+
+    def _get_row_rect(self, property_):
+        coords = property_.translate_coordinates(self._rows_events, 0, 0)
+        if coords is None:
+            return
+        return (
+            coords[0], coords[1],
+            property_.get_allocated_width(),
+            property_.get_allocated_height())
+
+    def _set_hover(self, property_):
+        if property_ is self._hover:
+            return
+        for p in (self._hover, property_):
+            if p is None:
+                continue
+            rect = self._get_row_rect(p)
+            if rect is not None:
+                self._rows_events.queue_draw_area(*rect)
+        self._hover = property_
+
+    def _on_rows_motion(self, wg, event):
+        self._set_hover(self._get_property_at(event.y))
+        return False
+
+    def _on_rows_leave(self, wg, event):
+        if event.detail != Gdk.NotifyType.INFERIOR:
+            self._set_hover(None)
+        return False
+
+    def _on_rows_click(self, wg, event):
+        property_ = self._get_property_at(event.y)
+        if property_ is None or not property_.get_sensitive():
+            return False
+        if property_._has_focus:
+            # Clicks on the value widget area belong to the value widget.
+            x = wg.translate_coordinates(property_, event.x, event.y)[0]
+            if x >= property_.get_position():
+                return False
+        property_._show_hide_value_widget()
+        return True
+
+    def _on_rows_draw(self, wg, cr):
+        if self._hover is None or self._hover._has_focus:
+            return False
+        rect = self._get_row_rect(self._hover)
+        if rect is None:
+            return False
+        if self._hover_color is None:
+            ctx = self.get_style_context()
+            self._hover_color = ctx.get_background_color(
+                Gtk.StateFlags.SELECTED)
+            self._hover_color.alpha = 0.4
+        Gdk.cairo_set_source_rgba(cr, self._hover_color)
+        cr.rectangle(*rect)
+        cr.fill()
+        return False
+
+    def _on_enter_widget(self, property_):
+        self._description.set_value(property_.name, property_.description)
+        for g in self._groups:
+            for p in g._get_rows():
+                if p is not property_ and p._has_focus:
+                    p._show_hide_value_widget()
+
+    def _bind_shared_editor(self, property_):
+        key = type(property_)
+        editor = self._editors.get(key)
+        if editor is None:
+            editor = self._editors[key] = property_.create_editor()
+        owner = self._editor_owners.get(key)
+        if owner is not None and owner._has_focus:
+            # Gives back the editor, it is unbound by owner.
+            owner._show_hide_value_widget()
+        owner = self._editor_owners.get(key)
+        if owner is not None:
+            owner._unbind_editor()
+        property_._bind_editor(editor)
+        self._editor_owners[key] = property_
+        return editor
+
+    def _release_shared_editor(self, property_):
+        key = type(property_)
+        property_._unbind_editor()
+        if self._editor_owners.get(key) is property_:
+            del self._editor_owners[key]
 
 
 class PropertyGridGroup(Gtk.Expander):
@@ -180,6 +462,7 @@ class PropertyGridGroup(Gtk.Expander):
         super(PropertyGridGroup, self).__init__()
         self._grid = None
         self._properties = []
+        self._visible_rows = None
         self.set_name("group_header")
 
         self._row = Gtk.Box(
@@ -208,6 +491,11 @@ class PropertyGridGroup(Gtk.Expander):
         """
         return self._properties
 
+    def get_title(self):
+        """Gets the title of the group.
+        """
+        return self.get_label_widget().get_text()
+
     def add_property(self, property_):
         """Adds a
         :py:class:`Property <gpropertygrid.properties.PropertyGridProperty>`
@@ -220,7 +508,102 @@ class PropertyGridGroup(Gtk.Expander):
             raise ValueError(
                 "Group must be added to PropertyGrid first.")
         self._grid._add_property(self, property_)
-        self._row.pack_start(property_, False, False, 0)
+        self._visible_rows = None
+        if self._grid._canvas is not None:
+            self._grid._canvas.rows_changed()
+        else:
+            property_._create_row_widgets()
+            self._row.pack_start(property_, False, False, 0)
+
+    def _get_rows(self):
+        """Properties shown in the group, including the children of
+        expanded composite properties, in display order.
+        """
+        if self._visible_rows is None:
+            rows = []
+            for p in self._properties:
+                p._add_rows(rows)
+            self._visible_rows = rows
+        return self._visible_rows
+
+    def _rows_changed(self):
+        self._visible_rows = None
+        if self._grid._canvas is not None:
+            self._grid._canvas.rows_changed()
+
+    def _use_uniform_rows(self):
+        self.remove(self._row)
+        self._row = _UniformRows(self)
+        self.add(self._row)
+
+
+class _UniformRows(Gtk.Box):
+    """Box of the rows of a group, all of them with the height
+    measured by the grid.
+
+    Its height is the number of rows shown by the row height,
+    and each row is placed at a fixed offset. Rows are only measured
+    after one of them asked for a resize, not when the box moves.
+    """
+
+    def __init__(self, group):
+        super(_UniformRows, self).__init__(
+            orientation=Gtk.Orientation.VERTICAL, spacing=0)
+        self._group = group
+        self._measure_rows = True
+
+    def _get_height(self):
+        rows = self._group._get_rows()
+        if not rows:
+            return 0
+        return len(rows) * self._group._grid._get_row_height(rows)
+
+    def do_get_request_mode(self):
+        return Gtk.SizeRequestMode.CONSTANT_SIZE
+
+    def do_get_preferred_width(self):
+        # GTK only asks again for the size when a row, or the box,
+        # queued a resize, so rows must be measured again.
+        self._measure_rows = True
+        rows = self._group._get_rows()
+        if not rows:
+            return 0, 0
+        # Rows take the width of the grid.
+        width = self._group._grid._get_row_size(rows)[0]
+        return width, width
+
+    def do_get_preferred_height(self):
+        self._measure_rows = True
+        height = self._get_height()
+        return height, height
+
+    def do_get_preferred_width_for_height(self, height):
+        return self.do_get_preferred_width()
+
+    def do_get_preferred_height_for_width(self, width):
+        return self.do_get_preferred_height()
+
+    def do_size_allocate(self, allocation):
+        self.set_allocation(allocation)
+        rows = self._group._get_rows()
+        if not rows:
+            return
+        height = self._group._grid._get_row_height(rows)
+        measure = self._measure_rows
+        self._measure_rows = False
+        y = allocation.y
+        for row in rows:
+            if measure:
+                # GTK requires rows that queued a resize to be
+                # measured before allocating them.
+                row.get_preferred_height()
+            rect = Gdk.Rectangle()
+            rect.x = allocation.x
+            rect.y = y
+            rect.width = allocation.width
+            rect.height = height
+            row.size_allocate(rect)
+            y += height
 
 
 class _PropertyDescription(Gtk.Frame):
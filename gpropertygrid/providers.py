@@ -0,0 +1,213 @@
+# This file is part of GPropertyGrid project.
+# The COPYRIGHT file at the top level of this repository
+# contains the full copyright notices and license terms.
+
+"""
+Value providers for properties whose values are expensive to fetch.
+"""
+
+import threading
+import time
+from gi.repository import GLib
+
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    ThreadPoolExecutor = None
+
+_now = getattr(time, 'monotonic', time.time)
+
+_lock = threading.Lock()
+_executor = None
+_loop = None
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None and ThreadPoolExecutor is not None:
+            _executor = ThreadPoolExecutor(max_workers=4)
+    return _executor
+
+
+def _get_loop():
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=_loop.run_forever)
+            thread.daemon = True
+            thread.start()
+    return _loop
+
+
+def _is_coroutine_function(func):
+    return asyncio is not None and asyncio.iscoroutinefunction(func)
+
+
+def _deliver(callback, result, error):
+    callback(result, error)
+    return False
+
+
+def run_async(func, callback, args=(), executor=None, loop=None):
+    """Runs a function outside the GTK main thread.
+
+    Result is marshalled back to the GLib main loop, where
+    callback is called as ``callback(result, error)``.
+    *error* is None if func finished successfully.
+
+    Args:
+        func (callable): A regular callable, executed in *executor*,
+            or an asyncio coroutine function, executed in *loop*.
+
+        callback (callable): Function called in the main loop
+            with the result.
+
+        args (tuple): Optional. Arguments passed to func.
+
+        executor: Optional. A concurrent.futures executor.
+            Default a shared thread pool.
+
+        loop: Optional. An asyncio event loop used for coroutine
+            functions. Default a shared loop running in
+            a background thread.
+    """
+    def on_done(future):
+        if future.cancelled():
+            return
+        try:
+            result, error = future.result(), None
+        except Exception as e:
+            result, error = None, e
+        GLib.idle_add(_deliver, callback, result, error)
+
+    if _is_coroutine_function(func):
+        if loop is None:
+            loop = _get_loop()
+        future = asyncio.run_coroutine_threadsafe(func(*args), loop)
+        future.add_done_callback(on_done)
+        return
+
+    if executor is None:
+        executor = _get_executor()
+    if executor is not None:
+        future = executor.submit(func, *args)
+        future.add_done_callback(on_done)
+        return
+
+    def run():
+        try:
+            result, error = func(*args), None
+        except Exception as e:
+            result, error = None, e
+        GLib.idle_add(_deliver, callback, result, error)
+
+    thread = threading.Thread(target=run)
+    thread.daemon = True
+    thread.start()
+
+
+class ValueProvider(object):
+    def __init__(self, fetch, expiry=None, executor=None, loop=None):
+        """Fetches a property value in background and caches it.
+
+        A property using a provider shows a placeholder until its row
+        becomes visible, then value is fetched and loaded into
+        the property. See
+        :py:meth:`set_value_provider
+        <gpropertygrid.properties.PropertyGridProperty.set_value_provider>`.
+
+        Args:
+            fetch (callable): Called without arguments to get the value.
+                It can be a regular callable, executed in a thread pool,
+                or an asyncio coroutine function.
+
+            expiry (float): Optional. Seconds a fetched value is
+                considered valid. Default None, never expires.
+
+            executor: Optional. See :func:`run_async`.
+
+            loop: Optional. See :func:`run_async`.
+        """
+        self._fetch = fetch
+        self._expiry = expiry
+        self._executor = executor
+        self._loop = loop
+        self._value = None
+        self._fetched_at = None
+        self._generation = 0
+        self._pending = []
+
+    @property
+    def value(self):
+        """
+        Last fetched value. Read only.
+        """
+        return self._value
+
+    def is_valid(self):
+        """Tells if cached value can be used without fetching again.
+        """
+        if self._fetched_at is None:
+            return False
+        if self._expiry is None:
+            return True
+        return _now() - self._fetched_at < self._expiry
+
+    def is_pending(self):
+        """Tells if a fetch is in progress.
+        """
+        return len(self._pending) > 0
+
+    def invalidate(self):
+        """Discards cached value.
+
+        If a fetch is in progress, its result is discarded
+        and value is fetched again.
+        """
+        self._fetched_at = None
+        self._generation += 1
+
+    def request(self, callback):
+        """Requests the provider value.
+
+        Callback is called in the main loop as ``callback(value, error)``.
+        If cached value is valid it is called immediately.
+
+        Args:
+            callback (callable): Function that receives the value.
+        """
+        if self.is_valid():
+            callback(self._value, None)
+            return
+        self._pending.append(callback)
+        if len(self._pending) == 1:
+            self._start()
+
+    def _start(self):
+        generation = self._generation
+
+        def done(value, error):
+            self._on_fetched(generation, value, error)
+
+        run_async(
+            self._fetch, done,
+            executor=self._executor, loop=self._loop)
+
+    def _on_fetched(self, generation, value, error):
+        if generation != self._generation:
+            self._start()
+            return
+        if error is None:
+            self._value = value
+            self._fetched_at = _now()
+        pending = self._pending
+        self._pending = []
+        for callback in pending:
+            callback(value, error)
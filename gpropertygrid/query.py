@@ -0,0 +1,187 @@
+# This file is part of GPropertyGrid project.
+# The COPYRIGHT file at the top level of this repository
+# contains the full copyright notices and license terms.
+
+"""
+Indexes of grid properties and queries over them.
+"""
+
+import re
+import fnmatch
+from bisect import bisect_left
+from collections import OrderedDict
+from weakref import WeakSet
+
+
+class PropertyView(object):
+    def __init__(self, index, group, type_, tags, name):
+        """Live result of a query, see :meth:`PropertyIndex.query`.
+
+        It behaves as a read only list of properties, in the order
+        they were added to the grid, and it is kept up to date
+        as properties are added, tagged, or removed from the grid.
+        """
+        self._group = group
+        self._type = type_
+        self._tags = frozenset(tags or ())
+        self._match_name = None
+        if name is not None:
+            self._match_name = re.compile(fnmatch.translate(name)).match
+        found = [
+            p for p in index._get_candidates(group, type_, self._tags)
+            if self.matches(p)]
+        found.sort(key=lambda p: p._index_key)
+        self._keys = [p._index_key for p in found]
+        self._properties = found
+
+    def __len__(self):
+        return len(self._properties)
+
+    def __iter__(self):
+        return iter(list(self._properties))
+
+    def __getitem__(self, index):
+        return self._properties[index]
+
+    def __contains__(self, property_):
+        return self._find(property_) is not None
+
+    @property
+    def ids(self):
+        """
+        List of ids of the properties in the view. Read only.
+        """
+        return [p.id for p in self._properties]
+
+    def matches(self, property_):
+        """Tells if a property satisfies the query of this view.
+        """
+        if self._group is not None and property_._group is not self._group:
+            return False
+        if self._type is not None and not isinstance(property_, self._type):
+            return False
+        if not self._tags.issubset(property_._tags):
+            return False
+        if self._match_name is not None and \
+                not self._match_name(property_.name):
+            return False
+        return True
+
+    def _find(self, property_):
+        key = getattr(property_, '_index_key', None)
+        if key is None:
+            return
+        pos = bisect_left(self._keys, key)
+        if pos < len(self._keys) and self._properties[pos] is property_:
+            return pos
+
+    def _update(self, property_):
+        pos = self._find(property_)
+        if self.matches(property_):
+            if pos is None:
+                pos = bisect_left(self._keys, property_._index_key)
+                self._keys.insert(pos, property_._index_key)
+                self._properties.insert(pos, property_)
+        elif pos is not None:
+            del self._keys[pos]
+            del self._properties[pos]
+
+    def _clear(self):
+        self._keys = []
+        self._properties = []
+
+
+class PropertyIndex(object):
+    def __init__(self):
+        """Indexes of properties by group, type and tag.
+
+        Indexes are updated each time a property is added
+        or tagged, so a query costs as much as its smallest index,
+        not as much as the number of properties in the grid.
+        """
+        self._next_key = 0
+        self._groups = {}
+        self._types = {}
+        self._tags = {}
+        self._views = WeakSet()
+
+    def add(self, property_):
+        property_._index_key = self._next_key
+        self._next_key += 1
+        self._add_to(self._groups, property_._group, property_)
+        self._add_to(self._types, type(property_), property_)
+        for tag in property_._tags:
+            self._add_to(self._tags, tag, property_)
+        self._update_views(property_)
+
+    def retag(self, property_, old_tags):
+        for tag in old_tags - property_._tags:
+            self._remove_from(self._tags, tag, property_)
+        for tag in property_._tags - old_tags:
+            self._add_to(self._tags, tag, property_)
+        self._update_views(property_)
+
+    def clear(self):
+        self._groups.clear()
+        self._types.clear()
+        self._tags.clear()
+        for view in self._views:
+            view._clear()
+
+    def query(self, group=None, type=None, tags=None, name=None):
+        """Finds the properties that satisfy all given conditions.
+
+        Args:
+            group: Optional. Group of the properties.
+
+            type (class): Optional. Class of the properties,
+                subclasses are included.
+
+            tags (list): Optional. Tags the properties must have.
+
+            name (string): Optional. Pattern, with shell wildcards
+                like 'size_*', the property names must match.
+
+        Returns:
+            A :class:`PropertyView` object.
+        """
+        view = PropertyView(self, group, type, tags, name)
+        self._views.add(view)
+        return view
+
+    def _get_candidates(self, group, type_, tags):
+        sets = []
+        if group is not None:
+            sets.append(self._groups.get(group, ()))
+        for tag in tags:
+            sets.append(self._tags.get(tag, ()))
+        if type_ is not None:
+            found = []
+            for cls, properties in self._types.items():
+                if issubclass(cls, type_):
+                    found.extend(properties)
+            sets.append(found)
+        if not sets:
+            found = []
+            for properties in self._groups.values():
+                found.extend(properties)
+            return found
+        return min(sets, key=len)
+
+    def _update_views(self, property_):
+        for view in list(self._views):
+            view._update(property_)
+
+    def _add_to(self, index, key, property_):
+        properties = index.get(key)
+        if properties is None:
+            properties = index[key] = OrderedDict()
+        properties[property_] = None
+
+    def _remove_from(self, index, key, property_):
+        properties = index.get(key)
+        if properties is None:
+            return
+        properties.pop(property_, None)
+        if not properties:
+            del index[key]
@@ -0,0 +1,258 @@
+# This file is part of GPropertyGrid project.
+# The COPYRIGHT file at the top level of this repository
+# contains the full copyright notices and license terms.
+
+"""
+Registry of property classes by type name.
+
+Classes can be registered as a class object, or as a string
+``'module:Class'`` that is imported the first time the type is used,
+so modules with heavy editors are only loaded when needed.
+Built-in types are registered as strings too, but the module of
+the backend in use is already imported with the package, so only
+``array`` and the types of other packages are loaded on first use.
+
+Other packages can add types declaring entry points in the
+``gpropertygrid.property_types`` group::
+
+    [options.entry_points]
+    gpropertygrid.property_types =
+        path = mypackage.properties:PropertyPath
+
+Grids can then be built from a schema, see :func:`build_from_schema`,
+or from the attributes of an object, see :func:`build_from_object`.
+"""
+
+import importlib
+
+try:
+    from importlib.metadata import entry_points
+except ImportError:
+    entry_points = None
+
+ENTRY_POINT_GROUP = 'gpropertygrid.property_types'
+
+_BUILTIN_TYPES = {
+    'string': 'PropertyString',
+    'multiline': 'PropertyStringMultiline',
+    'bool': 'PropertyBool',
+    'int': 'PropertyInt',
+    'float': 'PropertyFloat',
+    'color': 'PropertyColor',
+    'list': 'PropertyList',
+    'composite': 'PropertyComposite',
+}
+
+
+def _load(path):
+    module_name, _, attr = path.partition(':')
+    module = importlib.import_module(module_name)
+    for name in attr.split('.'):
+        module = getattr(module, name)
+    return module
+
+
+def _iter_entry_points():
+    if entry_points is None:
+        return []
+    found = entry_points()
+    if hasattr(found, 'select'):
+        return found.select(group=ENTRY_POINT_GROUP)
+    return found.get(ENTRY_POINT_GROUP, [])
+
+
+class PropertyRegistry(object):
+    def __init__(self, builtins=True):
+        """Maps type names to property classes.
+
+        Args:
+            builtins (boolean): Optional. If True, built-in property
+                classes of the backend in use and types declared
+                by entry points are registered the first time
+                a type is looked up. Default True.
+        """
+        self._entries = {}
+        self._value_types = []
+        self._defaults_loaded = not builtins
+
+    def register(self, name, cls):
+        """Registers a property class.
+
+        Args:
+            name (string): The type name.
+
+            cls: The property class, any callable that returns
+                a property object, or a string 'module:Class'
+                imported when the type is first used.
+        """
+        self._entries[name] = cls
+
+    def unregister(self, name):
+        """Removes a type. Unknown names are ignored.
+        """
+        self._load_defaults()
+        self._entries.pop(name, None)
+
+    def register_value_type(self, value_type, name):
+        """Sets the property type used for values of a python type
+        by :func:`build_from_object`.
+
+        Types registered later are checked first.
+
+        Args:
+            value_type (type): The python type, like int.
+
+            name (string): The property type name.
+        """
+        self._value_types.append((value_type, name))
+
+    def names(self):
+        """Gets the registered type names, without loading them.
+
+        Returns:
+            Sorted list of names.
+        """
+        self._load_defaults()
+        return sorted(self._entries)
+
+    def is_loaded(self, name):
+        """Tells if the class of a type was already imported.
+        """
+        self._load_defaults()
+        return name in self._entries and \
+            not isinstance(self._entries[name], str)
+
+    def get(self, name):
+        """Gets the class of a type, importing it if needed.
+
+        Args:
+            name (string): The type name.
+
+        Returns:
+            The property class.
+
+        Raises:
+            KeyError: if type is not registered.
+        """
+        self._load_defaults()
+        cls = self._entries.get(name)
+        if cls is None:
+            raise KeyError("Unknown property type {0}".format(name))
+        if isinstance(cls, str):
+            cls = self._entries[name] = _load(cls)
+        return cls
+
+    def create(self, type, **kwargs):
+        """Creates a property object.
+
+        Args:
+            type (string): The type name.
+
+            kwargs: Arguments of the property class.
+
+        Returns:
+            The property object.
+        """
+        return self.get(type)(**kwargs)
+
+    def get_value_type(self, value):
+        """Gets the type name for a python value, or None.
+        """
+        self._load_defaults()
+        for value_type, name in reversed(self._value_types):
+            if isinstance(value, value_type):
+                return name
+
+    def _load_defaults(self):
+        if self._defaults_loaded:
+            return
+        self._defaults_loaded = True
+        from gi.repository import Gtk
+        if Gtk.get_major_version() >= 4:
+            module = 'gpropertygrid.gtk4'
+        else:
+            module = 'gpropertygrid.properties'
+            self._entries.setdefault(
+                'array', 'gpropertygrid.arrays:PropertyArray')
+        for name, cls in _BUILTIN_TYPES.items():
+            self._entries.setdefault(name, '{0}:{1}'.format(module, cls))
+        for entry_point in _iter_entry_points():
+            self._entries.setdefault(entry_point.name, entry_point.value)
+        # bool is a subclass of int, so it is checked before.
+        self._value_types[:0] = [
+            (str, 'string'), (float, 'float'), (int, 'int'), (bool, 'bool')]
+
+
+# Registry used by default.
+registry = PropertyRegistry()
+
+
+def build_from_schema(grid, schema, registry=registry):
+    """Creates groups and properties described by a schema.
+
+    Args:
+        grid (PropertyGrid): The property grid.
+
+        schema (list): List of groups, dictionaries with a *title*
+            and a list of *properties*. Each property is a dictionary
+            with the *type* name and the arguments of its class::
+
+                [{'title': 'Size', 'properties': [
+                    {'type': 'int', 'id': 'width', 'name': 'Width'},
+                ]}]
+
+        registry (PropertyRegistry): Optional. Registry used to find
+            the property classes.
+
+    Returns:
+        List of the groups created.
+    """
+    groups = []
+    for group_schema in schema:
+        group = grid.create_group(group_schema['title'])
+        for meta in group_schema.get('properties', ()):
+            kwargs = dict(meta)
+            group.add_property(registry.create(kwargs.pop('type'), **kwargs))
+        groups.append(group)
+    return groups
+
+
+def build_from_object(grid, obj, title='Properties', registry=registry):
+    """Creates a group with a property for each attribute of an object.
+
+    Property type is chosen by the python type of each value, see
+    :py:meth:`PropertyRegistry.register_value_type`. Attributes whose
+    values have no registered type, or whose name starts with
+    underscore, are skipped.
+    Property ids are the attribute names, so the grid can then edit
+    the object with :py:meth:`set_objects
+    <gpropertygrid.base.PropertyGridBase.set_objects>`.
+
+    Args:
+        grid (PropertyGrid): The property grid.
+
+        obj: A dictionary or any object with attributes.
+
+        title (string): Optional. Title of the group.
+
+        registry (PropertyRegistry): Optional. Registry used to find
+            the property classes.
+
+    Returns:
+        The group created.
+    """
+    if isinstance(obj, dict):
+        items = obj.items()
+    else:
+        items = vars(obj).items()
+    group = grid.create_group(title)
+    for name, value in sorted(items):
+        if name.startswith('_'):
+            continue
+        type_ = registry.get_value_type(value)
+        if type_ is None:
+            continue
+        property_ = registry.create(
+            type_, name=name, id=name, default=value, force_value=True)
+        group.add_property(property_)
+    return group
@@ -0,0 +1,494 @@
+# This file is part of GPropertyGrid project.
+# The COPYRIGHT file at the top level of this repository
+# contains the full copyright notices and license terms.
+
+"""
+Properties of objects that live in another process.
+
+The grid talks to the other process through a stream socket
+(a Unix socket, a socketpair or a TCP connection) using JSON lines.
+Each request is a line like::
+
+    {"id": 1, "method": "values", "params": {"ids": ["width"]}}
+
+and it is answered with a line with the same id, and a *result*
+or an *error* message::
+
+    {"id": 1, "result": {"width": 640}}
+
+Methods are:
+
+* ``groups``: Returns the list of groups,
+  ``[{"title": title, "count": number of properties}, ...]``.
+* ``properties``: Params ``{"group": index, "offset": n, "limit": n}``.
+  Returns the metadata of a page of properties of the group,
+  a list of dictionaries with the property type, see
+  :py:class:`RemoteModel`, and the constructor arguments,
+  like ``{"type": "int", "id": "width", "name": "Width"}``.
+* ``values``: Params ``{"ids": [id, ...]}``. Returns a dictionary
+  of property id and its value, as returned by
+  :py:meth:`dump_value
+  <gpropertygrid.properties.PropertyGridProperty.dump_value>`.
+* ``set_values``: Params ``{"values": {id: value, ...}}``.
+  Writes the values changed in the grid. Returns null.
+
+:py:class:`RemoteServer` implements this protocol for data held
+in memory, it can be used as a starting point or for testing.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from gi.repository import GLib
+from . providers import ValueProvider, _deliver
+from . registry import registry
+
+
+class RemoteError(Exception):
+    """Error returned by the remote process.
+    """
+    pass
+
+
+class RemoteConnection(object):
+    def __init__(self, sock):
+        """JSON lines client over a connected stream socket.
+
+        Requests can be sent from the main loop, responses are read
+        in a background thread and callbacks are called in the
+        GLib main loop.
+
+        Args:
+            sock (socket.socket): The connected socket.
+        """
+        self._sock = sock
+        self._file = sock.makefile('rb')
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._callbacks = {}
+        self._closed = False
+        thread = threading.Thread(target=self._read)
+        thread.daemon = True
+        thread.start()
+
+    def call(self, method, params, callback):
+        """Sends a request.
+
+        Args:
+            method (string): The method name.
+
+            params (dict): The method params.
+
+            callback (callable): Called in the main loop as
+                ``callback(result, error)``. *error* is a
+                :class:`RemoteError` or an IOError, or None.
+        """
+        with self._lock:
+            if self._closed:
+                GLib.idle_add(
+                    _deliver, callback, None, IOError('Connection closed'))
+                return
+            self._next_id += 1
+            id = self._next_id
+            self._callbacks[id] = callback
+            line = json.dumps(
+                {'id': id, 'method': method, 'params': params})
+            try:
+                self._sock.sendall(line.encode('utf8') + b'\n')
+            except (IOError, OSError) as e:
+                del self._callbacks[id]
+                GLib.idle_add(_deliver, callback, None, e)
+
+    def close(self):
+        """Closes the connection, pending requests fail.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        try:
+            self._sock.shutdown(2)
+        except (IOError, OSError):
+            pass
+        self._sock.close()
+
+    def _read(self):
+        try:
+            for line in self._file:
+                message = json.loads(line.decode('utf8'))
+                with self._lock:
+                    callback = self._callbacks.pop(message.get('id'), None)
+                if callback is None:
+                    continue
+                if 'error' in message:
+                    GLib.idle_add(
+                        _deliver, callback,
+                        None, RemoteError(message['error']))
+                else:
+                    GLib.idle_add(
+                        _deliver, callback, message.get('result'), None)
+        except (IOError, OSError, ValueError):
+            pass
+        with self._lock:
+            self._closed = True
+            callbacks = list(self._callbacks.values())
+            self._callbacks.clear()
+        for callback in callbacks:
+            GLib.idle_add(
+                _deliver, callback, None, IOError('Connection closed'))
+
+
+class RemoteServer(object):
+    def __init__(self, groups, values):
+        """Serves properties held in memory with the JSON lines
+        protocol described in :py:mod:`gpropertygrid.remote`.
+
+        Args:
+            groups (list): List of tuples (title, properties),
+                where properties is a list of property metadata.
+
+            values (dict): Dictionary of property id and value.
+                Values written by clients are stored here.
+        """
+        self.groups = groups
+        self.values = values
+        # Method names of handled requests, for inspection.
+        self.requests = []
+
+    def serve(self, sock):
+        """Answers the requests read from a connected socket
+        until it is closed.
+
+        Args:
+            sock (socket.socket): The connected socket.
+        """
+        reader = sock.makefile('rb')
+        try:
+            for line in reader:
+                request = json.loads(line.decode('utf8'))
+                response = {'id': request['id']}
+                try:
+                    response['result'] = self.handle(
+                        request['method'], request.get('params') or {})
+                except Exception as e:
+                    response['error'] = str(e)
+                sock.sendall(json.dumps(response).encode('utf8') + b'\n')
+        except (IOError, OSError):
+            pass
+        finally:
+            reader.close()
+
+    def serve_in_thread(self, sock):
+        """Calls :meth:`serve` in a background thread.
+
+        Returns:
+            The thread object.
+        """
+        thread = threading.Thread(target=self.serve, args=(sock,))
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    def handle(self, method, params):
+        """Handles a single request.
+
+        Args:
+            method (string): The method name.
+
+            params (dict): The method params.
+
+        Returns:
+            The result of the method.
+        """
+        self.requests.append(method)
+        if method == 'groups':
+            return [
+                {'title': title, 'count': len(properties)}
+                for title, properties in self.groups]
+        if method == 'properties':
+            offset = params['offset']
+            properties = self.groups[params['group']][1]
+            return properties[offset:offset + params['limit']]
+        if method == 'values':
+            return dict((id, self.values.get(id)) for id in params['ids'])
+        if method == 'set_values':
+            self.values.update(params['values'])
+            return
+        raise ValueError("Unknown method {0}".format(method))
+
+
+class _RemoteValue(ValueProvider):
+    def __init__(self, model, id):
+        """Provider of a property value held by a :class:`RemoteModel`.
+
+        Value is kept in the bounded cache of the model, not here.
+        """
+        super(_RemoteValue, self).__init__(None)
+        self._model = model
+        self._id = id
+
+    @property
+    def value(self):
+        return self._model._cache.get(self._id)
+
+    def is_valid(self):
+        return self._id in self._model._cache
+
+    def invalidate(self):
+        self._model._cache.pop(self._id, None)
+        self._generation += 1
+
+    def _start(self):
+        self._model._fetch(self, self._generation)
+
+    def _on_fetched(self, generation, value, error):
+        if generation != self._generation:
+            self._start()
+            return
+        pending = self._pending
+        self._pending = []
+        for callback in pending:
+            callback(value, error)
+
+
+class _GroupState(object):
+    def __init__(self, group, index, count):
+        self.group = group
+        self.index = index
+        self.count = count
+        self.ids = []
+        self.loading = False
+        self.started = False
+
+
+class RemoteModel(object):
+    def __init__(
+            self, connection, page_size=50, prefetch=20,
+            cache_size=1000, types=None):
+        """Model of a property grid whose properties and values are
+        fetched from another process, see :py:mod:`gpropertygrid.remote`.
+
+        Only the list of groups is fetched when the model is set.
+        Properties of a group are fetched in pages, the first one
+        when the group is expanded, and the next one when a row near
+        the end of the loaded ones is shown. Values are fetched when
+        rows are shown, the values of the next *prefetch* rows are
+        requested with them, and all requests made in the same main
+        loop iteration are sent in a single message.
+
+        Values changed in the grid are written back to the remote
+        process. Values discarded from the cache are also cleared
+        from their properties, and fetched again when shown.
+
+        On GTK 3, the grid must be created with ``canvas=True``,
+        see :py:meth:`set_model
+        <gpropertygrid.base.PropertyGridBase.set_model>`.
+
+        Args:
+            connection (RemoteConnection): The connection, or
+                any object with the same ``call()`` method.
+
+            page_size (int): Optional. Maximum number of properties,
+                or values, fetched by a request. Default 50.
+
+            prefetch (int): Optional. Number of rows after a shown
+                one whose values are fetched in advance. Default 20.
+
+            cache_size (int): Optional. Maximum number of values kept
+                locally, least recently used ones are discarded and
+                fetched again when needed. Default 1000.
+
+            types (PropertyRegistry): Optional. Registry of the
+                type names used in property metadata. Default
+                :py:data:`gpropertygrid.registry.registry`.
+        """
+        self._connection = connection
+        self._page_size = page_size
+        self._prefetch = prefetch
+        self._cache_size = cache_size
+        self._types = types or registry
+        self._grid = None
+        self._groups = {}
+        self._positions = {}
+        self._cache = OrderedDict()
+        self._waiting = {}
+        self._wanted = OrderedDict()
+        self._in_flight = set()
+        self._writes = OrderedDict()
+        self._flush_queued = False
+        self._handlers = []
+
+    def attach(self, grid):
+        """Called by :py:meth:`set_model
+        <gpropertygrid.base.PropertyGridBase.set_model>`.
+        """
+        self._grid = grid
+        self._handlers = [
+            grid.connect('changed', self._on_changed),
+            grid.connect('values-changed', self._on_values_changed)]
+        self._connection.call('groups', {}, self._on_groups)
+
+    def detach(self):
+        """Called when the model is replaced.
+        """
+        for handler in self._handlers:
+            self._grid.disconnect(handler)
+        self._handlers = []
+        self._grid = None
+        self._groups = {}
+        self._positions = {}
+        self._cache.clear()
+        self._waiting = {}
+        self._wanted.clear()
+
+    def group_expanded(self, group):
+        """Called when the rows of a group are about to be shown.
+        """
+        state = self._groups.get(group)
+        if state is not None and not state.started:
+            state.started = True
+            self._load_page(state)
+
+    def _on_groups(self, result, error):
+        if error is not None or self._grid is None:
+            return
+        for index, info in enumerate(result):
+            group = self._grid.create_group(info['title'])
+            self._groups[group] = _GroupState(group, index, info['count'])
+            if group.get_expanded():
+                self.group_expanded(group)
+
+    def _load_page(self, state):
+        if state.loading or len(state.ids) >= state.count:
+            return
+        state.loading = True
+        params = {
+            'group': state.index,
+            'offset': len(state.ids),
+            'limit': self._page_size}
+
+        def done(result, error):
+            self._on_properties(state, result, error)
+
+        self._connection.call('properties', params, done)
+
+    def _on_properties(self, state, result, error):
+        state.loading = False
+        if error is not None or self._groups.get(state.group) is not state:
+            return
+        if not result:
+            # Remote has fewer properties than announced.
+            state.count = len(state.ids)
+            return
+        for meta in result:
+            property_ = self._create_property(meta)
+            self._positions[property_.id] = (state, len(state.ids))
+            state.ids.append(property_.id)
+            state.group.add_property(property_)
+            property_.set_value_provider(_RemoteValue(self, property_.id))
+
+    def _create_property(self, meta):
+        kwargs = dict(meta)
+        return self._types.create(kwargs.pop('type'), **kwargs)
+
+    def _fetch(self, provider, generation):
+        id = provider._id
+        if id in self._cache:
+            value = self._cache.pop(id)
+            self._cache[id] = value
+            provider._on_fetched(generation, value, None)
+            return
+        self._waiting.setdefault(id, []).append((provider, generation))
+        self._want(id)
+        position = self._positions.get(id)
+        if position is None:
+            return
+        state, index = position
+        for next_id in state.ids[index + 1:index + 1 + self._prefetch]:
+            if next_id not in self._cache:
+                self._want(next_id)
+        if index + self._prefetch >= len(state.ids):
+            self._load_page(state)
+
+    def _want(self, id):
+        if id in self._in_flight:
+            return
+        self._wanted[id] = None
+        self._queue_flush()
+
+    def _queue_flush(self):
+        if not self._flush_queued:
+            self._flush_queued = True
+            GLib.idle_add(self._flush)
+
+    def _flush(self):
+        self._flush_queued = False
+        if self._writes:
+            values = dict(self._writes)
+            self._writes.clear()
+
+            def written(result, error, ids=list(values)):
+                self._on_written(ids, error)
+
+            self._connection.call('set_values', {'values': values}, written)
+        ids = list(self._wanted)
+        self._wanted.clear()
+        for start in range(0, len(ids), self._page_size):
+            page = ids[start:start + self._page_size]
+            self._in_flight.update(page)
+
+            def done(result, error, page=page):
+                self._on_values(page, result, error)
+
+            self._connection.call('values', {'ids': page}, done)
+        return False
+
+    def _on_values(self, ids, result, error):
+        self._in_flight.difference_update(ids)
+        for id in ids:
+            if error is None:
+                self._store(id, result.get(id))
+                value = self._cache.get(id)
+            else:
+                value = None
+            for provider, generation in self._waiting.pop(id, ()):
+                provider._on_fetched(generation, value, error)
+
+    def _store(self, id, value):
+        self._cache.pop(id, None)
+        self._cache[id] = value
+        while len(self._cache) > self._cache_size:
+            self._evict(self._cache.popitem(last=False)[0])
+
+    def _evict(self, id):
+        if self._grid is None:
+            return
+        property_ = self._grid.get_property_by_id(id)
+        if property_ is None:
+            return
+        property_._load_value(None)
+        property_._reset_change()
+        property_.refresh_value()
+
+    def _on_changed(self, grid, property_):
+        self._write(property_)
+
+    def _on_values_changed(self, grid, properties):
+        for p in properties:
+            self._write(p)
+
+    def _write(self, property_):
+        if property_.id not in self._positions:
+            return
+        value = property_.dump_value()
+        self._store(property_.id, value)
+        self._writes[property_.id] = value
+        self._queue_flush()
+
+    def _on_written(self, ids, error):
+        if error is None:
+            return
+        # Next time they are shown, values are fetched again
+        # so they show the remote state.
+        for id in ids:
+            self._cache.pop(id, None)
@@ -0,0 +1,191 @@
+# This file is part of GPropertyGrid project.
+# The COPYRIGHT file at the top level of this repository
+# contains the full copyright notices and license terms.
+
+"""
+Rules that compute the visibility, sensitivity or value of a property
+from the values of other properties.
+"""
+
+VISIBLE = 'visible'
+SENSITIVE = 'sensitive'
+VALUE = 'value'
+
+_NO_RESULT = object()
+
+
+class Rule(object):
+    def __init__(self, kind, target, sources, func):
+        """A rule that computes a state of the *target* property.
+
+        Args:
+            kind (string): What is computed, :data:`VISIBLE`,
+                :data:`SENSITIVE` or :data:`VALUE`.
+
+            target (string): Id of the property the result is set to.
+
+            sources (list): Ids of the properties whose values are
+                passed to *func*, in the same order.
+
+            func (callable): Function that gets the source values
+                and returns the result. A boolean for visible and
+                sensitive rules, a value as accepted by
+                :py:meth:`set_value
+                <gpropertygrid.properties.PropertyGridProperty.set_value>`
+                for value rules.
+        """
+        if kind not in (VISIBLE, SENSITIVE, VALUE):
+            raise ValueError("Unknown rule kind {0}".format(kind))
+        self.kind = kind
+        self.target = target
+        self.sources = tuple(sources)
+        self.func = func
+        self._inputs = None
+        self._result = _NO_RESULT
+
+    def evaluate(self, inputs):
+        """Computes the result for the source values.
+
+        The last result is kept, and *func* is only called
+        when the source values differ from the previous ones.
+
+        Args:
+            inputs (tuple): Values of the sources.
+
+        Returns:
+            A tuple (changed, result), where changed is True if
+            result differs from the last one returned.
+        """
+        if self._result is not _NO_RESULT and inputs == self._inputs:
+            return False, self._result
+        result = self.func(*inputs)
+        changed = self._result is _NO_RESULT or result != self._result
+        self._inputs = inputs
+        self._result = result
+        return changed, result
+
+    def reset(self):
+        """Discards the last result, so the rule is evaluated again.
+        """
+        self._inputs = None
+        self._result = _NO_RESULT
+
+
+class RuleGraph(object):
+    def __init__(self):
+        """Dependency graph of rules.
+
+        A rule depends on a value rule when the target of the value
+        rule is one of its sources. Rules are kept in topological
+        order, so any rule comes after the rules it depends on.
+        """
+        self._rules = []
+        self._dependents = {}
+        self._order = None
+
+    @property
+    def rules(self):
+        """
+        List of rules, in the order they were added. Read only.
+        """
+        return list(self._rules)
+
+    def add(self, rule):
+        """Adds a rule to the graph.
+
+        Args:
+            rule (Rule): The rule to add.
+
+        Raises:
+            ValueError: if the target of a value rule already has
+                a value rule, or if the rule creates a cycle.
+        """
+        if rule.kind == VALUE:
+            for r in self._rules:
+                if r.kind == VALUE and r.target == rule.target:
+                    raise ValueError(
+                        "Property {0} already has a value rule".format(
+                            rule.target))
+        self._rules.append(rule)
+        for id in rule.sources:
+            self._dependents.setdefault(id, []).append(rule)
+        self._order = None
+        try:
+            self._get_order()
+        except ValueError:
+            self.remove(rule)
+            raise
+
+    def remove(self, rule):
+        """Removes a rule from the graph.
+
+        Args:
+            rule (Rule): The rule to remove.
+        """
+        self._rules.remove(rule)
+        for id in rule.sources:
+            dependents = self._dependents[id]
+            dependents.remove(rule)
+            if not dependents:
+                del self._dependents[id]
+        self._order = None
+
+    def get_downstream(self, ids, rules=()):
+        """Gets the rules affected by a change.
+
+        Args:
+            ids (list): Ids of the properties that have changed.
+
+            rules (list): Optional. Rules that must be evaluated
+                besides the ones depending on *ids*.
+
+        Returns:
+            List of rules depending directly or indirectly on *ids*,
+            and *rules* with the rules that depend on them,
+            in topological order.
+        """
+        if not self._dependents and not rules:
+            return []
+        found = set(rules)
+        pending = list(ids)
+        seen = set(pending)
+        for rule in rules:
+            if rule.kind == VALUE and rule.target not in seen:
+                seen.add(rule.target)
+                pending.append(rule.target)
+        while pending:
+            for rule in self._dependents.get(pending.pop(), ()):
+                if rule in found:
+                    continue
+                found.add(rule)
+                if rule.kind == VALUE and rule.target not in seen:
+                    seen.add(rule.target)
+                    pending.append(rule.target)
+        order = self._get_order()
+        return sorted(found, key=order.__getitem__)
+
+    def _get_order(self):
+        if self._order is not None:
+            return self._order
+        producers = dict(
+            (r.target, r) for r in self._rules if r.kind == VALUE)
+        incoming = dict((r, 0) for r in self._rules)
+        for rule in self._rules:
+            for id in rule.sources:
+                if id in producers:
+                    incoming[rule] += 1
+        ready = [r for r in self._rules if incoming[r] == 0]
+        order = {}
+        while ready:
+            rule = ready.pop()
+            order[rule] = len(order)
+            if rule.kind != VALUE:
+                continue
+            for dependent in self._dependents.get(rule.target, ()):
+                incoming[dependent] -= dependent.sources.count(rule.target)
+                if incoming[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) != len(self._rules):
+            raise ValueError("Rules have a circular dependency")
+        self._order = order
+        return order
@@ -0,0 +1,174 @@
+# This file is part of GPropertyGrid project.
+# The COPYRIGHT file at the top level of this repository
+# contains the full copyright notices and license terms.
+
+"""
+Incremental reading and writing of property values in configuration
+files.
+
+Values are read and written line by line, so files of any size
+can be imported or exported without holding them in memory.
+See :py:meth:`import_values
+<gpropertygrid.base.PropertyGridBase.import_values>` and
+:py:meth:`export_values
+<gpropertygrid.base.PropertyGridBase.export_values>`.
+
+Supported formats are:
+
+* :data:`JSONL`: A JSON object per line,
+  ``{"group": "Size", "id": "width", "value": 640}``.
+* :data:`INI`: A section per group, named as the group title,
+  with a ``id = value`` line per property. Values are JSON encoded,
+  but values that are not valid JSON are read as strings.
+"""
+
+import json
+
+JSONL = 'jsonl'
+INI = 'ini'
+
+
+def _decode(lines):
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode('utf8')
+        yield line
+
+
+def read_jsonl(lines):
+    """Reads values in JSON lines format.
+
+    Args:
+        lines: Iterable of lines, as a file object, of str or bytes.
+
+    Yields:
+        Tuples (group title, property id, value).
+        Group title is None if the line has no group.
+    """
+    for number, line in enumerate(_decode(lines), 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+            id = item['id']
+        except (ValueError, KeyError, TypeError):
+            raise ValueError(
+                "Invalid value at line {0}".format(number))
+        yield item.get('group'), id, item.get('value')
+
+
+def read_ini(lines):
+    """Reads values in INI format.
+
+    Args:
+        lines: Iterable of lines, as a file object, of str or bytes.
+
+    Yields:
+        Tuples (group title, property id, value).
+        Group title is None for lines before the first section.
+    """
+    section = None
+    for number, line in enumerate(_decode(lines), 1):
+        line = line.strip()
+        if not line or line[0] in '#;':
+            continue
+        if line[0] == '[':
+            if line[-1] != ']':
+                raise ValueError(
+                    "Invalid section at line {0}".format(number))
+            section = line[1:-1].strip()
+            continue
+        for sep in ('=', ':'):
+            key, found, text = line.partition(sep)
+            if found:
+                break
+        else:
+            raise ValueError("Invalid value at line {0}".format(number))
+        text = text.strip()
+        try:
+            value = json.loads(text)
+        except ValueError:
+            value = text
+        yield section, key.strip(), value
+
+
+def write_jsonl(items):
+    """Writes values in JSON lines format.
+
+    Args:
+        items: Iterable of tuples (group title, property id, value).
+
+    Yields:
+        Lines, ending with a new line character.
+    """
+    for group, id, value in items:
+        yield json.dumps(
+            {'group': group, 'id': id, 'value': value},
+            separators=(',', ':')) + '\n'
+
+
+def write_ini(items):
+    """Writes values in INI format.
+
+    A section is started each time the group title changes.
+
+    Args:
+        items: Iterable of tuples (group title, property id, value).
+
+    Yields:
+        Lines, ending with a new line character.
+    """
+    section = None
+    first = True
+    for group, id, value in items:
+        if first or group != section:
+            if not first:
+                yield '\n'
+            yield '[{0}]\n'.format(group)
+            section = group
+            first = False
+        yield '{0} = {1}\n'.format(id, json.dumps(value))
+
+
+_READERS = {JSONL: read_jsonl, INI: read_ini}
+_WRITERS = {JSONL: write_jsonl, INI: write_ini}
+
+
+def read_values(lines, format=JSONL):
+    """Reads values in any supported format, see :func:`read_jsonl`.
+    """
+    reader = _READERS.get(format)
+    if reader is None:
+        raise ValueError("Unknown format {0}".format(format))
+    return reader(lines)
+
+
+def write_values(items, format=JSONL):
+    """Writes values in any supported format, see :func:`write_jsonl`.
+    """
+    writer = _WRITERS.get(format)
+    if writer is None:
+        raise ValueError("Unknown format {0}".format(format))
+    return writer(items)
+
+
+def iter_batches(items, size):
+    """Groups values read by a reader in dictionaries.
+
+    Args:
+        items: Iterable of tuples (group title, property id, value).
+
+        size (int): Maximum number of values of each dictionary.
+
+    Yields:
+        Dictionaries of property id and value.
+    """
+    batch = {}
+    for group, id, value in items:
+        batch[id] = value
+        if len(batch) >= size:
+            yield batch
+            batch = {}
+    if batch:
+        yield batch
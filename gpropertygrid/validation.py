@@ -0,0 +1,89 @@
+# This file is part of GPropertyGrid project.
+# The COPYRIGHT file at the top level of this repository
+# contains the full copyright notices and license terms.
+
+"""
+Validation of property values outside the GTK main thread.
+"""
+
+from collections import OrderedDict
+from . providers import run_async
+
+
+def _get_result(result, error):
+    if error is not None:
+        return False, str(error)
+    if result is None or result is True:
+        return True, None
+    if result is False:
+        return False, None
+    return False, str(result)
+
+
+class Validator(object):
+    def __init__(self, func, executor=None, cache_size=1024):
+        """Validates property values in background.
+
+        Args:
+            func (callable): Called as ``func(value)``, where value is
+                the one returned by
+                :py:meth:`dump_value
+                <gpropertygrid.properties.PropertyGridProperty.dump_value>`.
+                It returns None or True if value is valid, False or an
+                error message string otherwise. An exception raised by
+                func also marks the value as invalid, using the
+                exception as the message.
+
+            executor: Optional. A concurrent.futures executor,
+                it can be a process pool if func can be pickled.
+                Default a shared thread pool.
+
+            cache_size (int): Optional. Maximum number of results
+                kept in cache. Default 1024.
+        """
+        self._func = func
+        self._executor = executor
+        self._cache_size = cache_size
+        self._cache = OrderedDict()
+
+    def validate(self, key, value, callback):
+        """Validates a value.
+
+        Results are cached by (key, value), so a repeated value is not
+        validated again. Callback is called in the main loop as
+        ``callback(valid, message)``, immediately if result is cached.
+
+        Args:
+            key: Key that identifies the value owner, usually the
+                property id.
+
+            value: The value to validate.
+
+            callback (callable): Function that receives the result.
+        """
+        cache_key = (key, value)
+        try:
+            result = self._cache.pop(cache_key)
+        except TypeError:
+            cache_key = None
+        except KeyError:
+            pass
+        else:
+            self._cache[cache_key] = result
+            callback(*result)
+            return
+
+        def done(result, error):
+            result = _get_result(result, error)
+            if cache_key is not None:
+                self._cache[cache_key] = result
+                while len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+            callback(*result)
+
+        run_async(self._func, done, args=(value,), executor=self._executor)
+
+    def clear_cache(self):
+        """Discards all cached results.
+        """
+        self._cache.clear()
@@ -0,0 +1,77 @@
+# This file is part of GPropertyGrid project.
+# The COPYRIGHT file at the top level of this repository
+# contains the full copyright notices and license terms.
+
+import ctypes
+import unittest
+from array import array
+from gpropertygrid import PropertyGrid
+from gpropertygrid.arrays import PropertyArray
+
+
+class ArraysTest(unittest.TestCase):
+    def testPropertyArray(self):
+        values = array('d', [0.0] * 6)
+        pa = PropertyArray(
+            name='Test array', parent_window=None, id='array',
+            default=values, force_value=True)
+        self.assertEqual(pa.value[0] is values, True)
+        self.assertEqual(pa.display_text, 'array(6, d)')
+
+        pg = PropertyGrid('Property Grid Test')
+        grp = pg.create_group('Group 1')
+        grp.add_property(pa)
+        ranges = []
+        pa.connect('cells-changed', lambda p, r: ranges.append(r))
+        pa.set_cells(2, [1.5, 2.5])
+        self.assertEqual(values[2], 1.5)
+        self.assertEqual(pa.changed_ranges, [(2, 4)])
+        self.assertEqual(ranges, [[(2, 4)]])
+        self.assertEqual(
+            pg.get_changes(),
+            [('array', ((2, [0.0, 0.0]), ), ((2, [1.5, 2.5]), ))])
+
+        pa.set_cells(5, [3.5])
+        pg.undo()
+        self.assertEqual(values.tolist(), [0.0] * 6)
+
+        # Ranges of all cells written at once are kept.
+        pa.load_value({'cells': [[0, [1.0]], [4, [2.0, 3.0]]]})
+        self.assertEqual(pa.changed_ranges, [(0, 1), (4, 6)])
+
+    def testInvalidCells(self):
+        values = array('B', [0, 0, 0])
+        pa = PropertyArray(
+            name='Test array', parent_window=None, id='array',
+            default=values, force_value=True)
+        pg = PropertyGrid('Property Grid Test')
+        grp = pg.create_group('Group 1')
+        grp.add_property(pa)
+
+        # No cell is written if any value does not fit.
+        self.assertRaises(ValueError, pa.set_cells, 0, [1, 300])
+        self.assertRaises(ValueError, pa.set_cells, 2, [1, 2])
+        self.assertEqual(values.tolist(), [0, 0, 0])
+        self.assertEqual(pg.get_changes(), [])
+
+    def testBoolCells(self):
+        values = array('b', [0, 0])
+        flags = memoryview(values).cast('B').cast('?')
+        pa = PropertyArray(
+            name='Test array', parent_window=None, id='array',
+            default=flags, force_value=True)
+        pa.load_value(['true', '0'])
+        self.assertEqual(pa.dump_value(), [True, False])
+        self.assertRaises(ValueError, pa.load_value, ['yes'])
+
+    def testFormats(self):
+        # ctypes buffers have byte order prefixed formats, like '<i'.
+        values = (ctypes.c_int * 2)(1, 2)
+        pa = PropertyArray(
+            name='Test array', parent_window=None, id='array',
+            default=values, force_value=True)
+        self.assertEqual(pa.dump_value(), [1, 2])
+        self.assertRaises(
+            ValueError, PropertyArray, name='Test array',
+            parent_window=None, default=memoryview(b'ab').cast('c'),
+            force_value=True)
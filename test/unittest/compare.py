@@ -0,0 +1,72 @@
+# This file is part of GPropertyGrid project.
+# The COPYRIGHT file at the top level of this repository
+# contains the full copyright notices and license terms.
+
+import unittest
+from gpropertygrid import PropertyGrid
+from gpropertygrid.compare import PropertyComparison
+from gpropertygrid.properties import PropertyString, PropertyBool, \
+    PropertyList, PropertyComposite
+
+
+class CompareTest(unittest.TestCase):
+    def testComparison(self):
+        pg = PropertyGrid('Property Grid Test')
+        grp = pg.create_group('Group 1')
+        grp.add_property(PropertyString(name='Name', id='name'))
+        grp.add_property(PropertyBool(name='Enabled', id='enabled'))
+        grp.add_property(PropertyList(
+            name='Mode', id='mode',
+            list_values=[['a', 'Auto'], ['m', 'Manual']]))
+
+        pc = PropertyComparison(pg)
+        pc.set_objects([
+            {'name': 'one', 'enabled': True, 'mode': 'a'},
+            {'name': 'two', 'enabled': True, 'mode': 'a'},
+            {'name': 'three', 'enabled': True, 'mode': 'm'},
+        ], titles=['A', 'B', 'C'])
+        self.assertEqual(pc.differences, ['name', 'mode'])
+        self.assertEqual(pc.get_different_columns('name'), [1, 2])
+        self.assertEqual(pc.get_different_columns('mode'), [2])
+        self.assertEqual(pc.get_different_columns('enabled'), [])
+        self.assertEqual(len(pc._canvas._rows), 4)
+
+        mode = pg.get_property_by_id('mode')
+        self.assertEqual(mode._format_value('m'), 'Manual')
+
+        objects = pc.objects
+        objects[2]['mode'] = 'a'
+        pc.refresh()
+        self.assertEqual(pc.differences, ['name'])
+
+    def testComposite(self):
+        pg = PropertyGrid('Property Grid Test')
+        grp = pg.create_group('Group 1')
+        point = PropertyComposite(
+            name='Point', id='point',
+            children=lambda: [
+                PropertyString(name='X', id='x'),
+                PropertyString(name='Y', id='y')])
+        grp.add_property(point)
+
+        pc = PropertyComparison(pg)
+        pc.set_objects([
+            {'point': {'x': '1', 'y': '2'}},
+            {'point': {'x': '1', 'y': '3'}},
+        ])
+        self.assertEqual(len(pc._canvas._rows), 2)
+        self.assertEqual(pc._canvas._toggle_row(1), True)
+        self.assertEqual(len(pc._canvas._rows), 4)
+        y = pc._canvas._rows[3][1]
+        self.assertEqual(pc._canvas._diffs[y], frozenset([1]))
+        # Grid composite is not expanded.
+        self.assertEqual(point.children, None)
+
+        pc._canvas._toggle_row(1)
+        self.assertEqual(len(pc._canvas._rows), 2)
+
+    def testTitles(self):
+        pg = PropertyGrid('Property Grid Test')
+        pc = PropertyComparison(pg)
+        self.assertRaises(
+            ValueError, pc.set_objects, [{}, {}], titles=['A'])
@@ -0,0 +1,92 @@
+# This file is part of GPropertyGrid project.
+# The COPYRIGHT file at the top level of this repository
+# contains the full copyright notices and license terms.
+
+import unittest
+from gpropertygrid.formatters import DisplayFormatter, \
+    FirstLineFormatter
+
+
+class _CountFormatter(DisplayFormatter):
+    def __init__(self, *args, **kwargs):
+        super(_CountFormatter, self).__init__(*args, **kwargs)
+        self.calls = 0
+
+    def to_text(self, value):
+        self.calls += 1
+        return super(_CountFormatter, self).to_text(value)
+
+
+class FormattersTest(unittest.TestCase):
+    def testDisplayFormatter(self):
+        formatter = _CountFormatter(max_length=10)
+        self.assertEqual(formatter.format(12), '12')
+        self.assertEqual(formatter.format('a' * 20), 'a' * 10 + '...')
+        self.assertEqual(formatter.format(12), '12')
+        self.assertEqual(formatter.calls, 2)
+        text = formatter.format(list(range(10000)))
+        self.assertEqual(len(text) <= 13, True)
+
+    def testCacheLimits(self):
+        formatter = _CountFormatter(max_length=10)
+        values = [1, 2]
+        self.assertEqual(formatter.format(values), '[1, 2]')
+        # Mutable values are formatted again after changes.
+        values.append(3)
+        self.assertEqual(formatter.format(values), '[1, 2, 3]')
+
+        # Long strings are not kept alive by the cache.
+        formatter.format('a' * 20)
+        self.assertEqual(
+            [k for k in formatter._cache if k[0] is str], [])
+        self.assertEqual(formatter._last[0], None)
+
+    def testCacheKeys(self):
+        formatter = _CountFormatter()
+        # Equal values with different text are not mixed up.
+        self.assertEqual(formatter.format(0.0), '0.0')
+        self.assertEqual(formatter.format(-0.0), '-0.0')
+        self.assertEqual(formatter.format((0.0, 1)), '(0.0, 1)')
+        self.assertEqual(formatter.format((-0.0, 1)), '(-0.0, 1)')
+        self.assertEqual(formatter.format(float('nan')), 'nan')
+        self.assertEqual(formatter.format(float('nan')), 'nan')
+        self.assertEqual(formatter.calls, 5)
+
+        # Small tuples are cached too.
+        formatter.format((1, 'a'))
+        formatter.format(2)
+        formatter.format((1, 'a'))
+        self.assertEqual(formatter.calls, 7)
+
+    def testCachedTypes(self):
+        class Slow(object):
+            def __init__(self, value):
+                self.value = value
+
+            def __hash__(self):
+                return hash(self.value)
+
+            def __eq__(self, other):
+                return self.value == other.value
+
+            def __str__(self):
+                return 'slow {0}'.format(self.value)
+
+        formatter = _CountFormatter(cached_types=(Slow, ))
+        self.assertEqual(formatter.format(Slow(1)), 'slow 1')
+        formatter.format(2)
+        self.assertEqual(formatter.format(Slow(1)), 'slow 1')
+        self.assertEqual(formatter.calls, 2)
+
+    def testLongInteger(self):
+        formatter = DisplayFormatter(max_length=10)
+        value = 1 << 20000
+        self.assertEqual(formatter.format(value), hex(value)[:10] + '...')
+        self.assertEqual(
+            formatter.format([value]), '[' + hex(value)[:9] + '...')
+
+    def testFirstLineFormatter(self):
+        formatter = FirstLineFormatter(max_length=10)
+        self.assertEqual(formatter.format('Line 1\nLine 2'), 'Line 1...')
+        self.assertEqual(formatter.format('Line 1'), 'Line 1')
+        self.assertEqual(formatter.format('a' * 20), 'a' * 10 + '...')
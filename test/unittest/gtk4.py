@@ -0,0 +1,105 @@
+# This file is part of GPropertyGrid project.
+# The COPYRIGHT file at the top level of this repository
+# contains the full copyright notices and license terms.
+
+"""Tests of the GTK 4 backend.
+
+Gtk version can not change once it is loaded, so this module runs
+in its own process, started by suite.py once Gtk 4.0 is required.
+"""
+
+import importlib
+import unittest
+from gpropertygrid.gtk4 import PropertyGrid, PropertyGridGroup, \
+    PropertyString, PropertyBool, PropertyComposite
+
+
+class Gtk4Test(unittest.TestCase):
+    def testPropertygrid(self):
+        pg = PropertyGrid('Property Grid Test')
+        self.assertEqual(pg.get_title(), 'Property Grid Test')
+        grp = pg.create_group('Group 1')
+        self.assertEqual(True, isinstance(grp, PropertyGridGroup))
+        grp.add_property(PropertyString(name='String 1', id='str1'))
+        grp.add_property(PropertyBool(name='Bool 1', id='bool1'))
+        self.assertEqual(grp.get_expanded(), False)
+        self.assertEqual(pg._tree.get_n_items(), 1)
+
+        pg.set_expanded(True)
+        self.assertEqual(grp.get_expanded(), True)
+        self.assertEqual(pg._tree.get_n_items(), 3)
+        row = pg._get_tree_row(pg.get_property_by_id('bool1'))
+        self.assertEqual(row.get_item().id, 'bool1')
+
+    def testLoadValue(self):
+        pg = PropertyGrid('Property Grid Test')
+        grp = pg.create_group('Group 1')
+        p1 = PropertyString(name='String 1', id='str1', default='one',
+                            force_value=True)
+        p2 = PropertyBool(name='Bool 1', id='bool1')
+        grp.add_property(p1)
+        grp.add_property(p2)
+        self.assertEqual(p1.value[0], 'one')
+        self.assertEqual(p1.display_text, 'one')
+
+        p1.set_value('two')
+        p2.set_value(True)
+        self.assertEqual(p1.dump_value(), 'two')
+        self.assertEqual(p1.display_text, 'two')
+        self.assertEqual(p2.dump_value(), True)
+
+    def testComposite(self):
+        pg = PropertyGrid('Property Grid Test')
+        grp = pg.create_group('Group 1')
+        point = PropertyComposite(
+            name='Point', id='point',
+            children=lambda: [
+                PropertyString(name='X', id='x'),
+                PropertyString(name='Y', id='y')],
+            default={'x': '1', 'y': '2'}, force_value=True)
+        grp.add_property(point)
+        grp.set_expanded(True)
+        self.assertEqual(point.children, None)
+
+        point.set_expanded(True)
+        self.assertEqual(len(point.children), 2)
+        self.assertEqual(pg._tree.get_n_items(), 4)
+        y = point.children[1]
+        self.assertEqual(y.value[0], '2')
+        self.assertEqual(pg._get_tree_row(y).get_item(), y)
+
+        # Rows are found by position when previous ones are hidden.
+        point.children[0]._set_hidden(True)
+        pg._update_filter()
+        self.assertEqual(pg._tree.get_n_items(), 3)
+        self.assertEqual(pg._get_tree_row(y).get_item(), y)
+
+        point.set_expanded(False)
+        self.assertEqual(pg._get_tree_row(y), None)
+
+    def testApplyValues(self):
+        pg = PropertyGrid('Property Grid Test')
+        grp = pg.create_group('Group 1')
+        grp.add_property(PropertyString(name='String 1', id='str1'))
+        grp.add_property(PropertyBool(name='Bool 1', id='bool1'))
+        signals = []
+        pg.connect('values-changed', lambda g, p: signals.append(p))
+
+        changed = pg.apply_values({'str1': 'one', 'bool1': True})
+        self.assertEqual(sorted(p.id for p in changed), ['bool1', 'str1'])
+        self.assertEqual(len(signals), 1)
+        self.assertEqual(
+            pg.snapshot(), {'str1': 'one', 'bool1': True})
+
+        pg.undo()
+        self.assertEqual(
+            pg.snapshot(), {'str1': None, 'bool1': None})
+
+    def testGtk3Modules(self):
+        # Gtk 3 properties, and PropertyArray, are not available.
+        self.assertRaises(
+            ImportError, importlib.import_module, 'gpropertygrid.arrays')
+
+
+if __name__ == '__main__':
+    unittest.main()
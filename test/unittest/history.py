@@ -0,0 +1,62 @@
+# This file is part of GPropertyGrid project.
+# The COPYRIGHT file at the top level of this repository
+# contains the full copyright notices and license terms.
+
+import unittest
+from gpropertygrid.history import History
+
+
+class HistoryTest(unittest.TestCase):
+    def testMerge(self):
+        history = History()
+        history.record([('a', None, 'x')], merge=True)
+        history.record([('a', 'x', 'xy')], merge=True)
+        history.record([('b', 1, 2)], merge=True)
+        self.assertEqual(history.undo(), (('b', 1, 2),))
+        self.assertEqual(history.undo(), (('a', None, 'xy'),))
+        self.assertEqual(history.can_undo(), False)
+        self.assertEqual(history.redo(), (('a', None, 'xy'),))
+
+        history.record([('a', 'xy', 'z')], merge=True)
+        self.assertEqual(history.can_redo(), False)
+        self.assertEqual(history.undo(), (('a', 'xy', 'z'),))
+
+    def testMergeWindow(self):
+        history = History()
+        # Values set programmatically are not merged with edits.
+        history.record([('a', None, 'x')])
+        history.record([('a', 'x', 'xy')], merge=True)
+        self.assertEqual(history.undo(), (('a', 'x', 'xy'),))
+
+        # Nor edits made after a pause.
+        history.record([('a', 'x', 'xz')], merge=True)
+        history._merge_time -= 10
+        history.record([('a', 'xz', 'xzz')], merge=True)
+        self.assertEqual(history.undo(), (('a', 'xz', 'xzz'),))
+
+    def testMultiple(self):
+        history = History()
+        history.record([('a', 1, 2), ('b', 1, 2)])
+        history.record([('a', 2, 3)])
+        self.assertEqual(history.undo(), (('a', 2, 3),))
+        self.assertEqual(len(history.undo()), 2)
+
+    def testLimits(self):
+        history = History(max_entries=3)
+        for i in range(10):
+            history.record([(str(i), i, i + 1)])
+        entries = []
+        while history.can_undo():
+            entries.append(history.undo()[0][0])
+        self.assertEqual(entries, ['9', '8', '7'])
+
+        history = History(max_bytes=100)
+        for i in range(10):
+            history.record([(str(i), 'x' * 20, 'y' * 20)])
+        self.assertEqual(history._bytes <= 100, True)
+        self.assertEqual(history.can_undo(), True)
+
+        # Last entry is kept even if it is too large.
+        history.record([('big', 'x' * 200, 'y' * 200)])
+        self.assertEqual(history.undo()[0][0], 'big')
+        self.assertEqual(history.can_undo(), False)
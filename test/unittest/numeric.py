@@ -0,0 +1,27 @@
+# This file is part of GPropertyGrid project.
+# The COPYRIGHT file at the top level of this repository
+# contains the full copyright notices and license terms.
+
+import unittest
+from array import array
+from gpropertygrid import numeric
+
+
+class NumericTest(unittest.TestCase):
+    def testClamp(self):
+        values = array('d', [-5, 5, 50])
+        self.assertEqual(
+            numeric.clamp(values, [0, 0, 0], [10, 10, 10]), [0, 5, 10])
+
+    def testInRange(self):
+        values = array('i', [-5, 5, 50])
+        self.assertEqual(
+            numeric.in_range(values, [0, 0, 0], [10, 10, 100]),
+            [False, True, True])
+
+    def testLargeIntegers(self):
+        big = 2 ** 53 + 1
+        self.assertEqual(numeric.clamp([big], [0], [2 ** 60]), [big])
+        self.assertEqual(
+            numeric.in_range([big, big], [0, 0.0], [2 ** 53, 1e20]),
+            [False, True])
@@ -6,7 +6,14 @@ import unittest
 from gi.repository import Gdk
 from gpropertygrid import PropertyGrid
 from gpropertygrid.properties import PropertyString, \
-    PropertyColor
+    PropertyColor, PropertyStringMultiline, PropertyInt, \
+    PropertyBool, PropertyList
+
+
+def _get_editor(property_):
+    pg = PropertyGrid('Property Grid Test')
+    pg.create_group('Group 1').add_property(property_)
+    return property_._get_value_widget()
 
 
 class PropertiesTest(unittest.TestCase):
@@ -41,3 +48,53 @@ class PropertiesTest(unittest.TestCase):
             default='black',
             force_value=True)
         self.assertEqual(isinstance(pc.value[0], Gdk.RGBA), True)
+
+    def testPropertyStringMultiline(self):
+        text = 'x' * 1000 + '\n' + 'y' * 1000000
+        pm = PropertyStringMultiline(
+            name='Test multiline',
+            parent_window=None,
+            default=text,
+            force_value=True)
+        self.assertEqual(pm.value[0], text)
+        self.assertEqual(pm.display_text, 'x' * 200 + '...')
+
+        pm.set_value('Line 1\nLine 2')
+        self.assertEqual(pm.display_text, 'Line 1...')
+
+    def testPropertyInt(self):
+        pi = PropertyInt(
+            name='Test int', default=5, force_value=True,
+            lower=0, upper=10)
+        self.assertEqual(pi.value[0], 5)
+        pi.set_value(20)
+        self.assertEqual(pi.value[0], 10)
+
+    def testStringEditorDefault(self):
+        ps = PropertyString(name='Test string', default='Hello')
+        self.assertEqual(ps.value, None)
+        self.assertEqual(_get_editor(ps).get_text(), 'Hello')
+
+    def testBoolEditorDefault(self):
+        pb = PropertyBool(name='Test bool', default=True)
+        self.assertEqual(pb.value, None)
+        self.assertEqual(_get_editor(pb).get_active(), True)
+
+    def testIntEditorDefault(self):
+        pi = PropertyInt(name='Test int', default=5, lower=0, upper=10)
+        self.assertEqual(pi.value, None)
+        self.assertEqual(_get_editor(pi).get_value(), 5)
+
+    def testColorEditorDefault(self):
+        pc = PropertyColor(name='Test color', default='red')
+        self.assertEqual(pc.value, None)
+        editor = _get_editor(pc)
+        self.assertEqual(editor.entry.get_text(), 'red')
+        self.assertEqual(editor.button.get_rgba().red, 1.0)
+
+    def testListEditorDefault(self):
+        pl = PropertyList(
+            name='Test list', list_values=[['a', 'A'], ['b', 'B']],
+            default={'id': 'b'})
+        self.assertEqual(pl.value, None)
+        self.assertEqual(_get_editor(pl).get_active(), 1)
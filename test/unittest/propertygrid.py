@@ -3,8 +3,11 @@
 # contains the full copyright notices and license terms.
 
 import unittest
+from gi.repository import GLib
 from gpropertygrid import PropertyGrid
 from gpropertygrid.propertygrid import PropertyGridGroup
+from gpropertygrid.properties import PropertyString, PropertyBool
+from gpropertygrid.properties import PropertyComposite
 
 
 class PropertygridTest(unittest.TestCase):
@@ -16,3 +19,270 @@ class PropertygridTest(unittest.TestCase):
 
         grp = pg.create_group('Group 1')
         self.assertEqual(True, isinstance(grp, PropertyGridGroup))
+
+    def testChangedDetail(self):
+        pg = PropertyGrid('Property Grid Test')
+        grp = pg.create_group('Group 1')
+        p1 = PropertyString(name='String 1', id='str1')
+        p2 = PropertyString(name='String 2', id='str2')
+        grp.add_property(p1)
+        grp.add_property(p2)
+
+        all_changes = []
+        str1_changes = []
+        pg.connect('changed', lambda g, p: all_changes.append(p.id))
+        pg.connect('changed::str1', lambda g, p: str1_changes.append(p.id))
+
+        p1.set_value('one')
+        p1.has_changed()
+        p2.set_value('two')
+        p2.has_changed()
+        self.assertEqual(all_changes, ['str1', 'str2'])
+        self.assertEqual(str1_changes, ['str1'])
+
+    def testCanvas(self):
+        pg = PropertyGrid('Property Grid Test', canvas=True)
+        grp = pg.create_group('Group 1')
+        grp.add_property(PropertyString(name='String 1', id='str1'))
+        self.assertEqual(pg.get_property_by_id('str1').name, 'String 1')
+        pg._canvas._update_rows()
+        self.assertEqual(len(pg._canvas._rows), 1)
+        grp.set_expanded(True)
+        pg._canvas._update_rows()
+        self.assertEqual(len(pg._canvas._rows), 2)
+
+        # Canvas draws rows, properties do not create row widgets.
+        p = pg.get_property_by_id('str1')
+        self.assertEqual(p._display_widget, None)
+        p.set_value('one')
+        self.assertEqual(p.display_text, 'one')
+
+        pg = PropertyGrid('Property Grid Test')
+        grp = pg.create_group('Group 1')
+        p = PropertyString(name='String 1', id='str1')
+        p.set_value('one')
+        grp.add_property(p)
+        self.assertEqual(p._display_widget._main_label.get_text(), 'one')
+
+    def testSnapshot(self):
+        pg = PropertyGrid('Property Grid Test')
+        grp = pg.create_group('Group 1')
+        grp.add_property(PropertyString(name='String', id='str'))
+        grp.add_property(PropertyBool(
+            name='Bool', id='bool', default=True, force_value=True))
+        self.assertEqual(pg.snapshot(), {'str': None, 'bool': True})
+
+        data = pg.snapshot(as_bytes=True)
+        applied = []
+        pg.connect('values-changed', lambda g, p: applied.append(p))
+        changed = pg.apply_values({'str': 'Hello', 'bool': True})
+        self.assertEqual([p.id for p in changed], ['str'])
+        self.assertEqual(pg.get_property_by_id('str').value[0], 'Hello')
+        self.assertEqual(len(applied), 1)
+
+        pg.apply_values(data)
+        self.assertEqual(pg.get_property_by_id('str').value, None)
+
+    def testChanges(self):
+        pg = PropertyGrid('Property Grid Test')
+        grp = pg.create_group('Group 1')
+        grp.add_property(PropertyString(name='String', id='str'))
+        grp.add_property(PropertyString(name='String 2', id='str2'))
+        self.assertEqual(pg.dirty, [])
+
+        pg.apply_values({'str': 'a'})
+        pg.apply_values({'str': 'ab'})
+        self.assertEqual(pg.dirty, ['str'])
+        self.assertEqual(pg.is_dirty('str2'), False)
+        self.assertEqual(
+            pg.get_changes(), [('str', None, 'a'), ('str', 'a', 'ab')])
+        self.assertEqual(pg.get_dirty_values(), {'str': 'ab'})
+
+        self.assertEqual(len(pg.commit()), 2)
+        self.assertEqual(pg.dirty, [])
+        self.assertEqual(pg.get_changes(), [])
+
+        # Changes of removed properties are discarded.
+        pg.apply_values({'str': 'abc'})
+        pg.remove_all_groups()
+        self.assertEqual(pg.get_changes(), [])
+
+    def testUndo(self):
+        pg = PropertyGrid('Property Grid Test')
+        grp = pg.create_group('Group 1')
+        grp.add_property(PropertyString(name='String', id='str'))
+        grp.add_property(PropertyString(name='String 2', id='str2'))
+        self.assertEqual(pg.can_undo(), False)
+
+        pg.apply_values({'str': 'a', 'str2': 'b'})
+        pg.apply_values({'str': 'c'})
+        self.assertEqual(pg.undo(), True)
+        self.assertEqual(pg.snapshot(), {'str': 'a', 'str2': 'b'})
+        self.assertEqual(pg.undo(), True)
+        self.assertEqual(pg.snapshot(), {'str': None, 'str2': None})
+        self.assertEqual(pg.undo(), False)
+        self.assertEqual(pg.redo(), True)
+        self.assertEqual(pg.snapshot(), {'str': 'a', 'str2': 'b'})
+
+    def testObjects(self):
+        pg = PropertyGrid('Property Grid Test')
+        grp = pg.create_group('Group 1')
+        grp.add_property(PropertyString(name='String', id='str'))
+        grp.add_property(PropertyBool(name='Bool', id='bool'))
+        objects = [
+            {'str': 'a', 'bool': True},
+            {'str': 'b', 'bool': True},
+        ]
+        pg.set_objects(objects)
+        self.assertEqual(pg.get_property_by_id('str').mixed, True)
+        self.assertEqual(pg.get_property_by_id('bool').mixed, False)
+        self.assertEqual(pg.get_property_by_id('bool').value[0], True)
+
+        pg.apply_values({'str': 'c'})
+        self.assertEqual(pg.get_property_by_id('str').mixed, False)
+        self.assertEqual([o['str'] for o in objects], ['c', 'c'])
+
+        # A mixed value can be cleared in all objects.
+        objects[1]['str'] = 'd'
+        pg.set_objects(objects)
+        pg.apply_values({'str': None})
+        self.assertEqual(pg.get_property_by_id('str').mixed, False)
+        self.assertEqual([o['str'] for o in objects], [None, None])
+
+        pg.set_objects(None)
+        self.assertEqual(pg.objects, None)
+
+    def testComposite(self):
+        pg = PropertyGrid('Property Grid Test')
+        grp = pg.create_group('Group 1')
+        point = PropertyComposite(
+            name='Point', id='point',
+            children=lambda: [
+                PropertyString(name='X', id='x'),
+                PropertyString(name='Y', id='y')],
+            default={'x': '1', 'y': '2'}, force_value=True)
+        grp.add_property(point)
+        self.assertEqual(point.children, None)
+        self.assertEqual(grp._get_rows(), [point])
+
+        point.set_expanded(True)
+        self.assertEqual(len(point.children), 2)
+        self.assertEqual(len(grp._get_rows()), 3)
+        self.assertEqual(point.children[0].value[0], '1')
+
+        changed = []
+        pg.connect('changed', lambda pg, p: changed.append(p.id))
+        x = point.children[0]
+        x.set_value('3')
+        x.has_changed()
+        self.assertEqual(changed, ['point'])
+        self.assertEqual(point.dump_value(), {'x': '3', 'y': '2'})
+        self.assertEqual(pg.get_changes(), [('point',
+                         {'x': '1', 'y': '2'}, {'x': '3', 'y': '2'})])
+
+        point.set_expanded(False)
+        self.assertEqual(grp._get_rows(), [point])
+
+    def testRules(self):
+        pg = PropertyGrid('Property Grid Test', canvas=True)
+        grp = pg.create_group('Group 1')
+        grp.add_property(PropertyBool(name='Proxy', id='proxy'))
+        grp.add_property(PropertyString(name='Host', id='host'))
+        grp.add_property(PropertyString(name='Url', id='url'))
+        pg.add_rule('visible', 'host', ['proxy'], lambda proxy: proxy)
+        pg.add_rule('value', 'url', ['host'],
+                    lambda host: 'http://{0}'.format(host or ''))
+        host = pg.get_property_by_id('host')
+        self.assertEqual(host not in grp._get_rows(), True)
+        self.assertEqual(pg.get_property_by_id('url').value[0], 'http://')
+
+        changed = pg.apply_values({'proxy': True, 'host': 'example.org'})
+        self.assertEqual(host in grp._get_rows(), True)
+        self.assertEqual(
+            [p.id for p in changed], ['proxy', 'host', 'url'])
+        self.assertEqual(
+            pg.get_property_by_id('url').value[0], 'http://example.org')
+
+        pg.undo()
+        self.assertEqual(pg.get_property_by_id('url').value[0], 'http://')
+
+    def testQuery(self):
+        pg = PropertyGrid('Property Grid Test')
+        grp = pg.create_group('Group 1')
+        grp.add_property(PropertyString(name='Width', id='width'))
+        grp.add_property(PropertyBool(name='Visible', id='visible'))
+        strings = pg.query(type=PropertyString)
+        self.assertEqual(strings.ids, ['width'])
+
+        pg.get_property_by_id('visible').set_tags(['layout'])
+        self.assertEqual(pg.query(group=grp, tags=['layout']).ids,
+                         ['visible'])
+
+        pg.remove_all_groups()
+        self.assertEqual(len(strings), 0)
+        self.assertEqual(pg.get_property_by_id('width'), None)
+
+    def testSharedEditors(self):
+        pg = PropertyGrid(
+            'Property Grid Test', canvas=True, shared_editors=True)
+        grp = pg.create_group('Group 1')
+        p1 = PropertyString(name='String 1', id='str1', default='one',
+                            force_value=True)
+        p2 = PropertyString(name='String 2', id='str2')
+        grp.add_property(p1)
+        grp.add_property(p2)
+
+        editor = p1._get_value_widget()
+        self.assertEqual(editor.get_text(), 'one')
+        p1._release_value_widget()
+        self.assertEqual(p2._get_value_widget(), editor)
+        self.assertEqual(editor.get_text(), '')
+
+        # Editor of released property is not changed by its value.
+        p1.set_value('uno')
+        self.assertEqual(editor.get_text(), '')
+        p2.set_value('two')
+        self.assertEqual(editor.get_text(), 'two')
+        self.assertEqual(p1.value[0], 'uno')
+
+    def testExpandAll(self):
+        pg = PropertyGrid('Property Grid Test')
+        pg._EXPAND_ROWS = 2
+        groups = []
+        for i in range(5):
+            grp = pg.create_group('Group {0}'.format(i))
+            grp.add_property(PropertyString(name='String', id=str(i)))
+            groups.append(grp)
+
+        pg.set_expanded(True)
+        # First batch is expanded at once, the rest in idle time.
+        self.assertEqual(
+            [g.get_expanded() for g in groups],
+            [True, True, False, False, False])
+        context = GLib.MainContext.default()
+        while context.pending():
+            context.iteration(False)
+        self.assertEqual(all(g.get_expanded() for g in groups), True)
+
+        pg.set_expanded(False)
+        self.assertEqual(any(g.get_expanded() for g in groups), False)
+
+    def testUniformRows(self):
+        pg = PropertyGrid('Property Grid Test', uniform_rows=True)
+        grp = pg.create_group('Group 1')
+        for i in range(3):
+            grp.add_property(PropertyString(name='String', id=str(i)))
+        composite = PropertyComposite(
+            name='Composite', id='composite',
+            children=lambda: [PropertyBool(name='Bool', id='b')])
+        grp.add_property(composite)
+
+        height = pg._get_row_height(grp._get_rows())
+        self.assertEqual(grp._row.get_preferred_height()[1], 4 * height)
+        composite.set_expanded(True)
+        self.assertEqual(grp._row.get_preferred_height()[1], 5 * height)
+
+        # Grid can not be narrower than a row.
+        width = grp._get_rows()[0].get_preferred_width()[0]
+        self.assertEqual(width > 0, True)
+        self.assertEqual(grp._row.get_preferred_width()[0], width)
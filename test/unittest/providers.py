@@ -0,0 +1,49 @@
+# This file is part of GPropertyGrid project.
+# The COPYRIGHT file at the top level of this repository
+# contains the full copyright notices and license terms.
+
+import unittest
+from gi.repository import GLib
+from gpropertygrid.providers import ValueProvider
+
+
+class ProvidersTest(unittest.TestCase):
+    def _request(self, provider):
+        loop = GLib.MainLoop()
+        result = []
+
+        def done(value, error):
+            result.append((value, error))
+            loop.quit()
+
+        provider.request(done)
+        if not result:
+            GLib.timeout_add_seconds(5, loop.quit)
+            loop.run()
+        return result[0]
+
+    def testValueProvider(self):
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return 'value {0}'.format(len(calls))
+
+        provider = ValueProvider(fetch)
+        self.assertEqual(provider.is_valid(), False)
+        self.assertEqual(self._request(provider), ('value 1', None))
+        self.assertEqual(provider.is_valid(), True)
+        self.assertEqual(self._request(provider), ('value 1', None))
+        self.assertEqual(len(calls), 1)
+
+        provider.invalidate()
+        self.assertEqual(self._request(provider), ('value 2', None))
+
+    def testValueProviderError(self):
+        def fetch():
+            raise IOError('Not available')
+
+        provider = ValueProvider(fetch)
+        value, error = self._request(provider)
+        self.assertEqual(isinstance(error, IOError), True)
+        self.assertEqual(provider.is_valid(), False)
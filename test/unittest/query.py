@@ -0,0 +1,61 @@
+# This file is part of GPropertyGrid project.
+# The COPYRIGHT file at the top level of this repository
+# contains the full copyright notices and license terms.
+
+import unittest
+from gpropertygrid.query import PropertyIndex
+
+
+class _Property(object):
+    def __init__(self, name, group, tags=()):
+        self.name = name
+        self.id = name
+        self._group = group
+        self._tags = frozenset(tags)
+        self._index_key = None
+
+
+class _IntProperty(_Property):
+    pass
+
+
+class QueryTest(unittest.TestCase):
+    def testQuery(self):
+        index = PropertyIndex()
+        a = _Property('size_a', 'g1', ['layout'])
+        b = _IntProperty('size_b', 'g1')
+        c = _IntProperty('color', 'g2', ['layout'])
+        for p in (a, b, c):
+            index.add(p)
+        self.assertEqual(index.query(group='g1').ids, ['size_a', 'size_b'])
+        self.assertEqual(index.query(type=_IntProperty).ids,
+                         ['size_b', 'color'])
+        self.assertEqual(index.query(tags=['layout']).ids,
+                         ['size_a', 'color'])
+        self.assertEqual(index.query(name='size_*').ids,
+                         ['size_a', 'size_b'])
+        self.assertEqual(
+            index.query(type=_IntProperty, tags=['layout']).ids, ['color'])
+
+    def testLiveView(self):
+        index = PropertyIndex()
+        view = index.query(tags=['layout'])
+        a = _Property('a', 'g1')
+        b = _Property('b', 'g1', ['layout'])
+        index.add(a)
+        index.add(b)
+        self.assertEqual(view.ids, ['b'])
+
+        old = a._tags
+        a._tags = frozenset(['layout'])
+        index.retag(a, old)
+        self.assertEqual(view.ids, ['a', 'b'])
+        self.assertEqual(a in view, True)
+
+        old = b._tags
+        b._tags = frozenset()
+        index.retag(b, old)
+        self.assertEqual(view.ids, ['a'])
+
+        index.clear()
+        self.assertEqual(len(view), 0)
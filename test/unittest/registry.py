@@ -0,0 +1,71 @@
+# This file is part of GPropertyGrid project.
+# The COPYRIGHT file at the top level of this repository
+# contains the full copyright notices and license terms.
+
+import unittest
+from gpropertygrid import PropertyGrid
+from gpropertygrid.registry import PropertyRegistry, build_from_schema, \
+    build_from_object
+from gpropertygrid.properties import PropertyInt, PropertyBool, \
+    PropertyString
+
+
+class _Settings(object):
+    def __init__(self):
+        self.width = 640
+        self.visible = True
+        self.title = 'Hello'
+        self.ratio = None
+        self._secret = 'x'
+
+
+class RegistryTest(unittest.TestCase):
+    def testRegistry(self):
+        registry = PropertyRegistry()
+        self.assertEqual('int' in registry.names(), True)
+        self.assertEqual(registry.is_loaded('array'), False)
+        self.assertEqual(registry.get('int'), PropertyInt)
+        self.assertEqual(registry.is_loaded('int'), True)
+        self.assertRaises(KeyError, registry.get, 'unknown')
+
+        registry.register('size', 'gpropertygrid.properties:PropertyInt')
+        self.assertEqual(registry.is_loaded('size'), False)
+        prop = registry.create('size', name='Size', id='size')
+        self.assertEqual(isinstance(prop, PropertyInt), True)
+
+        self.assertEqual(registry.get_value_type(True), 'bool')
+        self.assertEqual(registry.get_value_type(1), 'int')
+        registry.register_value_type(int, 'size')
+        self.assertEqual(registry.get_value_type(1), 'size')
+
+    def testBuildFromSchema(self):
+        pg = PropertyGrid('Property Grid Test')
+        groups = build_from_schema(pg, [
+            {'title': 'Size', 'properties': [
+                {'type': 'int', 'id': 'width', 'name': 'Width',
+                    'lower': 0, 'upper': 100},
+                {'type': 'bool', 'id': 'visible', 'name': 'Visible'},
+            ]},
+        ])
+        self.assertEqual(len(groups), 1)
+        self.assertEqual(pg.get_property_by_id('width').upper, 100)
+        self.assertEqual(
+            isinstance(pg.get_property_by_id('visible'), PropertyBool),
+            True)
+
+    def testBuildFromObject(self):
+        pg = PropertyGrid('Property Grid Test')
+        settings = _Settings()
+        grp = build_from_object(pg, settings)
+        self.assertEqual(
+            [p.id for p in grp.properties], ['title', 'visible', 'width'])
+        self.assertEqual(
+            isinstance(pg.get_property_by_id('title'), PropertyString),
+            True)
+        self.assertEqual(
+            pg.snapshot(), {'width': 640, 'visible': True, 'title': 'Hello'})
+
+        # False and zero values are kept.
+        pg = PropertyGrid('Property Grid Test')
+        build_from_object(pg, {'enabled': False, 'count': 0})
+        self.assertEqual(pg.snapshot(), {'enabled': False, 'count': 0})
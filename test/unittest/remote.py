@@ -0,0 +1,96 @@
+# This file is part of GPropertyGrid project.
+# The COPYRIGHT file at the top level of this repository
+# contains the full copyright notices and license terms.
+
+import socket
+import time
+import unittest
+from gi.repository import GLib
+from gpropertygrid import PropertyGrid
+from gpropertygrid.remote import RemoteServer, RemoteConnection, \
+    RemoteModel
+
+
+class RemoteTest(unittest.TestCase):
+    def _run_until(self, condition, timeout=5):
+        context = GLib.MainContext.default()
+        end = time.time() + timeout
+        while not condition() and time.time() < end:
+            context.iteration(False)
+            time.sleep(0.001)
+        self.assertEqual(condition(), True)
+
+    def testRemoteModel(self):
+        metadata = [
+            {'type': 'int', 'id': 'p{0}'.format(i),
+                'name': 'Property {0}'.format(i)}
+            for i in range(120)]
+        values = dict(('p{0}'.format(i), i) for i in range(120))
+        server = RemoteServer([('Group 1', metadata)], values)
+        client_sock, server_sock = socket.socketpair()
+        server.serve_in_thread(server_sock)
+        connection = RemoteConnection(client_sock)
+
+        pg = PropertyGrid('Property Grid Test', canvas=True)
+        pg.set_model(RemoteModel(connection, page_size=50, prefetch=10))
+        self._run_until(lambda: len(pg._groups) == 1)
+        self.assertEqual(pg.properties, [])
+
+        grp = pg._groups[0]
+        grp.set_expanded(True)
+        self._run_until(lambda: len(pg.properties) == 50)
+        self.assertEqual(server.requests, ['groups', 'properties'])
+
+        result = []
+        for p in pg.properties[:5]:
+            p.value_provider.request(
+                lambda value, error: result.append(value))
+        self._run_until(lambda: len(result) == 5)
+        self.assertEqual(result, [0, 1, 2, 3, 4])
+        # Single request for shown rows and the prefetched ones.
+        self.assertEqual(server.requests.count('values'), 1)
+        self.assertEqual(
+            pg.properties[12].value_provider.is_valid(), True)
+
+        # Showing rows near the end loads the next page.
+        pg.properties[45].value_provider.request(
+            lambda value, error: result.append(value))
+        self._run_until(lambda: len(pg.properties) == 100)
+
+        prop = pg.get_property_by_id('p1')
+        prop.set_value(99)
+        prop.has_changed()
+        self._run_until(lambda: values['p1'] == 99)
+        connection.close()
+
+    def testCacheSize(self):
+        metadata = [
+            {'type': 'int', 'id': 'p{0}'.format(i),
+                'name': 'Property {0}'.format(i)}
+            for i in range(10)]
+        values = dict(('p{0}'.format(i), i) for i in range(10))
+        server = RemoteServer([('Group 1', metadata)], values)
+        client_sock, server_sock = socket.socketpair()
+        server.serve_in_thread(server_sock)
+        connection = RemoteConnection(client_sock)
+
+        pg = PropertyGrid('Property Grid Test', canvas=True)
+        pg.set_model(RemoteModel(connection, prefetch=0, cache_size=3))
+        self._run_until(lambda: len(pg._groups) == 1)
+        pg._groups[0].set_expanded(True)
+        self._run_until(lambda: len(pg.properties) == 10)
+
+        for p in pg.properties[:4]:
+            p._request_value()
+        self._run_until(lambda: pg.properties[3].value == [3])
+        # Values discarded from the cache are cleared from properties.
+        self.assertEqual(pg.properties[0].value, None)
+        self.assertEqual(pg.properties[0].value_provider.is_valid(), False)
+        self.assertEqual(pg.properties[1].value, [1])
+        connection.close()
+
+    def testWidgetMode(self):
+        # Without canvas all rows are mapped, so all would be fetched.
+        pg = PropertyGrid('Property Grid Test')
+        self.assertRaises(ValueError, pg.set_model, RemoteModel(None))
+        self.assertEqual(pg._groups, [])
@@ -0,0 +1,44 @@
+# This file is part of GPropertyGrid project.
+# The COPYRIGHT file at the top level of this repository
+# contains the full copyright notices and license terms.
+
+import unittest
+from gpropertygrid.rules import Rule, RuleGraph
+
+
+class RulesTest(unittest.TestCase):
+    def testDownstream(self):
+        graph = RuleGraph()
+        area = Rule('value', 'area', ['width', 'height'], None)
+        cost = Rule('value', 'cost', ['area', 'price'], None)
+        show = Rule('visible', 'discount', ['cost'], None)
+        other = Rule('sensitive', 'name', ['title'], None)
+        for rule in (show, cost, other, area):
+            graph.add(rule)
+        self.assertEqual(
+            graph.get_downstream(['width']), [area, cost, show])
+        self.assertEqual(graph.get_downstream(['price']), [cost, show])
+        self.assertEqual(graph.get_downstream(['discount']), [])
+        self.assertEqual(graph.get_downstream([], [area]), [area, cost, show])
+
+    def testCycle(self):
+        graph = RuleGraph()
+        graph.add(Rule('value', 'a', ['b'], None))
+        self.assertRaises(
+            ValueError, graph.add, Rule('value', 'b', ['a'], None))
+        self.assertRaises(
+            ValueError, graph.add, Rule('value', 'a', ['c'], None))
+        self.assertEqual(len(graph.rules), 1)
+
+    def testMemoize(self):
+        calls = []
+
+        def func(a, b):
+            calls.append((a, b))
+            return a + b
+
+        rule = Rule('value', 'c', ['a', 'b'], func)
+        self.assertEqual(rule.evaluate((1, 2)), (True, 3))
+        self.assertEqual(rule.evaluate((1, 2)), (False, 3))
+        self.assertEqual(rule.evaluate((2, 1)), (False, 3))
+        self.assertEqual(len(calls), 2)
@@ -0,0 +1,77 @@
+# This file is part of GPropertyGrid project.
+# The COPYRIGHT file at the top level of this repository
+# contains the full copyright notices and license terms.
+
+import unittest
+from gpropertygrid import PropertyGrid
+from gpropertygrid import streams
+from gpropertygrid.properties import PropertyString, PropertyInt
+
+
+class StreamsTest(unittest.TestCase):
+    def testReadIni(self):
+        lines = [
+            '; Preset\n',
+            '[Size]\n',
+            'width = 640\n',
+            'height: 480\n',
+            '\n',
+            '[Text]\n',
+            'title = "Hello"\n',
+            'name = plain text\n',
+        ]
+        self.assertEqual(list(streams.read_ini(lines)), [
+            ('Size', 'width', 640),
+            ('Size', 'height', 480),
+            ('Text', 'title', 'Hello'),
+            ('Text', 'name', 'plain text'),
+        ])
+        self.assertRaises(ValueError, list, streams.read_ini(['[Size\n']))
+
+    def testReadJsonl(self):
+        lines = [
+            b'{"group": "Size", "id": "width", "value": 640}\n',
+            b'{"id": "title", "value": "Hello"}\n',
+        ]
+        self.assertEqual(list(streams.read_jsonl(lines)), [
+            ('Size', 'width', 640), (None, 'title', 'Hello')])
+        self.assertRaises(ValueError, list, streams.read_jsonl(['[1]']))
+
+    def testBatches(self):
+        items = [(None, str(i), i) for i in range(5)]
+        batches = list(streams.iter_batches(items, 2))
+        self.assertEqual([len(b) for b in batches], [2, 2, 1])
+
+    def testImportExport(self):
+        pg = PropertyGrid('Property Grid Test')
+        grp = pg.create_group('Size')
+        grp.add_property(PropertyInt(name='Width', id='width'))
+        grp.add_property(PropertyInt(name='Height', id='height'))
+        grp = pg.create_group('Text')
+        grp.add_property(PropertyString(name='Title', id='title'))
+
+        batches = []
+        pg.connect('values-changed', lambda g, p: batches.append(len(p)))
+        count = pg.import_values(
+            ['[Size]\n', 'width = 640\n', 'height = 480\n',
+                '[Text]\n', 'title = "Hello"\n', 'unknown = 1\n'],
+            format=streams.INI, batch_size=2)
+        self.assertEqual(count, 3)
+        self.assertEqual(batches, [2, 1])
+        self.assertEqual(
+            pg.snapshot(), {'width': 640, 'height': 480, 'title': 'Hello'})
+
+        lines = list(pg.export_values(streams.INI))
+        self.assertEqual(lines, [
+            '[Size]\n', 'width = 640\n', 'height = 480\n', '\n',
+            '[Text]\n', 'title = "Hello"\n'])
+        lines = list(pg.export_values())
+        self.assertEqual(
+            lines[0], '{"group":"Size","id":"width","value":640}\n')
+
+        # Whole import is undone at once.
+        pg.undo()
+        self.assertEqual(
+            pg.snapshot(), {'width': None, 'height': None, 'title': None})
+        pg.import_values(lines)
+        self.assertEqual(pg.snapshot()['title'], 'Hello')
@@ -4,16 +4,61 @@
 
 "GPropertyGrid unittest suite"
 
+import os
+import sys
+import subprocess
 import unittest
 import load_module
 import propertygrid
 import properties
+import providers
+import validation
+import history
+import formatters
+import numeric
+import arrays
+import rules
+import query
+import compare
+import remote
+import streams
+import registry
+
+
+class Gtk4Test(unittest.TestCase):
+    def testGtk4(self):
+        # Gtk 3 is already loaded, so GTK 4 tests run in a new process,
+        # that requires Gtk 4.0 before loading them.
+        require = "import gi; gi.require_version('Gtk', '4.0')"
+        with open(os.devnull, 'w') as devnull:
+            found = subprocess.call(
+                [sys.executable, '-c', require], stderr=devnull)
+        if found != 0:
+            self.skipTest("Gtk 4.0 is not installed")
+        code = "{0}; import load_module, runpy; " \
+            "runpy.run_path('gtk4.py', run_name='__main__')".format(require)
+        self.assertEqual(subprocess.call(
+            [sys.executable, '-c', code],
+            cwd=os.path.dirname(os.path.realpath(__file__))), 0)
 
 
 LOADER = unittest.TestLoader()
 
 SUITE = LOADER.loadTestsFromModule(propertygrid)
 SUITE.addTests(LOADER.loadTestsFromModule(properties))
+SUITE.addTests(LOADER.loadTestsFromModule(providers))
+SUITE.addTests(LOADER.loadTestsFromModule(validation))
+SUITE.addTests(LOADER.loadTestsFromModule(history))
+SUITE.addTests(LOADER.loadTestsFromModule(formatters))
+SUITE.addTests(LOADER.loadTestsFromModule(numeric))
+SUITE.addTests(LOADER.loadTestsFromModule(arrays))
+SUITE.addTests(LOADER.loadTestsFromModule(rules))
+SUITE.addTests(LOADER.loadTestsFromModule(query))
+SUITE.addTests(LOADER.loadTestsFromModule(compare))
+SUITE.addTests(LOADER.loadTestsFromModule(remote))
+SUITE.addTests(LOADER.loadTestsFromModule(streams))
+SUITE.addTests(LOADER.loadTestsFromModule(registry))
+SUITE.addTests(LOADER.loadTestsFromTestCase(Gtk4Test))
 
 RUNNER = unittest.TextTestRunner(verbosity=2)
 RESULT = RUNNER.run(SUITE)
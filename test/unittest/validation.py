@@ -0,0 +1,80 @@
+# This file is part of GPropertyGrid project.
+# The COPYRIGHT file at the top level of this repository
+# contains the full copyright notices and license terms.
+
+import unittest
+from gi.repository import GLib
+from gpropertygrid import PropertyGrid
+from gpropertygrid.properties import PropertyString
+from gpropertygrid.validation import Validator
+
+
+class ValidationTest(unittest.TestCase):
+    def _validate(self, validator, key, value):
+        loop = GLib.MainLoop()
+        result = []
+
+        def done(valid, message):
+            result.append((valid, message))
+            loop.quit()
+
+        validator.validate(key, value, done)
+        if not result:
+            GLib.timeout_add_seconds(5, loop.quit)
+            loop.run()
+        return result[0]
+
+    def testValidator(self):
+        calls = []
+
+        def check(value):
+            calls.append(value)
+            if not value.isdigit():
+                return 'Only digits allowed'
+
+        validator = Validator(check)
+        self.assertEqual(self._validate(validator, 'p', '12'), (True, None))
+        self.assertEqual(
+            self._validate(validator, 'p', 'ab'),
+            (False, 'Only digits allowed'))
+        self.assertEqual(self._validate(validator, 'p', '12'), (True, None))
+        self.assertEqual(calls, ['12', 'ab'])
+
+        self._validate(validator, 'q', '12')
+        self.assertEqual(len(calls), 3)
+
+        validator.clear_cache()
+        self._validate(validator, 'p', '12')
+        self.assertEqual(len(calls), 4)
+
+    def _wait_validated(self, grid, func):
+        loop = GLib.MainLoop()
+        result = []
+
+        def validated(grid, property_):
+            result.append(property_.valid)
+            loop.quit()
+
+        handler = grid.connect('validated', validated)
+        func()
+        if not result:
+            GLib.timeout_add_seconds(5, loop.quit)
+            loop.run()
+        grid.disconnect(handler)
+        return result[-1]
+
+    def testRevalidate(self):
+        pg = PropertyGrid('Property Grid Test')
+        grp = pg.create_group('Group 1')
+        ps = PropertyString(name='String 1', id='str1')
+        grp.add_property(ps)
+        ps.set_validator(Validator(lambda v: v is None or v.isdigit()))
+
+        # Values set programmatically are validated too.
+        self.assertEqual(
+            self._wait_validated(pg, lambda: ps.set_value('ab')), False)
+        self.assertEqual(
+            self._wait_validated(
+                pg, lambda: pg.apply_values({'str1': '12'})), True)
+        self.assertEqual(self._wait_validated(pg, pg.undo), False)
+        self.assertEqual(self._wait_validated(pg, pg.redo), True)